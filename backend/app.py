@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from routers import workflow_router, template_router, tool_router
+from routers import workflow_router, revision_router, template_router, tool_router
 
 app = FastAPI(title="Workflow Management API")
 
@@ -14,10 +14,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Include routers
 app.include_router(workflow_router.router)
+app.include_router(revision_router.router)
 app.include_router(template_router.router)
 app.include_router(tool_router.router)
 
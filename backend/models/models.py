@@ -144,3 +144,16 @@ class Workflow(BaseModel):
     edges: List[Edge]
     createdAt: str
     updatedAt: str
+
+class GraphIssue(BaseModel):
+    code: str
+    message: str
+    nodeIds: List[str] = []
+    edgeId: Optional[str] = None
+
+class WorkflowAnalysis(BaseModel):
+    workflowId: str
+    hash: str
+    errors: List[GraphIssue] = []
+    topologicalOrder: List[str] = []
+    levels: List[List[str]] = []
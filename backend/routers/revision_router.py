@@ -0,0 +1,64 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.models import Workflow
+from utils.storage import get_store
+from utils.revisions import get_revision_store
+from utils.graph_analysis import analyze_workflow, get_analysis_store
+
+router = APIRouter(
+    prefix="/api/workflows",
+    tags=["revisions"]
+)
+
+workflow_store = get_store("workflows")
+revision_store = get_revision_store()
+analysis_store = get_analysis_store()
+
+@router.get("/{workflow_id}/revisions", response_model=List[Dict[str, Any]])
+async def list_revisions(workflow_id: str):
+    """List the revisions of a workflow, newest first"""
+    return revision_store.list(workflow_id)
+
+@router.get("/{workflow_id}/revisions/{revision_hash}", response_model=Workflow)
+async def get_revision(workflow_id: str, revision_hash: str):
+    """Get the workflow as it was at a specific revision"""
+    workflow = revision_store.get(workflow_id, revision_hash)
+    if not workflow:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return workflow
+
+@router.get("/{workflow_id}/revisions/{revision_hash}/diff")
+async def diff_revision(workflow_id: str, revision_hash: str, against: Optional[str] = None):
+    """Diff a revision against another one, defaulting to its parent"""
+    if against is None:
+        revision = next((r for r in revision_store.list(workflow_id) if r["hash"] == revision_hash), None)
+        if not revision:
+            raise HTTPException(status_code=404, detail="Revision not found")
+        against = revision["parentHash"]
+        if against is None:
+            raise HTTPException(status_code=400, detail="Revision has no parent to diff against")
+    
+    diff = revision_store.diff(workflow_id, against, revision_hash)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return {"from": against, "to": revision_hash, **diff}
+
+@router.post("/{workflow_id}/revisions/{revision_hash}/restore", response_model=Workflow)
+async def restore_revision(workflow_id: str, revision_hash: str):
+    """Make a previous revision the current version of the workflow"""
+    workflow = revision_store.get(workflow_id, revision_hash)
+    if not workflow:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    
+    workflow["updatedAt"] = datetime.utcnow().isoformat()
+    workflow_dict = Workflow(**workflow).dict(exclude_none=True)
+    workflow_store.upsert(workflow_dict)
+    revision_store.record(workflow_dict)
+    analysis_store.save(await run_in_threadpool(analyze_workflow, workflow_dict))
+    return workflow_dict
@@ -1,26 +1,32 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.models import PromptTemplate
-from utils.file_operations import load_templates, save_templates
+from utils.storage import get_store
+from utils.cache import CatalogCache, catalog_response
+from utils.listing import ListingParams, page_response
 
 router = APIRouter(
     prefix="/api/templates",
     tags=["templates"]
 )
 
+template_store = get_store("templates")
+template_cache = CatalogCache(template_store, PromptTemplate.parse_obj)
+
 @router.get("", response_model=List[PromptTemplate])
-async def list_templates():
-    """List all prompt templates"""
-    return load_templates()
+async def list_templates(request: Request, params: ListingParams = Depends()):
+    """List prompt templates, paginated and filtered when listing parameters are given"""
+    if params.requested:
+        return page_response(template_store, params)
+    return catalog_response(request, template_cache.snapshot())
 
 @router.get("/{template_id}", response_model=PromptTemplate)
 async def get_template(template_id: str):
     """Get a specific prompt template by ID"""
-    templates = load_templates()
-    template = next((t for t in templates if t["id"] == template_id), None)
+    template = template_store.get(template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
     return template
@@ -28,39 +34,27 @@ async def get_template(template_id: str):
 @router.post("", response_model=PromptTemplate)
 async def create_template(template: PromptTemplate):
     """Create a new prompt template"""
-    templates = load_templates()
+    template_dict = template.dict()
     
-    # Check if template with same ID exists
-    if any(t["id"] == template.id for t in templates):
+    # Insert fails if a template with the same ID exists
+    if not template_store.create(template_dict):
         raise HTTPException(status_code=400, detail="Template with this ID already exists")
-    
-    template_dict = template.dict()
-    templates.append(template_dict)
-    save_templates(templates)
     return template_dict
 
 @router.put("/{template_id}", response_model=PromptTemplate)
 async def update_template(template_id: str, template: PromptTemplate):
     """Update an existing prompt template"""
-    templates = load_templates()
-    
-    for i, existing in enumerate(templates):
-        if existing["id"] == template_id:
-            template_dict = template.dict()
-            templates[i] = template_dict
-            save_templates(templates)
-            return template_dict
+    if not template_store.get(template_id):
+        raise HTTPException(status_code=404, detail="Template not found")
     
-    raise HTTPException(status_code=404, detail="Template not found")
+    template_dict = template.dict()
+    template_store.upsert(template_dict)
+    return template_dict
 
 @router.delete("/{template_id}")
 async def delete_template(template_id: str):
     """Delete a prompt template"""
-    templates = load_templates()
-    
-    filtered_templates = [t for t in templates if t["id"] != template_id]
-    if len(filtered_templates) == len(templates):
+    if not template_store.delete(template_id):
         raise HTTPException(status_code=404, detail="Template not found")
     
-    save_templates(filtered_templates)
     return {"message": "Template deleted successfully"}
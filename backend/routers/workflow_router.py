@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, Request
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
 from datetime import datetime
 import sys
 import os
@@ -8,8 +9,12 @@ import json
 from pydantic import ValidationError
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models.models import Workflow
-from utils.file_operations import load_workflows, save_workflows
+from models.models import NodeType, Workflow, WorkflowAnalysis
+from utils.storage import get_store
+from utils.cache import CatalogCache, catalog_response
+from utils.listing import ListingParams, page_response
+from utils.revisions import get_revision_store
+from utils.graph_analysis import analyze_workflow, get_analysis_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,12 +25,38 @@ router = APIRouter(
     tags=["workflows"]
 )
 
+workflow_store = get_store("workflows")
+workflow_cache = CatalogCache(workflow_store, Workflow.parse_obj)
+revision_store = get_revision_store()
+analysis_store = get_analysis_store()
+
+async def check_graph(workflow_dict: dict) -> WorkflowAnalysis:
+    """Run the static graph analysis, rejecting the save if the graph is broken"""
+    # Large graphs take a while to analyze; keep that off the event loop
+    analysis = await run_in_threadpool(analyze_workflow, workflow_dict)
+    if analysis.errors:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "Invalid workflow graph",
+                "errors": [issue.dict() for issue in analysis.errors]
+            }
+        )
+    return analysis
+
 @router.get("", response_model=List[Workflow])
-async def list_workflows():
-    """List all workflows"""
+async def list_workflows(
+    request: Request,
+    params: ListingParams = Depends(),
+    node_type: Optional[NodeType] = Query(None, description="Only workflows containing a node of this type"),
+):
+    """List workflows, paginated and filtered when listing parameters are given"""
     try:
-        workflows = load_workflows()
-        return [Workflow(**w) if isinstance(w, dict) else w for w in workflows]
+        if params.requested or node_type is not None:
+            return page_response(workflow_store, params, tag=node_type.value if node_type else None)
+        return catalog_response(request, workflow_cache.snapshot())
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing workflows: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -34,11 +65,12 @@ async def list_workflows():
 async def get_workflow(workflow_id: str):
     """Get a specific workflow by ID"""
     try:
-        workflows = load_workflows()
-        workflow = next((w for w in workflows if w["id"] == workflow_id), None)
+        workflow = workflow_store.get(workflow_id)
         if not workflow:
             raise HTTPException(status_code=404, detail="Workflow not found")
         return Workflow(**workflow)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting workflow: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -47,16 +79,17 @@ async def get_workflow(workflow_id: str):
 async def create_workflow(workflow: Workflow):
     """Create a new workflow"""
     try:
-        workflows = load_workflows()
+        workflow_dict = workflow.dict(exclude_none=True)
+        analysis = await check_graph(workflow_dict)
         
-        # Check if workflow with same ID exists
-        if any(w["id"] == workflow.id for w in workflows):
+        # Insert fails if a workflow with the same ID exists
+        if not workflow_store.create(workflow_dict):
             raise HTTPException(status_code=400, detail="Workflow with this ID already exists")
-        
-        workflow_dict = workflow.dict(exclude_none=True)
-        workflows.append(workflow_dict)
-        save_workflows(workflows)
+        revision_store.record(workflow_dict)
+        analysis_store.save(analysis)
         return workflow
+    except HTTPException:
+        raise
     except ValidationError as e:
         logger.error(f"Validation error details: {e.errors()}")
         raise HTTPException(
@@ -80,27 +113,28 @@ async def update_workflow(workflow_id: str, request: Request):
         # Try to create Workflow model
         workflow = Workflow(**body)
         
-        workflows = load_workflows()
-        
         # Update timestamp
         workflow.updatedAt = datetime.utcnow().isoformat()
         
         # Convert to dict for JSON serialization, excluding None values
         workflow_dict = workflow.dict(exclude_none=True)
         logger.info(f"Processed workflow data: {json.dumps(workflow_dict, indent=2)}")
+        analysis = await check_graph(workflow_dict)
         
-        # Find and update the workflow
-        for i, existing in enumerate(workflows):
-            if existing["id"] == workflow_id:
-                workflows[i] = workflow_dict
-                save_workflows(workflows)
-                return workflow
+        # Workflows saved before revisions existed get their stored state as the first revision
+        if revision_store.head(workflow.id) is None:
+            existing = workflow_store.get(workflow.id)
+            if existing:
+                revision_store.record(existing)
         
-        # If not found, create new
-        workflows.append(workflow_dict)
-        save_workflows(workflows)
+        # Update the workflow, or create it if it doesn't exist
+        workflow_store.upsert(workflow_dict)
+        revision_store.record(workflow_dict)
+        analysis_store.save(analysis)
         return workflow
         
+    except HTTPException:
+        raise
     except ValidationError as e:
         logger.error(f"Validation error details: {e.errors()}")
         raise HTTPException(
@@ -118,14 +152,14 @@ async def update_workflow(workflow_id: str, request: Request):
 async def delete_workflow(workflow_id: str):
     """Delete a workflow"""
     try:
-        workflows = load_workflows()
-        
-        filtered_workflows = [w for w in workflows if w["id"] != workflow_id]
-        if len(filtered_workflows) == len(workflows):
+        if not workflow_store.delete(workflow_id):
             raise HTTPException(status_code=404, detail="Workflow not found")
+        revision_store.delete(workflow_id)
+        analysis_store.delete(workflow_id)
         
-        save_workflows(filtered_workflows)
         return {"message": "Workflow deleted successfully"}
+    except HTTPException:
+        raise
     except ValidationError as e:
         logger.error(f"Validation error details: {e.errors()}")
         raise HTTPException(
@@ -138,3 +172,16 @@ async def delete_workflow(workflow_id: str):
     except Exception as e:
         logger.error(f"Error deleting workflow: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{workflow_id}/analysis", response_model=WorkflowAnalysis)
+async def get_workflow_analysis(workflow_id: str):
+    """Get the stored graph analysis (topological order and parallel levels) of a workflow"""
+    analysis = analysis_store.get(workflow_id)
+    if not analysis:
+        workflow = workflow_store.get(workflow_id)
+        if not workflow:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        # Workflows saved before analysis existed are analyzed on first request
+        analysis = await run_in_threadpool(analyze_workflow, workflow)
+        analysis_store.save(analysis)
+    return analysis
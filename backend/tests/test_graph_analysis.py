@@ -0,0 +1,38 @@
+import threading
+
+from utils.graph_analysis import analyze_workflow
+
+
+def _workflow(nodes, edges):
+    return {
+        "id": "w",
+        "nodes": [{"id": node_id, "data": {"type": node_type}} for node_id, node_type in nodes],
+        "edges": [
+            {"id": f"{source}-{target}", "source": source, "target": target, "data": data}
+            for source, target, data in edges
+        ],
+    }
+
+
+FORK_JOIN = [("S", "start"), ("F", "fork"), ("A", "agent"), ("B", "agent"), ("J", "join"), ("E", "end")]
+FORK_JOIN_EDGES = [("S", "F", None), ("F", "A", None), ("F", "B", None), ("A", "J", None), ("B", "J", None), ("J", "E", None)]
+
+
+def test_fork_branches_must_meet_at_a_join() -> None:
+    assert analyze_workflow(_workflow(FORK_JOIN, FORK_JOIN_EDGES)).errors == []
+
+    edges = [edge for edge in FORK_JOIN_EDGES if edge[:2] != ("B", "J")] + [("B", "E", None)]
+    codes = [issue.code for issue in analyze_workflow(_workflow(FORK_JOIN, edges)).errors]
+    assert codes == ["unmatched_fork"]
+
+
+def test_cycle_through_a_fork_terminates() -> None:
+    # A retry edge back into the fork nests the fork in itself on every lap
+    workflow = _workflow(FORK_JOIN, FORK_JOIN_EDGES + [("A", "F", {"condition": "retry"})])
+    result = {}
+    worker = threading.Thread(target=lambda: result.setdefault("analysis", analyze_workflow(workflow)), daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+
+    assert "analysis" in result
+    assert [issue.code for issue in result["analysis"].errors] == []
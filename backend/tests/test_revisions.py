@@ -0,0 +1,29 @@
+from utils.revisions import JSONFileRevisionStore
+
+
+def _workflow(name):
+    return {
+        "id": "w",
+        "name": name,
+        "description": "",
+        "version": "1",
+        "updatedAt": "2026-01-01",
+        "nodes": [{"id": "s", "data": {"type": "start"}}],
+        "edges": [],
+    }
+
+
+def test_rename_records_a_revision_and_restores_keep_the_name(tmp_path) -> None:
+    store = JSONFileRevisionStore(tmp_path / "revisions.json")
+    first = store.record(_workflow("draft"))
+    renamed = store.record(_workflow("final"))
+
+    assert renamed != first
+    assert [(r["name"], r["isHead"]) for r in store.list("w")] == [("final", True), ("draft", False)]
+    # Restoring rebuilds the workflow from the revision, as the restore route does
+    assert store.get("w", store.head("w"))["name"] == "final"
+    assert store.get("w", first)["name"] == "draft"
+
+    # Saving unchanged content and identity again only moves head
+    assert store.record({**_workflow("draft"), "updatedAt": "2026-02-01"}) == first
+    assert len(store.list("w")) == 2 and store.head("w") == first
@@ -0,0 +1,84 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from utils.storage import CatalogStore
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@dataclass
+class CatalogSnapshot(Generic[ModelT]):
+    """Validated models for a catalog collection plus their serialized response"""
+    version: Hashable
+    models: List[ModelT]
+    by_id: Dict[str, ModelT]
+    body: bytes
+    etag: str
+
+
+class CatalogCache(Generic[ModelT]):
+    """Read-through cache of validated models, rebuilt when the store version changes"""
+
+    def __init__(self, store: CatalogStore, build: Callable[[Dict[str, Any]], ModelT]):
+        self.store = store
+        self.build = build
+        self.lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot[ModelT]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot(self) -> CatalogSnapshot[ModelT]:
+        """Return the current snapshot, reloading the store only if it changed"""
+        version = self.store.version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            self.hits += 1
+            return snapshot
+        with self.lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self.misses += 1
+                self._snapshot = self._load(version)
+            return self._snapshot
+
+    def invalidate(self):
+        """Drop the snapshot so the next read reloads from the store"""
+        self._snapshot = None
+
+    def _load(self, version: Hashable) -> CatalogSnapshot[ModelT]:
+        models = [self.build(record) for record in self.store.list()]
+        body = ("[" + ",".join(model.json() for model in models) + "]").encode()
+        return CatalogSnapshot(
+            version=version,
+            models=models,
+            by_id={model.id: model for model in models},
+            body=body,
+            etag=make_etag(body),
+        )
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from the response body"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, accepting weak and listed tags"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def catalog_response(request: Request, snapshot: CatalogSnapshot) -> Response:
+    """Serve a cached snapshot body, or 304 when the client already holds it"""
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
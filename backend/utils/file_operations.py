@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 import os
+import tempfile
 from datetime import datetime
 
 # Get the backend directory path
@@ -11,6 +12,9 @@ WORKFLOWS_FILE = DATA_DIR / "workflows.json"
 TEMPLATES_FILE = DATA_DIR / "templates.json"
 TOOLS_FILE = MCP_TOOLS_DIR / "tools.json"
 
+# Parsed JSON keyed by file path, tagged with the (mtime_ns, size) it was read at
+_json_cache = {}
+
 # Ensure directories exist
 DATA_DIR.mkdir(exist_ok=True)
 MCP_TOOLS_DIR.mkdir(exist_ok=True)
@@ -29,13 +33,64 @@ initialize_json_file(WORKFLOWS_FILE)
 initialize_json_file(TEMPLATES_FILE)
 initialize_json_file(TOOLS_FILE, {"tools": []})
 
+def write_json_atomic(file_path: Path, data):
+    """Write JSON to a temp file and swap it in so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+def file_signature(file_path: Path):
+    """Return (mtime_ns, size) for change detection without reading the file"""
+    stat = file_path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+def read_json_cached(file_path: Path, transform=None):
+    """Parse a JSON file, reusing the previous result while its mtime and size are unchanged"""
+    key = file_signature(file_path)
+    cached = _json_cache.get(file_path)
+    if cached and cached[0] == key:
+        return cached[1]
+    with open(file_path, "r") as f:
+        data = json.load(f)
+    if transform is not None:
+        data = transform(data)
+    _json_cache[file_path] = (key, data)
+    return data
+
+def format_tools(data):
+    """Convert raw MCP tool entries to the API tool format with required fields"""
+    formatted_tools = []
+    for tool in data.get("tools", []):
+        formatted_tool = {
+            "id": tool.get("name", "").lower().replace(" ", "-"),  # Generate ID from name
+            "name": tool.get("name", ""),
+            "description": tool.get("description", ""),
+            "type": "api",  # Default to API type
+            "config": {
+                "type": "api",
+                "api_config": {
+                    "method": "POST",
+                    "url": "",
+                    "parameters": [],
+                    "request_body_schema": tool.get("parameters", {})
+                }
+            },
+            "createdAt": tool.get("createdAt", datetime.now().isoformat()),
+            "updatedAt": tool.get("updatedAt", datetime.now().isoformat())
+        }
+        formatted_tools.append(formatted_tool)
+    return formatted_tools
+
 def load_workflows():
     """Load workflows from the JSON file"""
     initialize_json_file(WORKFLOWS_FILE)  # Ensure file exists and is properly initialized
     try:
-        with open(WORKFLOWS_FILE, "r") as f:
-            data = json.load(f)
-            return data
+        return list(read_json_cached(WORKFLOWS_FILE))
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error loading workflows: {e}")  # Debug print
         return []
@@ -43,8 +98,7 @@ def load_workflows():
 def save_workflows(workflows):
     """Save workflows to the JSON file"""
     try:
-        with open(WORKFLOWS_FILE, "w") as f:
-            json.dump(workflows, f, indent=2)
+        write_json_atomic(WORKFLOWS_FILE, workflows)
     except Exception as e:
         print(f"Error saving workflows: {e}")  # Debug print
         raise
@@ -53,47 +107,19 @@ def load_templates():
     """Load templates from the JSON file"""
     initialize_json_file(TEMPLATES_FILE)  # Ensure file exists and is properly initialized
     try:
-        with open(TEMPLATES_FILE, "r") as f:
-            return json.load(f)
+        return list(read_json_cached(TEMPLATES_FILE))
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
 def save_templates(templates):
     """Save templates to the JSON file"""
-    with open(TEMPLATES_FILE, "w") as f:
-        json.dump(templates, f, indent=2)
+    write_json_atomic(TEMPLATES_FILE, templates)
 
 def load_tools():
     """Load MCP tools from the JSON file"""
     initialize_json_file(TOOLS_FILE, {"tools": []})  # Initialize with proper structure
     try:
-        with open(TOOLS_FILE, "r") as f:
-            data = json.load(f)
-            tools_data = data.get("tools", [])
-            
-            # Convert tools to proper format with required fields
-            formatted_tools = []
-            for tool in tools_data:
-                formatted_tool = {
-                    "id": tool.get("name", "").lower().replace(" ", "-"),  # Generate ID from name
-                    "name": tool.get("name", ""),
-                    "description": tool.get("description", ""),
-                    "type": "api",  # Default to API type
-                    "config": {
-                        "type": "api",
-                        "api_config": {
-                            "method": "POST",
-                            "url": "",
-                            "parameters": [],
-                            "request_body_schema": tool.get("parameters", {})
-                        }
-                    },
-                    "createdAt": tool.get("createdAt", datetime.now().isoformat()),
-                    "updatedAt": tool.get("updatedAt", datetime.now().isoformat())
-                }
-                formatted_tools.append(formatted_tool)
-            
-            return formatted_tools
+        return list(read_json_cached(TOOLS_FILE, format_tools))
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error loading tools: {e}")
         return []
@@ -101,8 +127,7 @@ def load_tools():
 def save_tools(tools):
     """Save MCP tools to the JSON file"""
     try:
-        with open(TOOLS_FILE, "w") as f:
-            json.dump({"tools": tools}, f, indent=2)
+        write_json_atomic(TOOLS_FILE, {"tools": tools})
     except Exception as e:
         print(f"Error saving tools: {e}")  # Debug print
         raise
@@ -0,0 +1,315 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from models.models import GraphIssue, WorkflowAnalysis
+from utils.file_operations import DATA_DIR, read_json_cached, write_json_atomic
+from utils.revisions import content_hash
+from utils.storage import STORAGE_BACKEND, SQLiteDatabase, get_database
+
+# Where analyses live with the JSON storage backend
+ANALYSIS_FILE = DATA_DIR / "workflow_analysis.json"
+
+
+def analyze_workflow(workflow: Dict[str, Any]) -> WorkflowAnalysis:
+    """Validate a workflow graph and precompute its execution order
+
+    Everything but the fork check is linear in nodes and edges; see _check_forks for its bound.
+    """
+    nodes = workflow.get("nodes", [])
+    edges = workflow.get("edges", [])
+    errors: List[GraphIssue] = []
+
+    index: Dict[str, Dict[str, Any]] = {}
+    for node in nodes:
+        if node["id"] in index:
+            errors.append(GraphIssue(code="duplicate_node", message=f"Duplicate node id {node['id']}", nodeIds=[node["id"]]))
+        index[node["id"]] = node
+    types = {node_id: (node.get("data") or {}).get("type") or node.get("type") for node_id, node in index.items()}
+
+    # Adjacency indexes are built once and shared by every check below
+    outgoing: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for edge in edges:
+        missing = [end for end in (edge["source"], edge["target"]) if end not in index]
+        if missing:
+            errors.append(GraphIssue(
+                code="dangling_edge",
+                message=f"Edge {edge['id']} points to missing node(s) {', '.join(missing)}",
+                nodeIds=missing,
+                edgeId=edge["id"],
+            ))
+            continue
+        outgoing[edge["source"]].append(edge)
+
+    if index:
+        errors += _check_reachability(index, types, outgoing)
+    components = _strongly_connected_components(list(index), outgoing)
+    errors += _check_cycles(components, outgoing)
+    errors += _check_forks(types, outgoing)
+    order, levels = _topological_levels(components, outgoing)
+
+    return WorkflowAnalysis(
+        workflowId=workflow["id"],
+        hash=content_hash(workflow),
+        errors=errors,
+        topologicalOrder=order,
+        levels=levels,
+    )
+
+
+def _check_reachability(index, types, outgoing) -> List[GraphIssue]:
+    starts = [node_id for node_id, node_type in types.items() if node_type == "start"]
+    if not starts:
+        return [GraphIssue(code="missing_start", message="Workflow has no start node")]
+    reached: Set[str] = set(starts)
+    queue = deque(starts)
+    while queue:
+        for edge in outgoing[queue.popleft()]:
+            if edge["target"] not in reached:
+                reached.add(edge["target"])
+                queue.append(edge["target"])
+    unreachable = [node_id for node_id in index if node_id not in reached]
+    if not unreachable:
+        return []
+    return [GraphIssue(
+        code="unreachable_node",
+        message=f"Node(s) not reachable from a start node: {', '.join(unreachable)}",
+        nodeIds=unreachable,
+    )]
+
+
+def _check_cycles(components: List[List[str]], outgoing) -> List[GraphIssue]:
+    issues = []
+    for component in components:
+        members = set(component)
+        member_edges = [edge for node_id in component for edge in outgoing[node_id]]
+        if len(component) == 1 and not any(edge["target"] in members for edge in member_edges):
+            continue
+        if not any(edge["target"] not in members for edge in member_edges):
+            issues.append(GraphIssue(
+                code="cycle_without_exit",
+                message=f"Cycle through {', '.join(component)} has no edge leaving it",
+                nodeIds=component,
+            ))
+        elif not any(_condition(edge) for edge in member_edges):
+            issues.append(GraphIssue(
+                code="cycle_without_exit",
+                message=f"Cycle through {', '.join(component)} has no condition to stop looping",
+                nodeIds=component,
+            ))
+    return issues
+
+
+def _check_forks(types, outgoing) -> List[GraphIssue]:
+    """Every branch of a FORK must reach a common JOIN at the same nesting depth
+
+    Each branch start is walked once over (node, nesting depth) states. Nesting
+    deeper than the number of forks can only come from a cycle through a fork,
+    so depth is capped there and a check costs at most O(B·F·(V+E)) for B
+    distinct branch starts and F forks.
+    """
+    issues = []
+    forks = [node_id for node_id, node_type in types.items() if node_type == "fork"]
+    reached: Dict[str, Set[str]] = {}
+    for fork_id in forks:
+        common: Optional[Set[str]] = None
+        for edge in outgoing[fork_id]:
+            if edge["target"] not in reached:
+                reached[edge["target"]] = _joins_reached(edge["target"], types, outgoing, len(forks))
+            joins = reached[edge["target"]]
+            common = joins if common is None else common & joins
+        if not common:
+            issues.append(GraphIssue(
+                code="unmatched_fork",
+                message=f"Fork {fork_id} has no join that all of its branches reach",
+                nodeIds=[fork_id],
+            ))
+    return issues
+
+
+def _joins_reached(start: str, types, outgoing, max_depth: int) -> Set[str]:
+    joins: Set[str] = set()
+    seen = {(start, 0)}
+    queue = deque(seen)
+    while queue:
+        node_id, depth = queue.popleft()
+        if types[node_id] == "join":
+            if depth == 0:
+                joins.add(node_id)
+                continue
+            depth -= 1
+        elif types[node_id] == "fork":
+            if depth == max_depth:
+                continue
+            depth += 1
+        for edge in outgoing[node_id]:
+            state = (edge["target"], depth)
+            if state not in seen:
+                seen.add(state)
+                queue.append(state)
+    return joins
+
+
+def _strongly_connected_components(node_ids: List[str], outgoing) -> List[List[str]]:
+    """Iterative Tarjan; components come out in reverse topological order"""
+    index_of: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+    for root in node_ids:
+        if root in index_of:
+            continue
+        work = [(root, 0)]
+        while work:
+            node_id, edge_index = work.pop()
+            if edge_index == 0:
+                index_of[node_id] = low[node_id] = counter
+                counter += 1
+                stack.append(node_id)
+                on_stack.add(node_id)
+            recurse = False
+            edges = outgoing[node_id]
+            while edge_index < len(edges):
+                target = edges[edge_index]["target"]
+                edge_index += 1
+                if target not in index_of:
+                    work.append((node_id, edge_index))
+                    work.append((target, 0))
+                    recurse = True
+                    break
+                if target in on_stack:
+                    low[node_id] = min(low[node_id], index_of[target])
+            if recurse:
+                continue
+            if low[node_id] == index_of[node_id]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node_id:
+                        break
+                components.append(component[::-1])
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node_id])
+    return components
+
+
+def _topological_levels(components: List[List[str]], outgoing):
+    """Order the condensation DAG and group nodes that can run in parallel"""
+    component_of = {node_id: i for i, component in enumerate(components) for node_id in component}
+    level = [0] * len(components)
+    order: List[str] = []
+    # Tarjan emits components in reverse topological order
+    for i in reversed(range(len(components))):
+        order += components[i]
+        for node_id in components[i]:
+            for edge in outgoing[node_id]:
+                j = component_of[edge["target"]]
+                if j != i:
+                    level[j] = max(level[j], level[i] + 1)
+    levels: List[List[str]] = [[] for _ in range(max(level, default=-1) + 1)]
+    for node_id in order:
+        levels[level[component_of[node_id]]].append(node_id)
+    return order, levels
+
+
+def _condition(edge: Dict[str, Any]) -> Optional[str]:
+    data = edge.get("data") or {}
+    condition = data.get("condition") or data.get("conditionExpression")
+    return condition if isinstance(condition, str) and condition.strip() else None
+
+
+class AnalysisStore(ABC):
+    """Latest analysis of each workflow, kept next to the catalog"""
+
+    @abstractmethod
+    def save(self, analysis: WorkflowAnalysis):
+        """Store an analysis, replacing the workflow's previous one"""
+
+    @abstractmethod
+    def get(self, workflow_id: str) -> Optional[WorkflowAnalysis]:
+        """Return the stored analysis of a workflow, if any"""
+
+    @abstractmethod
+    def delete(self, workflow_id: str):
+        """Forget the analysis of a workflow"""
+
+
+class SQLiteAnalysisStore(AnalysisStore):
+    """Analyses kept in the catalog SQLite database"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        with db.transaction() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS workflow_analysis (
+                    workflow_id TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )"""
+            )
+
+    def save(self, analysis: WorkflowAnalysis):
+        with self.db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO workflow_analysis (workflow_id, hash, data) VALUES (?, ?, ?)
+                ON CONFLICT(workflow_id) DO UPDATE SET hash = excluded.hash, data = excluded.data""",
+                (analysis.workflowId, analysis.hash, analysis.json()),
+            )
+
+    def get(self, workflow_id: str) -> Optional[WorkflowAnalysis]:
+        rows = self.db.query("SELECT data FROM workflow_analysis WHERE workflow_id = ?", (workflow_id,))
+        return WorkflowAnalysis(**json.loads(rows[0][0])) if rows else None
+
+    def delete(self, workflow_id: str):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM workflow_analysis WHERE workflow_id = ?", (workflow_id,))
+
+
+class JSONFileAnalysisStore(AnalysisStore):
+    """Analyses kept in one JSON file next to the catalog's, rewritten on every change"""
+
+    def __init__(self, path: Path = ANALYSIS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def save(self, analysis: WorkflowAnalysis):
+        with self.lock:
+            analyses = {**self._load(), analysis.workflowId: json.loads(analysis.json())}
+            write_json_atomic(self.path, analyses)
+
+    def get(self, workflow_id: str) -> Optional[WorkflowAnalysis]:
+        data = self._load().get(workflow_id)
+        return WorkflowAnalysis(**data) if data else None
+
+    def delete(self, workflow_id: str):
+        with self.lock:
+            analyses = self._load()
+            if workflow_id in analyses:
+                write_json_atomic(self.path, {key: value for key, value in analyses.items() if key != workflow_id})
+
+    def _load(self) -> Dict[str, Any]:
+        return read_json_cached(self.path) if self.path.exists() else {}
+
+
+_analysis_store: Optional[AnalysisStore] = None
+
+
+def get_analysis_store() -> AnalysisStore:
+    """Return the process-wide analysis store, kept by the configured catalog storage backend"""
+    global _analysis_store
+    if _analysis_store is None:
+        if STORAGE_BACKEND == "json":
+            _analysis_store = JSONFileAnalysisStore()
+        elif STORAGE_BACKEND == "sqlite":
+            _analysis_store = SQLiteAnalysisStore(get_database())
+        else:
+            raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+    return _analysis_store
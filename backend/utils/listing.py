@@ -0,0 +1,87 @@
+import base64
+import binascii
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from utils.storage import CatalogQuery, CatalogStore
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class ListingParams:
+    """Query parameters shared by the paginated catalog listing endpoints"""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+        name_prefix: Optional[str] = Query(None, description="Only names starting with this prefix"),
+        updated_after: Optional[str] = Query(None, description="Only items with updatedAt >= this ISO timestamp"),
+        updated_before: Optional[str] = Query(None, description="Only items with updatedAt <= this ISO timestamp"),
+        fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.name_prefix = name_prefix
+        self.updated_after = updated_after
+        self.updated_before = updated_before
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    @property
+    def requested(self) -> bool:
+        """Whether the client asked for a page rather than the full catalog"""
+        return any(
+            value is not None
+            for value in (self.limit, self.cursor, self.name_prefix, self.updated_after, self.updated_before, self.fields)
+        )
+
+    def query(self, tag: Optional[str] = None) -> CatalogQuery:
+        return CatalogQuery(
+            limit=self.limit or DEFAULT_PAGE_SIZE,
+            after=decode_cursor(self.cursor) if self.cursor is not None else None,
+            name_prefix=self.name_prefix,
+            updated_after=self.updated_after,
+            updated_before=self.updated_before,
+            tag=tag,
+        )
+
+
+def encode_cursor(record_id: str) -> str:
+    return base64.urlsafe_b64encode(record_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Return the record id of a cursor from encode_cursor; anything else is a 400, never a first page"""
+    try:
+        record_id = base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Non-canonical encodings decode to some id too, so only accept what encode_cursor produces
+    if not record_id or encode_cursor(record_id) != cursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return record_id
+
+
+def project(record: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested top-level fields of a record"""
+    if not fields:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def page_response(
+    store: CatalogStore,
+    params: ListingParams,
+    tag: Optional[str] = None,
+    transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> JSONResponse:
+    """Serve one page of a catalog, with the next cursor in a response header"""
+    records, next_after = store.page(params.query(tag))
+    if transform is not None:
+        records = [transform(record) for record in records]
+    headers = {NEXT_CURSOR_HEADER: encode_cursor(next_after)} if next_after is not None else {}
+    return JSONResponse([project(record, params.fields) for record in records], headers=headers)
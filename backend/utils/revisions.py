@@ -0,0 +1,381 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+from utils.file_operations import DATA_DIR, read_json_cached, write_json_atomic
+from utils.storage import STORAGE_BACKEND, SQLiteDatabase, get_database
+
+# A full snapshot is stored once a revision would sit this many deltas from the last one,
+# so rebuilding any revision applies at most SNAPSHOT_INTERVAL - 1 deltas
+SNAPSHOT_INTERVAL = int(os.getenv("REVISION_SNAPSHOT_INTERVAL", "10"))
+
+# Workflow fields stored alongside each revision but not part of its content hash
+META_FIELDS = ("name", "description", "version", "createdAt", "updatedAt")
+
+# Meta fields that are part of a revision's identity, so editing them records a revision;
+# timestamps are left out, so saving unchanged content only moves head
+IDENTITY_FIELDS = ("name", "description", "version")
+
+# Where revisions live with the JSON storage backend
+REVISIONS_FILE = DATA_DIR / "workflow_revisions.json"
+
+
+def canonical_content(workflow: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the nodes/edges of a workflow in a stable, id-sorted form"""
+    return {
+        "nodes": sorted(workflow.get("nodes", []), key=lambda n: n["id"]),
+        "edges": sorted(workflow.get("edges", []), key=lambda e: e["id"]),
+    }
+
+
+def content_hash(workflow: Dict[str, Any]) -> str:
+    """Hash the canonicalized nodes/edges of a workflow"""
+    content = json.dumps(canonical_content(workflow), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def identity_hash(workflow: Dict[str, Any]) -> str:
+    """Hash the content and the identity fields of a workflow, the key of its revision"""
+    identity = {"content": canonical_content(workflow), **{field: workflow.get(field) for field in IDENTITY_FIELDS}}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def make_delta(parent: Dict[str, Any], child: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe child as items put and ids deleted relative to parent, per collection"""
+    delta = {}
+    for key in ("nodes", "edges"):
+        before = {item["id"]: item for item in parent[key]}
+        after = {item["id"]: item for item in child[key]}
+        delta[key] = {
+            "put": [item for item_id, item in after.items() if before.get(item_id) != item],
+            "del": [item_id for item_id in before if item_id not in after],
+        }
+    return delta
+
+
+def apply_delta(parent: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild child content from its parent content and a delta"""
+    content = {}
+    for key in ("nodes", "edges"):
+        items = {item["id"]: item for item in parent[key]}
+        for item_id in delta[key]["del"]:
+            items.pop(item_id, None)
+        for item in delta[key]["put"]:
+            items[item["id"]] = item
+        content[key] = sorted(items.values(), key=lambda i: i["id"])
+    return content
+
+
+def diff_contents(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize added, removed and changed nodes/edges between two contents"""
+    diff = {}
+    for key in ("nodes", "edges"):
+        before = {item["id"]: item for item in old[key]}
+        after = {item["id"]: item for item in new[key]}
+        diff[key] = {
+            "added": [item for item_id, item in after.items() if item_id not in before],
+            "removed": [item for item_id, item in before.items() if item_id not in after],
+            "changed": [
+                {"before": before[item_id], "after": item}
+                for item_id, item in after.items()
+                if item_id in before and before[item_id] != item
+            ],
+        }
+    return diff
+
+
+def _pack(data: Any) -> bytes:
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+class RevisionStore(ABC):
+    """Immutable workflow revisions, keyed by identity_hash and stored as snapshots and deltas
+
+    Subclasses keep the revision rows; a row holds parent_hash, depth, kind,
+    payload (a snapshot or a delta), meta and, in listings, seq and created_at.
+    """
+
+    def __init__(self, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        self.snapshot_interval = max(1, snapshot_interval)
+
+    @abstractmethod
+    def head(self, workflow_id: str) -> Optional[str]:
+        """Return the hash of the workflow's current revision"""
+
+    @abstractmethod
+    def delete(self, workflow_id: str):
+        """Remove every revision of a workflow"""
+
+    @abstractmethod
+    def _transaction(self) -> ContextManager:
+        """Hold the store for one atomic write; reads inside it see the write so far"""
+
+    @abstractmethod
+    def _row(self, workflow_id: str, revision_hash: str) -> Optional[Dict[str, Any]]:
+        """Return a revision row, with its payload still encoded"""
+
+    @abstractmethod
+    def _rows(self, workflow_id: str) -> List[Dict[str, Any]]:
+        """Return hash, seq, parent_hash, kind, meta and created_at of every revision, newest first"""
+
+    @abstractmethod
+    def _insert(self, workflow_id: str, revision_hash: str, row: Dict[str, Any]):
+        """Store a new revision row with the next seq of the workflow"""
+
+    @abstractmethod
+    def _set_head(self, workflow_id: str, revision_hash: str):
+        """Make a revision the workflow's current one"""
+
+    def _encode(self, payload: Dict[str, Any]) -> Any:
+        return payload
+
+    def _decode(self, payload: Any) -> Dict[str, Any]:
+        return payload
+
+    def record(self, workflow: Dict[str, Any]) -> str:
+        """Store the workflow as a new revision unless its content and identity fields already exist, and make it head"""
+        workflow_id = workflow["id"]
+        revision_hash = identity_hash(workflow)
+        content = canonical_content(workflow)
+        meta = {field: workflow.get(field) for field in META_FIELDS}
+        with self._transaction():
+            if self._row(workflow_id, revision_hash) is None:
+                parent_hash = self.head(workflow_id)
+                parent = self._row(workflow_id, parent_hash) if parent_hash else None
+                if parent is None or parent["depth"] + 1 >= self.snapshot_interval:
+                    kind, depth, payload = "snapshot", 0, content
+                else:
+                    parent_content = self._content(workflow_id, parent_hash)
+                    kind, depth, payload = "delta", parent["depth"] + 1, make_delta(parent_content, content)
+                self._insert(workflow_id, revision_hash, {
+                    "parent_hash": parent_hash if parent else None,
+                    "depth": depth,
+                    "kind": kind,
+                    "payload": self._encode(payload),
+                    "meta": meta,
+                    "created_at": datetime.utcnow().isoformat(),
+                })
+            self._set_head(workflow_id, revision_hash)
+        return revision_hash
+
+    def list(self, workflow_id: str) -> List[Dict[str, Any]]:
+        """List revision metadata, newest first"""
+        head = self.head(workflow_id)
+        return [
+            {
+                "hash": row["hash"],
+                "seq": row["seq"],
+                "parentHash": row["parent_hash"],
+                "kind": row["kind"],
+                "createdAt": row["created_at"],
+                "isHead": row["hash"] == head,
+                **row["meta"],
+            }
+            for row in self._rows(workflow_id)
+        ]
+
+    def get(self, workflow_id: str, revision_hash: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the full workflow stored under a revision"""
+        row = self._row(workflow_id, revision_hash)
+        if row is None:
+            return None
+        return {"id": workflow_id, **row["meta"], **self._content(workflow_id, revision_hash)}
+
+    def diff(self, workflow_id: str, old_hash: str, new_hash: str) -> Optional[Dict[str, Any]]:
+        """Compare the content of two revisions"""
+        if self._row(workflow_id, old_hash) is None or self._row(workflow_id, new_hash) is None:
+            return None
+        return diff_contents(self._content(workflow_id, old_hash), self._content(workflow_id, new_hash))
+
+    def _content(self, workflow_id: str, revision_hash: str) -> Dict[str, Any]:
+        """Walk back to the nearest snapshot and replay the deltas forward"""
+        deltas = []
+        row = self._row(workflow_id, revision_hash)
+        while row["kind"] == "delta":
+            deltas.append(self._decode(row["payload"]))
+            row = self._row(workflow_id, row["parent_hash"])
+        content = self._decode(row["payload"])
+        for delta in reversed(deltas):
+            content = apply_delta(content, delta)
+        return content
+
+
+class SQLiteRevisionStore(RevisionStore):
+    """Revisions kept in the catalog SQLite database, payloads compressed"""
+
+    def __init__(self, db: SQLiteDatabase, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        super().__init__(snapshot_interval)
+        self.db = db
+        with db.transaction() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS workflow_revisions (
+                    workflow_id TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    parent_hash TEXT,
+                    depth INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    meta TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (workflow_id, hash)
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS workflow_revisions_seq ON workflow_revisions (workflow_id, seq)"
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS workflow_heads (
+                    workflow_id TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL
+                )"""
+            )
+
+    def head(self, workflow_id: str) -> Optional[str]:
+        rows = self.db.query("SELECT hash FROM workflow_heads WHERE workflow_id = ?", (workflow_id,))
+        return rows[0][0] if rows else None
+
+    def delete(self, workflow_id: str):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM workflow_revisions WHERE workflow_id = ?", (workflow_id,))
+            conn.execute("DELETE FROM workflow_heads WHERE workflow_id = ?", (workflow_id,))
+
+    def _transaction(self) -> ContextManager:
+        return self.db.transaction()
+
+    def _row(self, workflow_id: str, revision_hash: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.query(
+            """SELECT parent_hash, depth, kind, payload, meta FROM workflow_revisions
+            WHERE workflow_id = ? AND hash = ?""",
+            (workflow_id, revision_hash),
+        )
+        if not rows:
+            return None
+        parent_hash, depth, kind, payload, meta = rows[0]
+        return {"parent_hash": parent_hash, "depth": depth, "kind": kind, "payload": payload, "meta": json.loads(meta)}
+
+    def _rows(self, workflow_id: str) -> List[Dict[str, Any]]:
+        rows = self.db.query(
+            """SELECT hash, seq, parent_hash, kind, meta, created_at FROM workflow_revisions
+            WHERE workflow_id = ? ORDER BY seq DESC""",
+            (workflow_id,),
+        )
+        return [
+            {"hash": revision_hash, "seq": seq, "parent_hash": parent_hash, "kind": kind,
+             "meta": json.loads(meta), "created_at": created_at}
+            for revision_hash, seq, parent_hash, kind, meta, created_at in rows
+        ]
+
+    # Writes run inside record()'s transaction on the shared connection
+
+    def _insert(self, workflow_id: str, revision_hash: str, row: Dict[str, Any]):
+        seq = self.db.query(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM workflow_revisions WHERE workflow_id = ?", (workflow_id,)
+        )[0][0]
+        self.db.query(
+            """INSERT INTO workflow_revisions
+            (workflow_id, hash, seq, parent_hash, depth, kind, payload, meta, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (workflow_id, revision_hash, seq, row["parent_hash"], row["depth"], row["kind"], row["payload"],
+             json.dumps(row["meta"]), row["created_at"]),
+        )
+
+    def _set_head(self, workflow_id: str, revision_hash: str):
+        self.db.query(
+            """INSERT INTO workflow_heads (workflow_id, hash) VALUES (?, ?)
+            ON CONFLICT(workflow_id) DO UPDATE SET hash = excluded.hash""",
+            (workflow_id, revision_hash),
+        )
+
+    def _encode(self, payload: Dict[str, Any]) -> bytes:
+        return _pack(payload)
+
+    def _decode(self, payload: bytes) -> Dict[str, Any]:
+        return _unpack(payload)
+
+
+class JSONFileRevisionStore(RevisionStore):
+    """Revisions kept in one JSON file next to the catalog's, rewritten on every change"""
+
+    def __init__(self, path: Path = REVISIONS_FILE, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        super().__init__(snapshot_interval)
+        self.path = path
+        self.lock = threading.RLock()
+        self._pending: Optional[Dict[str, Any]] = None
+
+    def head(self, workflow_id: str) -> Optional[str]:
+        return self._data()["heads"].get(workflow_id)
+
+    def delete(self, workflow_id: str):
+        with self._transaction():
+            self._pending["revisions"].pop(workflow_id, None)
+            self._pending["heads"].pop(workflow_id, None)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self.lock:
+            if self._pending is not None:
+                yield
+                return
+            self._pending = copy.deepcopy(self._load())
+            try:
+                yield
+                write_json_atomic(self.path, self._pending)
+            finally:
+                self._pending = None
+
+    def _row(self, workflow_id: str, revision_hash: str) -> Optional[Dict[str, Any]]:
+        return self._data()["revisions"].get(workflow_id, {}).get(revision_hash)
+
+    def _rows(self, workflow_id: str) -> List[Dict[str, Any]]:
+        revisions = self._data()["revisions"].get(workflow_id, {})
+        rows = [{"hash": revision_hash, **row} for revision_hash, row in revisions.items()]
+        return sorted(rows, key=lambda row: row["seq"], reverse=True)
+
+    def _insert(self, workflow_id: str, revision_hash: str, row: Dict[str, Any]):
+        with self._transaction():
+            revisions = self._pending["revisions"].setdefault(workflow_id, {})
+            seq = max((existing["seq"] for existing in revisions.values()), default=0) + 1
+            revisions[revision_hash] = {**row, "seq": seq}
+
+    def _set_head(self, workflow_id: str, revision_hash: str):
+        with self._transaction():
+            self._pending["heads"][workflow_id] = revision_hash
+
+    def _data(self) -> Dict[str, Any]:
+        # Blocks while another thread writes; the writing thread sees its own changes
+        with self.lock:
+            return self._pending if self._pending is not None else self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {"heads": {}, "revisions": {}}
+        return read_json_cached(self.path)
+
+
+_revision_store: Optional[RevisionStore] = None
+
+
+def get_revision_store() -> RevisionStore:
+    """Return the process-wide revision store, kept by the configured catalog storage backend"""
+    global _revision_store
+    if _revision_store is None:
+        if STORAGE_BACKEND == "json":
+            _revision_store = JSONFileRevisionStore()
+        elif STORAGE_BACKEND == "sqlite":
+            _revision_store = SQLiteRevisionStore(get_database())
+        else:
+            raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+    return _revision_store
@@ -0,0 +1,390 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from utils.file_operations import (
+    DATA_DIR,
+    TEMPLATES_FILE,
+    TOOLS_FILE,
+    WORKFLOWS_FILE,
+    file_signature,
+    load_templates,
+    load_tools,
+    load_workflows,
+    save_templates,
+    save_tools,
+    save_workflows,
+)
+
+# Storage backend selection: "sqlite" (default) or "json"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite").lower()
+DB_FILE = Path(os.getenv("STORAGE_DB_PATH", str(DATA_DIR / "catalog.db")))
+
+# Collections served by the API and the JSON loaders/savers they migrate from
+JSON_SOURCES = {
+    "workflows": (WORKFLOWS_FILE, load_workflows, save_workflows),
+    "templates": (TEMPLATES_FILE, load_templates, save_templates),
+    "tools": (TOOLS_FILE, load_tools, save_tools),
+}
+
+
+def workflow_node_types(record: Dict[str, Any]) -> Set[str]:
+    """Return the node types present in a workflow record"""
+    return {(node.get("data") or {}).get("type") or node.get("type") for node in record.get("nodes", [])}
+
+
+# Per-collection tag extractors backing the indexed "has tag" filter
+TAGGERS: Dict[str, Callable[[Dict[str, Any]], Set[str]]] = {
+    "workflows": workflow_node_types,
+}
+
+
+@dataclass
+class CatalogQuery:
+    """Filters and keyset position for one page of a catalog listing"""
+    limit: int
+    after: Optional[str] = None
+    name_prefix: Optional[str] = None
+    updated_after: Optional[str] = None
+    updated_before: Optional[str] = None
+    tag: Optional[str] = None
+
+    def matches(self, record: Dict[str, Any], tags: Set[str]) -> bool:
+        """Check a record against the filters in Python, for stores without indexes"""
+        name = record.get("name") or ""
+        updated_at = record.get("updatedAt") or ""
+        return (
+            (self.after is None or record["id"] > self.after)
+            and (not self.name_prefix or name.startswith(self.name_prefix))
+            and (not self.updated_after or updated_at >= self.updated_after)
+            and (not self.updated_before or updated_at <= self.updated_before)
+            and (not self.tag or self.tag in tags)
+        )
+
+
+class CatalogStore(ABC):
+    """Storage backend for a single catalog collection keyed by record id"""
+
+    tagger: Optional[Callable[[Dict[str, Any]], Set[str]]] = None
+
+    @abstractmethod
+    def list(self) -> List[Dict[str, Any]]:
+        """Return all records"""
+
+    @abstractmethod
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Return a single record or None if it does not exist"""
+
+    @abstractmethod
+    def create(self, record: Dict[str, Any]) -> bool:
+        """Insert a new record, returning False if the id is already taken"""
+
+    @abstractmethod
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert a record or replace the existing one with the same id"""
+
+    @abstractmethod
+    def delete(self, record_id: str) -> bool:
+        """Delete a record, returning False if it did not exist"""
+
+    @abstractmethod
+    def version(self) -> Hashable:
+        """Return a cheap token that changes whenever the collection changes"""
+
+    def page(self, query: CatalogQuery) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return records matching the query ordered by id, plus the id to resume after"""
+        tagger = self.tagger or (lambda record: set())
+        records = sorted(
+            (r for r in self.list() if query.matches(r, tagger(r))),
+            key=lambda r: r["id"],
+        )
+        return _split_page(records[: query.limit + 1], query.limit)
+
+
+class SQLiteCatalogStore(CatalogStore):
+    """Catalog collection stored as one row per record in a SQLite table"""
+
+    def __init__(self, db: "SQLiteDatabase", collection: str, tagger=None):
+        self.db = db
+        self.collection = collection
+        self.tagger = tagger
+        self.writes = 0
+
+    def list(self) -> List[Dict[str, Any]]:
+        rows = self.db.query(f"SELECT data FROM {self.collection} ORDER BY rowid")
+        return [json.loads(row[0]) for row in rows]
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.query(f"SELECT data FROM {self.collection} WHERE id = ?", (record_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def create(self, record: Dict[str, Any]) -> bool:
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(
+                    f"INSERT INTO {self.collection} (id, name, updated_at, data) VALUES (?, ?, ?, ?)",
+                    _row(record),
+                )
+                self._write_tags(conn, record)
+                self.writes += 1
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                f"""INSERT INTO {self.collection} (id, name, updated_at, data) VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name,
+                    updated_at = excluded.updated_at,
+                    data = excluded.data""",
+                _row(record),
+            )
+            self._write_tags(conn, record)
+            self.writes += 1
+
+    def delete(self, record_id: str) -> bool:
+        with self.db.transaction() as conn:
+            cursor = conn.execute(f"DELETE FROM {self.collection} WHERE id = ?", (record_id,))
+            conn.execute(f"DELETE FROM {self.collection}_tags WHERE id = ?", (record_id,))
+            self.writes += cursor.rowcount
+        return cursor.rowcount > 0
+
+    def version(self) -> Hashable:
+        # data_version moves on commits from other connections, writes on our own
+        return (self.db.data_version(), self.writes)
+
+    def page(self, query: CatalogQuery) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        clauses, params = [], []
+        if query.after is not None:
+            clauses.append("id > ?")
+            params.append(query.after)
+        if query.name_prefix:
+            # Range scan on the name index; U+10FFFF sorts after any continuation
+            clauses.append("name >= ? AND name < ?")
+            params += [query.name_prefix, query.name_prefix + "\U0010ffff"]
+        if query.updated_after:
+            clauses.append("updated_at >= ?")
+            params.append(query.updated_after)
+        if query.updated_before:
+            clauses.append("updated_at <= ?")
+            params.append(query.updated_before)
+        if query.tag:
+            clauses.append(f"id IN (SELECT id FROM {self.collection}_tags WHERE tag = ?)")
+            params.append(query.tag)
+        where = " AND ".join(clauses) or "1"
+        rows = self.db.query(
+            f"SELECT data FROM {self.collection} WHERE {where} ORDER BY id LIMIT ?",
+            (*params, query.limit + 1),
+        )
+        return _split_page([json.loads(row[0]) for row in rows], query.limit)
+
+    def _write_tags(self, conn: sqlite3.Connection, record: Dict[str, Any]):
+        """Replace the tag index rows for a record inside the current transaction"""
+        if self.tagger is None:
+            return
+        conn.execute(f"DELETE FROM {self.collection}_tags WHERE id = ?", (record["id"],))
+        conn.executemany(
+            f"INSERT INTO {self.collection}_tags (tag, id) VALUES (?, ?)",
+            [(tag, record["id"]) for tag in self.tagger(record) if tag],
+        )
+
+
+class JSONFileCatalogStore(CatalogStore):
+    """Catalog collection kept in its legacy JSON file, rewritten on every change"""
+
+    def __init__(
+        self,
+        path: Path,
+        load: Callable[[], List[Dict[str, Any]]],
+        save: Callable[[List[Dict[str, Any]]], None],
+        tagger=None,
+    ):
+        self.path = path
+        self.tagger = tagger
+        self.load = load
+        self.save = save
+        self.lock = threading.Lock()
+        self.writes = 0
+
+    def list(self) -> List[Dict[str, Any]]:
+        return self.load()
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        return next((r for r in self.load() if r["id"] == record_id), None)
+
+    def create(self, record: Dict[str, Any]) -> bool:
+        with self.lock:
+            records = self.load()
+            if any(r["id"] == record["id"] for r in records):
+                return False
+            records.append(record)
+            self.save(records)
+            self.writes += 1
+        return True
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        with self.lock:
+            records = self.load()
+            for i, existing in enumerate(records):
+                if existing["id"] == record["id"]:
+                    records[i] = record
+                    break
+            else:
+                records.append(record)
+            self.save(records)
+            self.writes += 1
+
+    def delete(self, record_id: str) -> bool:
+        with self.lock:
+            records = self.load()
+            remaining = [r for r in records if r["id"] != record_id]
+            if len(remaining) == len(records):
+                return False
+            self.save(remaining)
+            self.writes += 1
+        return True
+
+    def version(self) -> Hashable:
+        # mtime catches edits outside the API, writes catches same-tick API writes
+        return (file_signature(self.path), self.writes)
+
+
+class SQLiteDatabase:
+    """Shared SQLite connection with schema setup and one-shot JSON migration"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS _meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def data_version(self) -> int:
+        """Return SQLite's counter of commits made by other connections"""
+        return self.query("PRAGMA data_version")[0][0]
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the connection lock and run the enclosed statements as one atomic write"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def ensure_collection(
+        self,
+        collection: str,
+        migrate_from: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        tagger: Optional[Callable[[Dict[str, Any]], Set[str]]] = None,
+    ):
+        """Create the collection tables and import its JSON file the first time it is opened"""
+        with self.transaction() as conn:
+            conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS {collection} (
+                    id TEXT PRIMARY KEY,
+                    name TEXT,
+                    updated_at TEXT,
+                    data TEXT NOT NULL
+                )"""
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {collection}_name ON {collection} (name)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {collection}_updated_at ON {collection} (updated_at)")
+            conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS {collection}_tags (
+                    tag TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    PRIMARY KEY (tag, id)
+                ) WITHOUT ROWID"""
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {collection}_tags_id ON {collection}_tags (id)")
+
+            marker = f"migrated:{collection}"
+            if migrate_from is not None and not self._has_marker(conn, marker):
+                rows = [_row(record) for record in migrate_from() if isinstance(record, dict) and record.get("id")]
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {collection} (id, name, updated_at, data) VALUES (?, ?, ?, ?)", rows
+                )
+                conn.execute("INSERT INTO _meta (key, value) VALUES (?, ?)", (marker, str(len(rows))))
+
+            # Backfill the tag index for databases created before it existed
+            marker = f"tagged:{collection}"
+            if tagger is not None and not self._has_marker(conn, marker):
+                conn.execute(f"DELETE FROM {collection}_tags")
+                for (data,) in conn.execute(f"SELECT data FROM {collection}").fetchall():
+                    record = json.loads(data)
+                    conn.executemany(
+                        f"INSERT OR IGNORE INTO {collection}_tags (tag, id) VALUES (?, ?)",
+                        [(tag, record["id"]) for tag in tagger(record) if tag],
+                    )
+                conn.execute("INSERT INTO _meta (key, value) VALUES (?, ?)", (marker, "1"))
+
+    @staticmethod
+    def _has_marker(conn: sqlite3.Connection, key: str) -> bool:
+        return conn.execute("SELECT 1 FROM _meta WHERE key = ?", (key,)).fetchone() is not None
+
+
+def _split_page(records: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim a limit + 1 fetch to the page and report the id to resume after"""
+    if len(records) > limit:
+        return records[:limit], records[limit - 1]["id"]
+    return records, None
+
+
+def _row(record: Dict[str, Any]) -> tuple:
+    """Build the (id, name, updated_at, data) column tuple for a record"""
+    return (
+        record["id"],
+        record.get("name"),
+        record.get("updatedAt"),
+        json.dumps(record, separators=(",", ":")),
+    )
+
+
+_database: Optional[SQLiteDatabase] = None
+_stores: Dict[str, CatalogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_database() -> SQLiteDatabase:
+    """Return the process-wide SQLite database, opening it on first use"""
+    global _database
+    if _database is None:
+        _database = SQLiteDatabase(DB_FILE)
+    return _database
+
+
+def get_store(collection: str) -> CatalogStore:
+    """Return the configured store for a catalog collection"""
+    if collection not in JSON_SOURCES:
+        raise ValueError(f"Unknown catalog collection: {collection}")
+    with _stores_lock:
+        if collection not in _stores:
+            path, load, save = JSON_SOURCES[collection]
+            tagger = TAGGERS.get(collection)
+            if STORAGE_BACKEND == "json":
+                _stores[collection] = JSONFileCatalogStore(path, load, save, tagger=tagger)
+            elif STORAGE_BACKEND == "sqlite":
+                db = get_database()
+                db.ensure_collection(collection, migrate_from=load, tagger=tagger)
+                _stores[collection] = SQLiteCatalogStore(db, collection, tagger=tagger)
+            else:
+                raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+        return _stores[collection]
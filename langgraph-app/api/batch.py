@@ -0,0 +1,129 @@
+"""Streaming batch execution for lead backfills."""
+
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Set, Union
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+class InvalidItem:
+    """A batch line that could not be decoded."""
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+def is_ndjson(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    return content_type in NDJSON_TYPES
+
+
+async def ndjson_items(request: Request) -> AsyncIterator[Union[Any, InvalidItem]]:
+    """Decode an NDJSON request body line by line as it arrives."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _decode(line)
+    if buffer.strip():
+        yield _decode(buffer)
+
+
+async def array_items(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _decode(line: bytes) -> Union[Any, InvalidItem]:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return InvalidItem(f"Invalid JSON: {e}")
+
+
+async def run_batch(
+    items: AsyncIterator[Any],
+    process: Callable[[int, Any], Awaitable[Dict[str, Any]]],
+    concurrency: int = BATCH_CONCURRENCY,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Process items with bounded parallelism and yield each result as it completes.
+
+    An item holds one of ``concurrency`` slots from the moment it is read
+    until the consumer takes its result, so a slow client stops the input
+    from being read and memory stays flat however long the input is. A failing item yields an error result instead of
+    stopping the batch.
+    """
+    results: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(max(1, concurrency))
+    pending: Set[asyncio.Task] = set()
+
+    async def one(index: int, item: Any) -> None:
+        try:
+            result = await process(index, item)
+        except Exception as e:
+            result = {"index": index, "status": "error", "error": str(e)}
+        # The slot is released by the consumer once it takes the result
+        results.put_nowait(result)
+
+    async def produce() -> None:
+        index = 0
+        async for item in items:
+            await slots.acquire()
+            task = asyncio.create_task(one(index, item))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            index += 1
+        await asyncio.gather(*pending)
+        await results.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            slots.release()
+            yield result
+        await producer
+    finally:
+        # The client went away or the batch failed: stop feeding work
+        producer.cancel()
+        for task in list(pending):
+            task.cancel()
+
+
+class NDJSONResponse(StreamingResponse):
+    """Stream NDJSON without a concurrent disconnect listener.
+
+    StreamingResponse normally reads ``receive`` in the background to notice
+    disconnects, which would steal body chunks from an NDJSON upload that is
+    still being consumed. A client that goes away surfaces as a failed send
+    or a ClientDisconnect from the request stream instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+async def ndjson_stream(results: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Serialize results as NDJSON and finish with a summary line of status counts."""
+    counts: Dict[str, int] = {}
+    async for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        yield json.dumps(result, default=str) + "\n"
+    yield json.dumps({"summary": counts}) + "\n"
@@ -0,0 +1,266 @@
+"""Bounded lead intake queue drained by background workers, with an optional SQLite spool."""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from observability import log_event
+
+INTAKE_MAX_QUEUE = int(os.getenv("INTAKE_MAX_QUEUE", "1000"))
+INTAKE_WORKERS = int(os.getenv("INTAKE_WORKERS", "4"))
+# Attempts to start a run before the event is recorded as failed
+INTAKE_MAX_ATTEMPTS = int(os.getenv("INTAKE_MAX_ATTEMPTS", "5"))
+# Backoff before the first retry, doubled per attempt up to INTAKE_RETRY_MAX_DELAY
+INTAKE_RETRY_DELAY = float(os.getenv("INTAKE_RETRY_DELAY", "2"))
+INTAKE_RETRY_MAX_DELAY = float(os.getenv("INTAKE_RETRY_MAX_DELAY", "60"))
+# Failed events kept in memory for status lookups; the spool keeps all of them
+INTAKE_FAILED_KEEP = int(os.getenv("INTAKE_FAILED_KEEP", "1000"))
+# Set to a file path to keep queued events across restarts
+INTAKE_SPOOL_PATH = os.getenv("INTAKE_SPOOL_PATH")
+
+Handler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class IntakeFull(Exception):
+    """Raised when the queue is at capacity; carries a Retry-After estimate in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Intake queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Spool:
+    """Write-ahead store of queued events; rows are deleted once processed and moved aside once failed."""
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS intake (
+                    thread_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS intake_failed (
+                    thread_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    error TEXT NOT NULL,
+                    failed_at REAL NOT NULL
+                )"""
+            )
+
+    def add(self, thread_id: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO intake (thread_id, payload, created_at) VALUES (?, ?, ?)",
+                (thread_id, json.dumps(payload), time.time()),
+            )
+
+    def remove(self, thread_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM intake WHERE thread_id = ?", (thread_id,))
+
+    def fail(self, thread_id: str, error: str) -> None:
+        """Move an event that ran out of attempts out of the replay set, keeping it for inspection."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                """INSERT OR REPLACE INTO intake_failed (thread_id, payload, error, failed_at)
+                   SELECT thread_id, payload, ?, ? FROM intake WHERE thread_id = ?""",
+                (error, time.time(), thread_id),
+            )
+            self._conn.execute("DELETE FROM intake WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("COMMIT")
+
+    def failures(self, limit: int) -> List[Tuple[str, str]]:
+        """The most recent failed events, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, error FROM intake_failed ORDER BY failed_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return rows[::-1]
+
+    def pending(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT thread_id, payload FROM intake ORDER BY created_at").fetchall()
+        return [(thread_id, json.loads(payload)) for thread_id, payload in rows]
+
+
+class IntakeQueue:
+    """Accept events without waiting on the LangGraph server and start their runs in the background.
+
+    An event whose handler raises a retryable error is retried with jittered
+    exponential backoff; after max_attempts, or on any other error, it is
+    recorded as failed and reported by failure().
+
+    Args:
+        handler: Coroutine that starts the run for one queued event.
+        maxsize: Events accepted but not yet started before submit() pushes back.
+        workers: Events processed concurrently.
+        spool: Durable copy of queued events, replayed on start.
+        max_attempts: Handler calls per event before it is recorded as failed.
+        retry_delay: Backoff in seconds before the first retry.
+        retryable: Whether an error raised by the handler may be retried.
+        failed_keep: Failed events remembered for failure(), most recent first.
+    """
+
+    def __init__(self, handler: Handler, maxsize: int = INTAKE_MAX_QUEUE, workers: int = INTAKE_WORKERS,
+                 spool: Optional[Spool] = None, max_attempts: int = INTAKE_MAX_ATTEMPTS,
+                 retry_delay: float = INTAKE_RETRY_DELAY,
+                 retryable: Callable[[Exception], bool] = lambda error: True,
+                 failed_keep: int = INTAKE_FAILED_KEEP):
+        self.handler = handler
+        self.maxsize = maxsize
+        self.workers = max(1, workers)
+        self.spool = spool
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.retryable = retryable
+        self.failed_keep = max(1, failed_keep)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Set[asyncio.Task] = set()
+        self._queued: Set[str] = set()
+        self._attempts: Dict[str, int] = {}
+        self._failed: "OrderedDict[str, str]" = OrderedDict()
+        self._avg_seconds = 1.0
+        self.counters = {"accepted": 0, "rejected": 0, "processed": 0, "retried": 0, "failed": 0}
+
+    async def start(self) -> None:
+        # The queue itself is unbounded so spooled events always replay; submit() enforces maxsize
+        self._queue = asyncio.Queue()
+        if self.spool is not None:
+            for thread_id, error in await asyncio.to_thread(self.spool.failures, self.failed_keep):
+                self._remember_failure(thread_id, error)
+            for thread_id, payload in await asyncio.to_thread(self.spool.pending):
+                self._put(thread_id, payload)
+            if self._queued:
+                log_event("intake_replayed", count=len(self._queued))
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers; spooled events not yet processed are replayed on the next start."""
+        tasks = self._tasks + list(self._retries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._retries.clear()
+
+    async def submit(self, thread_id: str, payload: Dict[str, Any]) -> None:
+        if self._queue is None:
+            raise RuntimeError("Intake queue is not started")
+        if self._queue.qsize() >= self.maxsize:
+            self.counters["rejected"] += 1
+            raise IntakeFull(self.retry_after())
+        if self.spool is not None:
+            await asyncio.to_thread(self.spool.add, thread_id, payload)
+        self._put(thread_id, payload)
+        self.counters["accepted"] += 1
+
+    def is_queued(self, thread_id: str) -> bool:
+        """Whether the event is waiting for a worker or for its next retry."""
+        return thread_id in self._queued
+
+    def failure(self, thread_id: str) -> Optional[str]:
+        """The last error of an event that ran out of attempts, or None."""
+        return self._failed.get(thread_id)
+
+    def retry_after(self) -> int:
+        """Seconds until the workers should have drained the current backlog."""
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return max(1, math.ceil(depth * self._avg_seconds / self.workers))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "maxsize": self.maxsize,
+            "workers": self.workers,
+            "durable": self.spool is not None,
+            "retrying": len(self._retries),
+            **self.counters,
+        }
+
+    def _put(self, thread_id: str, payload: Dict[str, Any]) -> None:
+        self._queued.add(thread_id)
+        self._queue.put_nowait((thread_id, payload))
+
+    async def _work(self) -> None:
+        while True:
+            thread_id, payload = await self._queue.get()
+            start = time.perf_counter()
+            try:
+                await self._process(thread_id, payload)
+            except asyncio.CancelledError:
+                # Leave the spooled copy in place so the event is replayed
+                self._queued.discard(thread_id)
+                raise
+            except Exception as e:
+                # A failing spool must not take the worker down with it
+                log_event("intake_worker_error", logging.ERROR, exc_info=True, thread_id=thread_id, error=str(e))
+            finally:
+                self._queue.task_done()
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (time.perf_counter() - start)
+
+    async def _process(self, thread_id: str, payload: Dict[str, Any]) -> None:
+        try:
+            await self.handler(thread_id, payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._attempt_failed(thread_id, payload, e)
+            return
+        self.counters["processed"] += 1
+        self._queued.discard(thread_id)
+        self._attempts.pop(thread_id, None)
+        if self.spool is not None:
+            await asyncio.to_thread(self.spool.remove, thread_id)
+
+    async def _attempt_failed(self, thread_id: str, payload: Dict[str, Any], error: Exception) -> None:
+        """Schedule a retry, or record the event as failed once it is out of attempts."""
+        attempt = self._attempts.get(thread_id, 0) + 1
+        if attempt < self.max_attempts and self.retryable(error):
+            self._attempts[thread_id] = attempt
+            delay = min(INTAKE_RETRY_MAX_DELAY, self.retry_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            self.counters["retried"] += 1
+            log_event("intake_retry", logging.WARNING, thread_id=thread_id, attempt=attempt,
+                      delay=round(delay, 2), error=str(error))
+            task = asyncio.create_task(self._requeue(thread_id, payload, delay))
+            self._retries.add(task)
+            task.add_done_callback(self._retries.discard)
+            return
+
+        self.counters["failed"] += 1
+        self._attempts.pop(thread_id, None)
+        self._queued.discard(thread_id)
+        message = str(error) or type(error).__name__
+        self._remember_failure(thread_id, message)
+        log_event("intake_failed", logging.ERROR, exc_info=True, thread_id=thread_id, attempts=attempt, error=str(error))
+        if self.spool is not None:
+            await asyncio.to_thread(self.spool.fail, thread_id, message)
+
+    def _remember_failure(self, thread_id: str, error: str) -> None:
+        self._failed[thread_id] = error
+        self._failed.move_to_end(thread_id)
+        while len(self._failed) > self.failed_keep:
+            self._failed.popitem(last=False)
+
+    async def _requeue(self, thread_id: str, payload: Dict[str, Any], delay: float) -> None:
+        # The event stays in _queued while it waits, so its status reads "queued"
+        await asyncio.sleep(delay)
+        self._queue.put_nowait((thread_id, payload))
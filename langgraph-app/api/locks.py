@@ -0,0 +1,29 @@
+"""Per-key asyncio locks for serializing work on a workflow thread."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict
+
+
+class KeyedLocks:
+    """Hand out one asyncio lock per key, dropping it once nobody holds or waits on it."""
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiters: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: str):
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                del self._locks[key]
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -2,15 +2,42 @@
 
 import os
 import json
+import logging
 import httpx
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Union
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
 from langgraph_sdk import get_client
+from langgraph_sdk.client import LangGraphClient
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from batch import InvalidItem, NDJSONResponse, array_items, is_ndjson, ndjson_items, ndjson_stream, run_batch
+from intake import INTAKE_SPOOL_PATH, IntakeFull, IntakeQueue, Spool
+from locks import KeyedLocks
+from observability import debug_dump, debug_sampled, instrument, lifespan, log_event, sdk_call
+
+
+@asynccontextmanager
+async def app_lifespan(app: FastAPI):
+    """Run the log listener and the intake workers for the lifetime of the app."""
+    async with lifespan(app):
+        await intake.start()
+        try:
+            yield
+        finally:
+            await intake.stop()
 
 
 # Initialize FastAPI app
@@ -18,6 +45,7 @@ app = FastAPI(
     title="LangGraph Slack Lead Processing API",
     description="API for processing leads from Slack using LangGraph workflows",
     version="1.0.0",
+    lifespan=app_lifespan,
 )
 
 # Add CORS middleware
@@ -29,8 +57,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Structured logging, request timing and /metrics
+instrument(app)
+
+LANGGRAPH_URL = os.getenv("LANGGRAPH_URL", "http://localhost:8123")
+LANGGRAPH_MAX_CONNECTIONS = int(os.getenv("LANGGRAPH_MAX_CONNECTIONS", "20"))
+
+
+def create_langgraph_client(url: str) -> LangGraphClient:
+    """Create the LangGraph client over one pooled HTTP transport.
+    
+    All endpoints, intake workers and batches share its keep-alive connections;
+    with the optional ``h2`` package installed, HTTPS servers are reached over
+    a single multiplexed HTTP/2 connection. The request headers come from
+    ``get_client``, so the ``x-api-key`` it loads from ``LANGGRAPH_API_KEY``
+    (or ``LANGSMITH_API_KEY``/``LANGCHAIN_API_KEY``) and the SDK user agent are
+    sent on every call.
+    """
+    timeout = httpx.Timeout(connect=5, read=300, write=300, pool=30)
+    sdk_client = get_client(url=url, timeout=timeout)
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        retries=5,
+        limits=httpx.Limits(
+            max_connections=LANGGRAPH_MAX_CONNECTIONS,
+            max_keepalive_connections=LANGGRAPH_MAX_CONNECTIONS
+        )
+    )
+    # get_client takes no transport, so its HTTP client is rebuilt on the pooled
+    # one with the same base URL, timeout and headers
+    sdk_client.http.client = httpx.AsyncClient(
+        base_url=url,
+        transport=transport,
+        timeout=timeout,
+        headers=sdk_client.http.client.headers
+    )
+    return sdk_client
+
+
 # Initialize LangGraph client
-client = get_client(url="http://localhost:8123")
+client = create_langgraph_client(LANGGRAPH_URL)
+ASSISTANT_ID = "slack_approval"
+
+# Serializes approvals per thread within this process
+approval_locks = KeyedLocks()
 
 
 # Request models
@@ -48,6 +118,7 @@ class ApprovalRequest(BaseModel):
     
     thread_id: str = Field(..., description="Thread ID of the workflow")
     approved: bool = Field(..., description="Whether the lead assignment is approved")
+    webhook_url: Optional[str] = Field(None, description="Return immediately and have the LangGraph server post the finished run here")
 
 
 class WorkflowResponse(BaseModel):
@@ -62,6 +133,7 @@ class WorkflowResponse(BaseModel):
     notification_sent: Optional[bool] = Field(None, description="Whether notification was sent to sales person")
     messages: List[str] = Field(default_factory=list, description="Workflow messages")
     requires_approval: bool = Field(False, description="Whether the workflow requires approval")
+    error: Optional[str] = Field(None, description="Why the run could not be started, when status is 'failed'")
 
 
 def extract_state_values(state_values: Any) -> Dict[str, Any]:
@@ -85,11 +157,11 @@ def extract_state_values(state_values: Any) -> Dict[str, Any]:
     
     # Handle case where state_values is not a dict
     if callable(state_values):
-        print("Warning: state_values is callable, not a dict")
+        log_event("state_values_callable", logging.WARNING)
         return result
     
     if not state_values or not isinstance(state_values, dict):
-        print(f"Warning: state_values is not a dict: {type(state_values)}")
+        log_event("state_values_not_dict", logging.WARNING, type=type(state_values).__name__)
         return result
     
     # Extract messages
@@ -121,7 +193,6 @@ def extract_state_values(state_values: Any) -> Dict[str, Any]:
             result["approval_status"] = state_values["approval_status"].lower() == "true"
         else:
             result["approval_status"] = bool(state_values["approval_status"])
-        print(f"Extracted approval_status: {result['approval_status']} (original: {state_values['approval_status']})")
     
     if "hubspot_lead_created" in state_values:
         if isinstance(state_values["hubspot_lead_created"], str):
@@ -138,95 +209,193 @@ def extract_state_values(state_values: Any) -> Dict[str, Any]:
     return result
 
 
+# Transport errors raised before the request reached the server
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def is_retryable_start(error: Exception) -> bool:
+    """Whether starting a lead's run may be retried after this error.
+
+    start_lead_run has already ruled out that an ambiguous failure created the
+    run, so connection failures, read timeouts, 429 and 5xx are retried; any
+    other rejection fails the lead right away.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+async def existing_run(thread_id: str) -> Optional[Dict[str, Any]]:
+    """The most recent run on a thread, or None if the thread has no runs yet."""
+    try:
+        async with sdk_call("runs.list"):
+            runs = await client.runs.list(thread_id, limit=1)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
+    return runs[0] if runs else None
+
+
+async def start_lead_run(thread_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Create the thread and start the workflow for a lead in one call.
+    
+    The call is safe to retry: a conflicting run, or one created by an attempt
+    whose response was lost, is returned instead of starting a second run.
+    
+    Args:
+        thread_id: Thread ID handed to the caller at intake
+        input_data: The workflow input
+        
+    Returns:
+        The created run
+    """
+    sampled = debug_sampled()
+    debug_dump(sampled, "run_input", input_data, thread_id=thread_id)
+    
+    # Run the workflow until it interrupts for approval; the server creates
+    # the thread if it does not exist yet and rejects a second concurrent run
+    try:
+        async with sdk_call("runs.create"):
+            run = await client.runs.create(
+                thread_id=thread_id,
+                assistant_id=ASSISTANT_ID,
+                input=input_data,
+                if_not_exists="create",
+                multitask_strategy="reject"
+            )
+    except NOT_SENT_ERRORS:
+        raise
+    except (httpx.HTTPStatusError, httpx.TransportError) as e:
+        # 409 means a run is already in flight on the thread, and a 5xx or a
+        # lost response may come after the run was accepted; 429 and other
+        # 4xx were rejected outright
+        if isinstance(e, httpx.HTTPStatusError) and e.response.status_code != 409 and e.response.status_code < 500:
+            raise
+        run = await existing_run(thread_id)
+        if run is None:
+            raise
+        log_event("run_already_started", thread_id=thread_id, run_id=run.get("run_id"), error=str(e))
+        return run
+    log_event("run_created", thread_id=thread_id, run_id=run.get("run_id"))
+    debug_dump(sampled, "run_created_payload", run, thread_id=thread_id)
+    return run
+
+
+# Leads are accepted into this queue and started by background workers
+intake = IntakeQueue(start_lead_run, spool=Spool(INTAKE_SPOOL_PATH) if INTAKE_SPOOL_PATH else None,
+                     retryable=is_retryable_start)
+
+
 @app.post("/api/slack/lead", response_model=WorkflowResponse)
-async def process_slack_lead(slack_event: SlackEvent, background_tasks: BackgroundTasks):
+async def process_slack_lead(slack_event: SlackEvent):
     """Process a lead from Slack.
     
+    The event is queued and its thread ID returned immediately; background
+    workers create the thread and start the run. Poll the thread status until
+    it is awaiting approval.
+    
     Args:
         slack_event: The Slack event data
-        background_tasks: FastAPI background tasks
         
     Returns:
         Workflow response with thread ID and status
     """
+    thread_id = str(uuid.uuid4())
+    input_data = {
+        "messages": [],
+        "slack_event": slack_event.model_dump()
+    }
     try:
-        # Create a thread
-        thread_response = await client.threads.create()
-        thread_id = thread_response["thread_id"]
-        print(f"Thread created with ID: {thread_id}")
-        
-        # Prepare the input
-        input_data = {
-            "messages": [],
-            "slack_event": slack_event.model_dump()
-        }
-        print(f"Input data: {json.dumps(input_data, indent=2)}")
-        
-        # Run the workflow until it interrupts after sending approval
-        run = await client.runs.create(
-            thread_id=thread_id,
-            assistant_id="slack_approval",
-            input=input_data
-            # No need to specify interrupt point as it's configured in the graph
+        await intake.submit(thread_id, input_data)
+    except IntakeFull as e:
+        log_event("intake_rejected", logging.WARNING, retry_after=e.retry_after)
+        raise HTTPException(
+            status_code=429,
+            detail="Too many leads in progress, retry later",
+            headers={"Retry-After": str(e.retry_after)}
         )
-        print(f"Run created: {json.dumps(run, indent=2)}")
+    log_event("lead_queued", thread_id=thread_id)
+    return WorkflowResponse(thread_id=thread_id, status="queued")
+
+
+@app.post("/api/slack/leads:batch")
+async def process_slack_leads_batch(request: Request):
+    """Start workflows for many leads, streaming one result per lead as it completes.
+    
+    Accepts a JSON array of Slack events, or NDJSON (one event per line, with
+    an ``application/x-ndjson`` content type) which is consumed as it is
+    uploaded. Leads are started with bounded parallelism over the shared
+    LangGraph connection pool, bypassing the intake queue.
+    
+    Args:
+        request: The request whose body holds the Slack events
         
-        # Get the thread state
+    Returns:
+        An NDJSON stream of ``{"index", "status", "thread_id" | "error"}``
+        lines, ending with a summary line of status counts
+    """
+    if is_ndjson(request):
+        items = ndjson_items(request)
+    else:
         try:
-            thread_state = await client.threads.get_state(thread_id)
-            print(f"Thread state type: {type(thread_state)}")
-            print(f"Thread state dir: {dir(thread_state)}")
-            
-            # Extract values from state
-            if hasattr(thread_state, 'values'):
-                state_values = thread_state.values
-                print("Using thread_state.values")
-            elif hasattr(thread_state, 'get_state') and callable(thread_state.get_state):
-                state_values = await thread_state.get_state()
-                print("Using thread_state.get_state()")
-            else:
-                state_values = thread_state
-                print("Using thread_state directly")
-                
-            print(f"State values: {json.dumps(state_values, default=str, indent=2)}")
-        except Exception as e:
-            print(f"Error getting thread state: {str(e)}")
-            # Use empty state as fallback
-            state_values = {}
-        
-        extracted_values = extract_state_values(state_values)
-        print(f"Extracted values: {json.dumps(extracted_values, indent=2)}")
-        
-        # Determine status
-        status = "awaiting_approval"
-        requires_approval = True
-        
-        # Prepare the response
-        response = WorkflowResponse(
-            thread_id=thread_id,
-            status=status,
-            requires_approval=requires_approval,
-            messages=extracted_values["messages"],
-            lead_attributes=extracted_values["lead_attributes"],
-            assigned_sales_person=extracted_values["assigned_sales_person"],
-            approval_status=extracted_values["approval_status"],
-            hubspot_lead_created=extracted_values["hubspot_lead_created"],
-            notification_sent=extracted_values["notification_sent"]
-        )
-        
-        return response
+            events = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+        if not isinstance(events, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of Slack events or NDJSON")
+        items = array_items(events)
     
-    except Exception as e:
-        print(f"Error processing lead: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Error processing lead: {str(e)}")
+    async def start(index: int, item: Any) -> Dict[str, Any]:
+        if isinstance(item, InvalidItem):
+            return {"index": index, "status": "invalid", "error": item.error}
+        try:
+            slack_event = SlackEvent.model_validate(item)
+        except ValidationError as e:
+            return {"index": index, "status": "invalid", "error": str(e)}
+        thread_id = str(uuid.uuid4())
+        run = await start_lead_run(thread_id, {"messages": [], "slack_event": slack_event.model_dump()})
+        return {"index": index, "status": "started", "thread_id": thread_id, "run_id": run.get("run_id")}
+    
+    return NDJSONResponse(ndjson_stream(run_batch(items, start)))
+
+
+@app.get("/api/slack/intake")
+async def get_intake_stats():
+    """Queue depth, capacity and counters of the lead intake queue."""
+    return intake.stats()
+
+
+def approval_response(thread_id: str, approved: bool, state_values: Any) -> WorkflowResponse:
+    """Build the response for a resumed approval from the run's final state."""
+    extracted_values = extract_state_values(state_values)
+    
+    # Force the approval status to match the request
+    extracted_values["approval_status"] = approved
+    
+    return WorkflowResponse(
+        thread_id=thread_id,
+        status="completed" if approved else "rejected",
+        requires_approval=False,
+        messages=extracted_values["messages"],
+        lead_attributes=extracted_values["lead_attributes"],
+        assigned_sales_person=extracted_values["assigned_sales_person"],
+        approval_status=extracted_values["approval_status"],
+        hubspot_lead_created=extracted_values["hubspot_lead_created"],
+        notification_sent=extracted_values["notification_sent"]
+    )
 
 
 @app.post("/api/slack/approve", response_model=WorkflowResponse)
 async def approve_lead(approval_request: ApprovalRequest):
     """Approve or reject a lead assignment.
     
+    The interrupted thread is resumed with a single ``Command(resume=...)`` run.
+    With a ``webhook_url`` the call returns as soon as the run is queued and the
+    LangGraph server posts the final run to the webhook; otherwise it waits for
+    the run and returns the final state.
+    
     Args:
         approval_request: The approval request data
         
@@ -234,142 +403,89 @@ async def approve_lead(approval_request: ApprovalRequest):
         Updated workflow response
     """
     thread_id = approval_request.thread_id
+    approved = approval_request.approved
     
     try:
-        # Check if there are any active runs
-        runs = await client.runs.list(thread_id=thread_id)
-        print(f"Current runs: {json.dumps(runs, default=str, indent=2)}")
-        
-        # Find the latest run that's in progress
-        active_run_id = None
-        if "data" in runs and runs["data"]:
-            for run in runs["data"]:
-                if run.get("status") in ["in_progress", "queued"]:
-                    active_run_id = run.get("run_id")
-                    break
-        
-        if active_run_id:
-            print(f"Found active run: {active_run_id}, waiting for it to complete")
-            # Wait for the active run to complete
-            try:
-                result = await client.runs.wait(
+        # One approval per thread at a time; "enqueue" lets the resume queue
+        # behind a run that is still reaching the interrupt
+        async with approval_locks.hold(thread_id):
+            if approval_request.webhook_url:
+                async with sdk_call("runs.create"):
+                    run = await client.runs.create(
+                        thread_id=thread_id,
+                        assistant_id=ASSISTANT_ID,
+                        command={"resume": approved},
+                        webhook=approval_request.webhook_url,
+                        multitask_strategy="enqueue"
+                    )
+                log_event("approval_queued", thread_id=thread_id, run_id=run.get("run_id"), approved=approved)
+                return WorkflowResponse(
                     thread_id=thread_id,
-                    run_id=active_run_id,
-                    raise_error=True
+                    status="resuming",
+                    approval_status=approved,
+                    requires_approval=False
                 )
-            except Exception as e:
-                print(f"Error waiting for active run: {str(e)}")
-                # Continue anyway
-        
-        # Continue the workflow after approval
-        config = {
-            "configurable": {
-                "approval_status": approval_request.approved
-            }
-        }
-        
-        print(f"Approval config: {json.dumps(config, indent=2)}")
-        
-        # First, update the thread state directly to set approval_status
-        try:
-            # Get current state
-            thread_state = await client.threads.get_state(thread_id)
-            
-            # Extract values from state
-            if hasattr(thread_state, 'values'):
-                state_values = thread_state.values
-            elif hasattr(thread_state, 'get_state') and callable(thread_state.get_state):
-                state_values = await thread_state.get_state()
-            else:
-                state_values = thread_state
-                
-            # Update approval_status
-            state_values["approval_status"] = approval_request.approved
             
-            # Set the updated state
-            await client.threads.set_state(thread_id, state_values)
-            print(f"Updated thread state with approval_status: {approval_request.approved}")
-        except Exception as e:
-            print(f"Error updating thread state: {str(e)}")
-        
-        # Create a new run to continue the workflow
-        try:
-            run = await client.runs.create(
-                thread_id=thread_id,
-                assistant_id="slack_approval",
-                config=config
-            )
-            
-            # Wait for the run to complete
-            result = await client.runs.wait(
-                thread_id=thread_id,
-                run_id=run["run_id"],
-                raise_error=True
-            )
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 409:
-                # Conflict - there's already a run in progress
-                print("Conflict detected - there's already a run in progress")
-                # Get the latest run
-                runs = await client.runs.list(thread_id=thread_id)
-                if "data" in runs and runs["data"]:
-                    latest_run = runs["data"][0]
-                    latest_run_id = latest_run.get("run_id")
-                    if latest_run_id:
-                        print(f"Waiting for latest run: {latest_run_id}")
-                        result = await client.runs.wait(
-                            thread_id=thread_id,
-                            run_id=latest_run_id,
-                            raise_error=True
-                        )
-            else:
-                raise
+            async with sdk_call("runs.wait"):
+                state_values = await client.runs.wait(
+                    thread_id=thread_id,
+                    assistant_id=ASSISTANT_ID,
+                    command={"resume": approved},
+                    multitask_strategy="enqueue"
+                )
+        log_event("approval_resumed", thread_id=thread_id, approved=approved)
+        return approval_response(thread_id, approved, state_values)
+    
+    except Exception as e:
+        log_event("approval_failed", logging.ERROR, exc_info=True, thread_id=thread_id, error=str(e))
+        raise HTTPException(status_code=500, detail=f"Error processing approval: {str(e)}")
+
+
+@app.post("/api/slack/approve/stream")
+async def approve_lead_stream(approval_request: ApprovalRequest):
+    """Approve or reject a lead assignment and stream progress as server-sent events.
+    
+    Emits an ``update`` event per completed node and a final ``completed``
+    event carrying the workflow response.
+    
+    Args:
+        approval_request: The approval request data
         
-        # Get the thread state
+    Returns:
+        An event stream
+    """
+    thread_id = approval_request.thread_id
+    approved = approval_request.approved
+    
+    async def events():
+        state_values: Any = {}
         try:
-            thread_state = await client.threads.get_state(thread_id)
-            
-            # Extract values from state
-            if hasattr(thread_state, 'values'):
-                state_values = thread_state.values
-            elif hasattr(thread_state, 'get_state') and callable(thread_state.get_state):
-                state_values = await thread_state.get_state()
-            else:
-                state_values = thread_state
+            async with approval_locks.hold(thread_id), sdk_call("runs.stream"):
+                async for part in client.runs.stream(
+                    thread_id=thread_id,
+                    assistant_id=ASSISTANT_ID,
+                    command={"resume": approved},
+                    stream_mode=["updates", "values"],
+                    multitask_strategy="enqueue"
+                ):
+                    if part.event == "values":
+                        state_values = part.data
+                    elif part.event == "updates":
+                        yield sse("update", {"nodes": list(part.data or {})})
+                    elif part.event == "error":
+                        yield sse("error", part.data)
+                        return
+            yield sse("completed", approval_response(thread_id, approved, state_values).model_dump())
         except Exception as e:
-            print(f"Error getting thread state: {str(e)}")
-            # Use empty state as fallback
-            state_values = {}
-            
-        extracted_values = extract_state_values(state_values)
-        
-        # Force the approval status to match the request
-        extracted_values["approval_status"] = approval_request.approved
-        
-        # Determine status
-        status = "completed" if approval_request.approved else "rejected"
-        requires_approval = False
-        
-        # Prepare the response
-        response = WorkflowResponse(
-            thread_id=thread_id,
-            status=status,
-            requires_approval=requires_approval,
-            messages=extracted_values["messages"],
-            lead_attributes=extracted_values["lead_attributes"],
-            assigned_sales_person=extracted_values["assigned_sales_person"],
-            approval_status=extracted_values["approval_status"],
-            hubspot_lead_created=extracted_values["hubspot_lead_created"],
-            notification_sent=extracted_values["notification_sent"]
-        )
-        
-        return response
+            log_event("approval_stream_failed", logging.ERROR, exc_info=True, thread_id=thread_id, error=str(e))
+            yield sse("error", {"detail": f"Error processing approval: {str(e)}"})
     
-    except Exception as e:
-        print(f"Error processing approval: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Error processing approval: {str(e)}")
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def sse(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 @app.get("/api/slack/thread/{thread_id}", response_model=WorkflowResponse)
@@ -382,10 +498,17 @@ async def get_thread_status(thread_id: str):
     Returns:
         Current workflow response
     """
+    if intake.is_queued(thread_id):
+        return WorkflowResponse(thread_id=thread_id, status="queued")
+    error = intake.failure(thread_id)
+    if error is not None:
+        return WorkflowResponse(thread_id=thread_id, status="failed", error=error)
+    
     try:
         # Get the thread state
         try:
-            thread_state = await client.threads.get_state(thread_id)
+            async with sdk_call("threads.get_state"):
+                thread_state = await client.threads.get_state(thread_id)
             
             # Extract values from state
             if hasattr(thread_state, 'values'):
@@ -395,7 +518,7 @@ async def get_thread_status(thread_id: str):
             else:
                 state_values = thread_state
         except Exception as e:
-            print(f"Error getting thread state: {str(e)}")
+            log_event("get_state_failed", logging.WARNING, thread_id=thread_id, error=str(e))
             # Use empty state as fallback
             state_values = {}
             
@@ -427,9 +550,7 @@ async def get_thread_status(thread_id: str):
         return response
     
     except Exception as e:
-        print(f"Error getting thread status: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log_event("thread_status_failed", logging.ERROR, exc_info=True, thread_id=thread_id, error=str(e))
         raise HTTPException(status_code=500, detail=f"Error getting thread status: {str(e)}")
 
 
@@ -0,0 +1,220 @@
+"""Structured, sampled logging and Prometheus-style metrics for the Slack lead API."""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import FastAPI, Request, Response
+
+LOG_ENABLED = os.getenv("API_LOG_ENABLED", "true").lower() == "true"
+LOG_LEVEL = os.getenv("API_LOG_LEVEL", "INFO").upper()
+# Fraction of requests whose full run/state payloads are logged at DEBUG level
+DEBUG_SAMPLE_RATE = float(os.getenv("API_DEBUG_SAMPLE_RATE", "0"))
+METRICS_ENABLED = os.getenv("API_METRICS_ENABLED", "true").lower() == "true"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+logger = logging.getLogger("slack_api")
+
+
+class JSONFormatter(logging.Formatter):
+    """Render a record as one JSON line with its structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "event": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records unformatted so serialization happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging() -> None:
+    """Route the API logger through a queue drained by a background thread."""
+    global _listener
+    if _listener is not None:
+        return
+    logger.propagate = False
+    logger.setLevel(LOG_LEVEL if LOG_ENABLED else logging.CRITICAL + 1)
+    if not LOG_ENABLED:
+        return
+    records: queue.Queue = queue.Queue(-1)
+    stream = logging.StreamHandler()
+    stream.setFormatter(JSONFormatter())
+    logger.addHandler(DeferredQueueHandler(records))
+    _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_event(event: str, level: int = logging.INFO, exc_info: bool = False, **fields: Any) -> None:
+    """Log an event with structured fields."""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, exc_info=exc_info, extra={"fields": fields})
+
+
+def debug_sampled() -> bool:
+    """Decide once per request whether its debug payloads are logged."""
+    return DEBUG_SAMPLE_RATE > 0 and logger.isEnabledFor(logging.DEBUG) and random.random() < DEBUG_SAMPLE_RATE
+
+
+def debug_dump(sampled: bool, event: str, payload: Any, **fields: Any) -> None:
+    """Log a full payload for sampled requests only; it is serialized off the request path."""
+    if sampled:
+        log_event(event, logging.DEBUG, payload=payload, **fields)
+
+
+class Histogram:
+    """Labelled latency histogram rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.setdefault(label_values, [[0] * len(self.buckets), 0.0, 0])
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for label_values, (counts, total, count) in sorted(series.items()):
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return "\n".join(lines)
+
+
+class Counter:
+    """Labelled monotonic counter rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value}")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "slack_api_request_duration_seconds", "Latency of API requests", ("method", "path", "status")
+)
+SDK_LATENCY = Histogram(
+    "slack_api_langgraph_call_duration_seconds", "Latency of LangGraph SDK calls", ("operation",)
+)
+SDK_ERRORS = Counter(
+    "slack_api_langgraph_call_errors_total", "LangGraph SDK calls that raised", ("operation",)
+)
+METRICS = [REQUEST_LATENCY, SDK_LATENCY, SDK_ERRORS]
+
+
+@asynccontextmanager
+async def sdk_call(operation: str):
+    """Time a LangGraph SDK call and count its failures."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        SDK_ERRORS.inc(operation)
+        raise
+    finally:
+        SDK_LATENCY.observe(time.perf_counter() - start, operation)
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in METRICS) + "\n"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the log listener with the app and flush it on shutdown."""
+    setup_logging()
+    try:
+        yield
+    finally:
+        shutdown_logging()
+
+
+def instrument(app: FastAPI) -> None:
+    """Install request timing and the /metrics endpoint on an app."""
+    if not METRICS_ENABLED:
+        return
+
+    @app.middleware("http")
+    async def time_requests(request: Request, call_next: Callable):
+        start = time.perf_counter()
+        status = "500"
+        try:
+            response = await call_next(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            route = request.scope.get("route")
+            # Label by route template so per-thread URLs do not create new series
+            path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.observe(time.perf_counter() - start, request.method, path, status)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,7 +1,9 @@
 # ./src/agent/webapp.py
 from fastapi import FastAPI, Request
 from fastapi.responses import StreamingResponse
-from smart_goals.graph import make_graph  # Adjust import if you want a different graph
+from graph_registry import get_graph_registry, graph_registry_stats
+from model_registry import registry_stats
+from credit_service import credit_service_stats, invalidate_credit_cache
 from pydantic import BaseModel
 from langchain_core.messages import AIMessageChunk
 from langchain_core.runnables import RunnableConfig
@@ -9,7 +11,11 @@ from langgraph.graph.state import CompiledStateGraph
 from langgraph.types import Command
 from pprint import pprint
 from typing import Optional
+from contextlib import asynccontextmanager
+import asyncio
+import importlib
 import json
+import os
 
 class InterruptItem(BaseModel):
     approval: bool
@@ -19,7 +25,33 @@ class Item(BaseModel):
     message: str
     interrupt: Optional[InterruptItem] = None
 
-app = FastAPI()
+# Graph of langgraph.json served by /chat; imported on the first request
+CHAT_GRAPH = os.getenv("CHAT_GRAPH", "smart_goals")
+
+# Modules whose warm_up() builds their agents ahead of the first run
+WARMUP_MODULES = ["credit_agents_deterministic.agents", "credit_agents_dynamic.agents"]
+AGENT_WARMUP = os.getenv("AGENT_WARMUP", "true").lower() == "true"
+
+
+def warm_up_agents() -> None:
+    """Build the agents of WARMUP_MODULES; failures are logged and left to the first run."""
+    for module_name in WARMUP_MODULES:
+        try:
+            ready = importlib.import_module(module_name).warm_up()
+            print(f"Warmed up {module_name}: {', '.join(ready)}")
+        except Exception as e:
+            print(f"Warm-up of {module_name} failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start serving right away; agents are built in a worker thread meanwhile
+    if AGENT_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, warm_up_agents)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/hello")
@@ -27,6 +59,30 @@ def read_root():
     return {"Hello": "World"}
 
 
+@app.get("/models/stats")
+def model_stats():
+    """Pool size, in-flight calls and cache hits of the shared chat models."""
+    return registry_stats()
+
+
+@app.get("/graphs/stats")
+def graph_stats():
+    """Which graphs of langgraph.json are loaded, with their import times and errors."""
+    return graph_registry_stats()
+
+
+@app.get("/credit-service/stats")
+def credit_stats():
+    """Request, retry and failure counts and circuit breaker states of the credit service client."""
+    return credit_service_stats()
+
+
+@app.delete("/credit-service/cache")
+def credit_cache_invalidate(customer_id: Optional[str] = None, endpoint: Optional[str] = None):
+    """Drop cached credit lookups for a customer and/or endpoint, or all of them."""
+    return {"invalidated": invalidate_credit_cache(customer_id, endpoint)}
+
+
 def is_current_conversation_interrupted(
         graph: CompiledStateGraph, graph_config: RunnableConfig
     ) -> bool:
@@ -96,7 +152,8 @@ async def chat(request: Item):
     approval = request.interrupt.approval if request.interrupt else None
     role = request.interrupt.role if request.interrupt else None
 
-    graph = make_graph()
+    # The first request imports the graph module; keep that off the event loop
+    graph = await asyncio.to_thread(get_graph_registry().get, CHAT_GRAPH)
 
     return StreamingResponse(event_stream(graph, thread_id, message, approval, role), media_type="text/event-stream")
 
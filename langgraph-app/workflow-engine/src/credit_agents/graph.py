@@ -1,18 +1,23 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Dict, List, Optional, Union, Any
-from typing_extensions import TypedDict
+from typing_extensions import Annotated, TypedDict
+import operator
 
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.tools import tool
-import requests
+import asyncio
 import json
-from langgraph.graph import END, StateGraph
+import os
+from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import ToolNode
 
+from credit_service import get_credit_client
+
 # Define the state for our credit approval workflow
 class ApplicationStatus(Enum):
     PENDING = auto()
+    VERIFICATION = auto()
     CREDIT_CHECK = auto()
     KYC_CHECK = auto()
     INCOME_VERIFICATION = auto()
@@ -36,28 +41,37 @@ class CreditKeys(TypedDict):
     final_decision: Optional[str]
     status: ApplicationStatus
 
+def merge_dicts(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer that merges partial updates into a dict channel"""
+    return {**(current or {}), **(update or {})}
+
 @dataclass
 class CreditState:
-    keys: CreditKeys
-    messages: List[Union[HumanMessage, AIMessage]] = field(default_factory=list)
+    keys: Annotated[CreditKeys, merge_dicts]
+    messages: Annotated[List[Union[HumanMessage, AIMessage]], operator.add] = field(default_factory=list)
+    # Results of the verification checks running in parallel, by check node name,
+    # each holding the keys and messages it will contribute once all are in
+    check_results: Annotated[Dict[str, Dict[str, Any]], merge_dicts] = field(default_factory=dict)
 
 # API Tools for each agent
-BASE_URL = "http://localhost:3000"
+# Requests go through the shared credit service client; set CREDIT_SERVICE_URL
+# to point it at another server
 
 # Credit Score Checker Agent tools
 @tool
-def check_credit_score(application_id: str) -> Dict[str, Any]:
+async def check_credit_score(application_id: str) -> Dict[str, Any]:
     """Check the credit score for a given application"""
     try:
-        response = requests.get(f"{BASE_URL}/credit-check", params={"application_id": application_id})
+        client = get_credit_client()
+        response = await client.get("/credit-check", params={"application_id": application_id}, cache_key=application_id)
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
             # Create a new credit check with a random score between 300 and 850
             import random
             credit_score = random.randint(300, 850)
-            response = requests.post(
-                f"{BASE_URL}/credit-check", 
+            response = await client.post(
+                "/credit-check", 
                 json={"application_id": application_id, "credit_score": credit_score}
             )
             return response.json()
@@ -66,10 +80,11 @@ def check_credit_score(application_id: str) -> Dict[str, Any]:
 
 # KYC Validator Agent tools
 @tool
-def validate_kyc(application_id: str) -> Dict[str, Any]:
+async def validate_kyc(application_id: str) -> Dict[str, Any]:
     """Validate KYC for a given application"""
     try:
-        response = requests.get(f"{BASE_URL}/kyc-check", params={"application_id": application_id})
+        client = get_credit_client()
+        response = await client.get("/kyc-check", params={"application_id": application_id}, cache_key=application_id)
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
@@ -77,8 +92,8 @@ def validate_kyc(application_id: str) -> Dict[str, Any]:
             import random
             kyc_passed = random.choice([True, False])
             remarks = "Automated KYC verification" if kyc_passed else "Requires additional documents"
-            response = requests.post(
-                f"{BASE_URL}/kyc-check", 
+            response = await client.post(
+                "/kyc-check", 
                 json={"application_id": application_id, "kyc_passed": kyc_passed, "remarks": remarks}
             )
             return response.json()
@@ -87,15 +102,16 @@ def validate_kyc(application_id: str) -> Dict[str, Any]:
 
 # Income Verifier Agent tools
 @tool
-def verify_income(application_id: str) -> Dict[str, Any]:
+async def verify_income(application_id: str) -> Dict[str, Any]:
     """Verify income for a given application"""
     try:
-        response = requests.get(f"{BASE_URL}/income-verification", params={"application_id": application_id})
+        client = get_credit_client()
+        response = await client.get("/income-verification", params={"application_id": application_id})
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
             # Get the application to determine requested amount
-            app_response = requests.get(f"{BASE_URL}/application", params={"id": application_id})
+            app_response = await client.get("/application", params={"id": application_id})
             if app_response.status_code == 200:
                 app_data = app_response.json()
                 requested_amount = app_data.get("requested_amount", 0)
@@ -105,8 +121,8 @@ def verify_income(application_id: str) -> Dict[str, Any]:
                 variance = random.uniform(0.8, 1.2)  # 20% variance either way
                 verified_income = declared_income * variance
                 remarks = "Income verification completed"
-                response = requests.post(
-                    f"{BASE_URL}/income-verification", 
+                response = await client.post(
+                    "/income-verification", 
                     json={
                         "application_id": application_id, 
                         "declared_income": declared_income,
@@ -121,10 +137,11 @@ def verify_income(application_id: str) -> Dict[str, Any]:
 
 # Background Check Agent tools
 @tool
-def perform_background_check(application_id: str) -> Dict[str, Any]:
+async def perform_background_check(application_id: str) -> Dict[str, Any]:
     """Perform background check for a given application"""
     try:
-        response = requests.get(f"{BASE_URL}/background-check", params={"application_id": application_id})
+        client = get_credit_client()
+        response = await client.get("/background-check", params={"application_id": application_id}, cache_key=application_id)
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 404:
@@ -133,8 +150,8 @@ def perform_background_check(application_id: str) -> Dict[str, Any]:
             criminal_record = random.choice([True, False])
             debt_collections = random.choice([True, False])
             remarks = "No issues found" if not (criminal_record or debt_collections) else "Issues found"
-            response = requests.post(
-                f"{BASE_URL}/background-check", 
+            response = await client.post(
+                "/background-check", 
                 json={
                     "application_id": application_id, 
                     "criminal_record": criminal_record,
@@ -148,14 +165,14 @@ def perform_background_check(application_id: str) -> Dict[str, Any]:
 
 # Manual Approver Agent tools
 @tool
-def manual_approval(application_id: str, approve: bool, notes: str) -> Dict[str, Any]:
+async def manual_approval(application_id: str, approve: bool, notes: str) -> Dict[str, Any]:
     """Perform manual approval for a given application"""
     try:
         # Convert boolean to integer for SQLite compatibility
         approved_int = 1 if approve else 0
         
-        response = requests.post(
-            f"{BASE_URL}/manual-approval", 
+        response = await get_credit_client().post(
+            "/manual-approval", 
             json={
                 "application_id": application_id, 
                 "approver_name": "AI Agent",
@@ -169,11 +186,11 @@ def manual_approval(application_id: str, approve: bool, notes: str) -> Dict[str,
 
 # Final Decision Agent tools
 @tool
-def make_final_decision(application_id: str, decision: str, reason: str) -> Dict[str, Any]:
+async def make_final_decision(application_id: str, decision: str, reason: str) -> Dict[str, Any]:
     """Make the final decision for a given application"""
     try:
-        response = requests.post(
-            f"{BASE_URL}/final-decision", 
+        response = await get_credit_client().post(
+            "/final-decision", 
             json={
                 "application_id": application_id, 
                 "decision": decision,
@@ -185,88 +202,70 @@ def make_final_decision(application_id: str, decision: str, reason: str) -> Dict
         return {"error": str(e)}
 
 # Agent implementations
-def credit_score_checker(state: CreditState) -> CreditState:
+# The verification checks run in parallel, so each returns its result under
+# check_results instead of writing keys and messages directly
+def check_result(name: str, keys: Dict[str, Any], messages: List[AIMessage]) -> Dict[str, Any]:
+    """Package a verification check's outcome as a state update"""
+    return {"check_results": {name: {"keys": keys, "messages": messages}}}
+
+async def credit_score_checker(state: CreditState) -> Dict[str, Any]:
     """Agent that checks the credit score"""
     application_id = state.keys.get("application_id")
-    result = check_credit_score(application_id)
+    result = await check_credit_score.ainvoke({"application_id": application_id})
     
     # Handle None result
-    if result is None:
-        state.messages.append(AIMessage(content="Error checking credit score: API returned None"))
-        # Generate a random credit score as fallback
-        import random
-        credit_score = random.randint(300, 850)
-        state.keys["credit_score"] = credit_score
-        state.messages.append(AIMessage(content=f"Generated fallback credit score: {credit_score}"))
-        return state
-    
-    if "error" in result:
-        state.messages.append(AIMessage(content=f"Error checking credit score: {result['error']}"))
+    if result is None or "error" in result:
+        error = "API returned None" if result is None else result["error"]
         # Generate a random credit score as fallback
         import random
         credit_score = random.randint(300, 850)
-        state.keys["credit_score"] = credit_score
-        state.messages.append(AIMessage(content=f"Generated fallback credit score: {credit_score}"))
-        return state
+        return check_result("credit_score_checker", {"credit_score": credit_score}, [
+            AIMessage(content=f"Error checking credit score: {error}"),
+            AIMessage(content=f"Generated fallback credit score: {credit_score}")
+        ])
     
     # Ensure credit_score is stored as an integer
     credit_score = int(result.get("credit_score", 0))
-    state.keys["credit_score"] = credit_score
-    state.messages.append(AIMessage(content=f"Credit score checked: {credit_score}"))
-    return state
+    return check_result("credit_score_checker", {"credit_score": credit_score}, [
+        AIMessage(content=f"Credit score checked: {credit_score}")
+    ])
 
-def kyc_validator(state: CreditState) -> CreditState:
+async def kyc_validator(state: CreditState) -> Dict[str, Any]:
     """Agent that validates KYC"""
     application_id = state.keys.get("application_id")
-    result = validate_kyc(application_id)
+    result = await validate_kyc.ainvoke({"application_id": application_id})
     
     # Handle None result
-    if result is None:
-        state.messages.append(AIMessage(content="Error validating KYC: API returned None"))
+    if result is None or "error" in result:
+        error = "API returned None" if result is None else result["error"]
         # Generate a random KYC result as fallback
         import random
         kyc_passed = random.choice([True, False])
-        state.keys["kyc_passed"] = kyc_passed
-        state.messages.append(AIMessage(content=f"Generated fallback KYC result: {'Passed' if kyc_passed else 'Failed'}"))
-        return state
-    
-    if "error" in result:
-        state.messages.append(AIMessage(content=f"Error validating KYC: {result['error']}"))
-        # Generate a random KYC result as fallback
-        import random
-        kyc_passed = random.choice([True, False])
-        state.keys["kyc_passed"] = kyc_passed
-        state.messages.append(AIMessage(content=f"Generated fallback KYC result: {'Passed' if kyc_passed else 'Failed'}"))
-        return state
+        return check_result("kyc_validator", {"kyc_passed": kyc_passed}, [
+            AIMessage(content=f"Error validating KYC: {error}"),
+            AIMessage(content=f"Generated fallback KYC result: {'Passed' if kyc_passed else 'Failed'}")
+        ])
     
     kyc_passed = result.get("kyc_passed")
-    state.keys["kyc_passed"] = kyc_passed
-    state.messages.append(AIMessage(content=f"KYC validation: {'Passed' if kyc_passed else 'Failed'}"))
-    return state
+    return check_result("kyc_validator", {"kyc_passed": kyc_passed}, [
+        AIMessage(content=f"KYC validation: {'Passed' if kyc_passed else 'Failed'}")
+    ])
 
-def income_verifier(state: CreditState) -> CreditState:
+async def income_verifier(state: CreditState) -> Dict[str, Any]:
     """Agent that verifies income"""
     application_id = state.keys.get("application_id")
-    result = verify_income(application_id)
+    result = await verify_income.ainvoke({"application_id": application_id})
     
     # Handle None result
-    if result is None:
-        state.messages.append(AIMessage(content="Error verifying income: API returned None"))
+    if result is None or "error" in result:
+        error = "API returned None" if result is None else result["error"]
         # Generate a random income verification result as fallback
         import random
         income_verified = random.choice([True, False])
-        state.keys["income_verified"] = income_verified
-        state.messages.append(AIMessage(content=f"Generated fallback income verification: {'Passed' if income_verified else 'Failed'}"))
-        return state
-    
-    if "error" in result:
-        state.messages.append(AIMessage(content=f"Error verifying income: {result['error']}"))
-        # Generate a random income verification result as fallback
-        import random
-        income_verified = random.choice([True, False])
-        state.keys["income_verified"] = income_verified
-        state.messages.append(AIMessage(content=f"Generated fallback income verification: {'Passed' if income_verified else 'Failed'}"))
-        return state
+        return check_result("income_verifier", {"income_verified": income_verified}, [
+            AIMessage(content=f"Error verifying income: {error}"),
+            AIMessage(content=f"Generated fallback income verification: {'Passed' if income_verified else 'Failed'}")
+        ])
     
     # Convert string values to float for calculation
     declared_income = float(result.get("declared_income", 0))
@@ -278,43 +277,114 @@ def income_verifier(state: CreditState) -> CreditState:
     else:
         income_verified = False
     
-    state.keys["income_verified"] = income_verified
-    state.messages.append(AIMessage(content=f"Income verification: {'Passed' if income_verified else 'Failed'}"))
-    return state
+    return check_result("income_verifier", {"income_verified": income_verified}, [
+        AIMessage(content=f"Income verification: {'Passed' if income_verified else 'Failed'}")
+    ])
 
-def background_checker(state: CreditState) -> CreditState:
+async def background_checker(state: CreditState) -> Dict[str, Any]:
     """Agent that performs background checks"""
     application_id = state.keys.get("application_id")
-    result = perform_background_check(application_id)
+    result = await perform_background_check.ainvoke({"application_id": application_id})
     
     # Handle None result
-    if result is None:
-        state.messages.append(AIMessage(content="Error performing background check: API returned None"))
-        # Generate a random background check result as fallback
-        import random
-        background_check_passed = random.choice([True, False])
-        state.keys["background_check_passed"] = background_check_passed
-        state.messages.append(AIMessage(content=f"Generated fallback background check: {'Passed' if background_check_passed else 'Failed'}"))
-        return state
-    
-    if "error" in result:
-        state.messages.append(AIMessage(content=f"Error performing background check: {result['error']}"))
+    if result is None or "error" in result:
+        error = "API returned None" if result is None else result["error"]
         # Generate a random background check result as fallback
         import random
         background_check_passed = random.choice([True, False])
-        state.keys["background_check_passed"] = background_check_passed
-        state.messages.append(AIMessage(content=f"Generated fallback background check: {'Passed' if background_check_passed else 'Failed'}"))
-        return state
+        return check_result("background_checker", {"background_check_passed": background_check_passed}, [
+            AIMessage(content=f"Error performing background check: {error}"),
+            AIMessage(content=f"Generated fallback background check: {'Passed' if background_check_passed else 'Failed'}")
+        ])
     
     criminal_record = result.get("criminal_record")
     debt_collections = result.get("debt_collections")
     background_check_passed = not (criminal_record or debt_collections)
     
-    state.keys["background_check_passed"] = background_check_passed
-    state.messages.append(AIMessage(content=f"Background check: {'Passed' if background_check_passed else 'Failed'}"))
-    return state
+    return check_result("background_checker", {"background_check_passed": background_check_passed}, [
+        AIMessage(content=f"Background check: {'Passed' if background_check_passed else 'Failed'}")
+    ])
+
+# Verification checks by node name, with the key each one fills in
+VERIFICATION_CHECKS = {
+    "credit_score_checker": "credit_score",
+    "kyc_validator": "kyc_passed",
+    "income_verifier": "income_verified",
+    "background_checker": "background_check_passed",
+}
+
+# The background check only counts for credit scores below this
+BACKGROUND_CHECK_THRESHOLD = 650
+
+# Run the background check alongside the others before the credit score is
+# known. Off by default: on a 404 the check creates a background record for
+# the applicant, and the result is thrown away for scores that do not need it
+SPECULATIVE_CHECKS = os.getenv("CREDIT_SPECULATIVE_CHECKS", "false").lower() == "true"
+
+def background_check_needed(state: CreditState) -> bool:
+    """Whether the credit score is known and calls for a background check that has not run"""
+    credit_score = state.keys.get("credit_score")
+    return (
+        credit_score is not None
+        and int(credit_score) < BACKGROUND_CHECK_THRESHOLD
+        and state.keys.get("background_check_passed") is None
+    )
+
+def required_checks(state: CreditState) -> List[str]:
+    """Fan out every verification check that has no result yet.
+    
+    Whether the background check counts depends on the credit score, so
+    unless SPECULATIVE_CHECKS is set it only runs once the score is known
+    to call for it (see route_after_checks).
+    """
+    pending = [name for name, key in VERIFICATION_CHECKS.items() if state.keys.get(key) is None]
+    if not SPECULATIVE_CHECKS and not background_check_needed(state):
+        pending = [name for name in pending if name != "background_checker"]
+    return pending or ["collect_checks"]
 
-def manual_approver(state: CreditState) -> CreditState:
+def collect_checks(state: CreditState) -> Dict[str, Any]:
+    """Join the parallel checks into the application keys in a fixed order
+    
+    Results already applied to the keys by an earlier pass are skipped, so
+    a background check that runs after the others only adds its own result.
+    """
+    results = state.check_results
+    credit_score = results.get("credit_score_checker", {}).get("keys", {}).get("credit_score")
+    if credit_score is None:
+        credit_score = state.keys.get("credit_score", 0)
+    
+    keys: Dict[str, Any] = {"status": ApplicationStatus.VERIFICATION}
+    messages: List[AIMessage] = []
+    for name, key in VERIFICATION_CHECKS.items():
+        if name not in results or state.keys.get(key) is not None:
+            continue
+        if name == "background_checker" and int(credit_score) >= BACKGROUND_CHECK_THRESHOLD:
+            continue
+        keys.update(results[name]["keys"])
+        messages.extend(results[name]["messages"])
+    return {"keys": keys, "messages": messages}
+
+def route_after_checks(state: CreditState) -> str:
+    """Decide the next step once all verification results are in"""
+    if background_check_needed(state):
+        return "background_checker"
+    credit_score = int(state.keys.get("credit_score", 0))
+    kyc_passed = state.keys.get("kyc_passed", False)
+    income_verified = state.keys.get("income_verified", False)
+    
+    if credit_score < BACKGROUND_CHECK_THRESHOLD:
+        background_check_passed = state.keys.get("background_check_passed", False)
+        if credit_score >= 600 and (not kyc_passed or not income_verified or not background_check_passed):
+            return "manual_approver"
+        return "final_decision_maker"
+    
+    # Check if manual approval is needed
+    if credit_score >= 600 and (not kyc_passed or not income_verified):
+        return "manual_approver"
+        
+    return "final_decision_maker"
+
+async def manual_approver(state: CreditState) -> Dict[str, Any]:
     """Agent that handles manual approval"""
     application_id = state.keys.get("application_id")
     
@@ -338,29 +408,23 @@ def manual_approver(state: CreditState) -> CreditState:
         approve = False
         notes = "Rejected due to combination of issues with credit score, KYC, income verification, or background check."
     
-    # Call the tool with a single argument (dict)
-    result = manual_approval({"application_id": application_id, "approve": approve, "notes": notes})
+    result = await manual_approval.ainvoke({"application_id": application_id, "approve": approve, "notes": notes})
+    keys = {"manual_approval_result": approve, "status": ApplicationStatus.MANUAL_APPROVAL}
     
     # Handle None result
-    if result is None:
-        state.messages.append(AIMessage(content="Error in manual approval: API returned None"))
-        # Use the decision we already made
-        state.keys["manual_approval_result"] = approve
-        state.messages.append(AIMessage(content=f"Manual approval (local decision): {'Approved' if approve else 'Rejected'} - {notes}"))
-        return state
-    
-    if "error" in result:
-        state.messages.append(AIMessage(content=f"Error in manual approval: {result['error']}"))
+    if result is None or "error" in result:
+        error = "API returned None" if result is None else result["error"]
         # Use the decision we already made
-        state.keys["manual_approval_result"] = approve
-        state.messages.append(AIMessage(content=f"Manual approval (local decision): {'Approved' if approve else 'Rejected'} - {notes}"))
-        return state
-    
-    state.keys["manual_approval_result"] = approve
-    state.messages.append(AIMessage(content=f"Manual approval: {'Approved' if approve else 'Rejected'} - {notes}"))
-    return state
+        return {"keys": keys, "messages": [
+            AIMessage(content=f"Error in manual approval: {error}"),
+            AIMessage(content=f"Manual approval (local decision): {'Approved' if approve else 'Rejected'} - {notes}")
+        ]}
+    
+    return {"keys": keys, "messages": [
+        AIMessage(content=f"Manual approval: {'Approved' if approve else 'Rejected'} - {notes}")
+    ]}
 
-def final_decision_maker(state: CreditState) -> CreditState:
+async def final_decision_maker(state: CreditState) -> Dict[str, Any]:
     """Agent that makes the final decision"""
     application_id = state.keys.get("application_id")
     
@@ -388,146 +452,72 @@ def final_decision_maker(state: CreditState) -> CreditState:
         decision = "Rejected"
         reason = "Failed to meet automatic approval criteria and manual approval was not favorable."
     
-    # Call the tool with a single argument (dict)
-    result = make_final_decision({"application_id": application_id, "decision": decision, "reason": reason})
-    
-    # Handle None result
-    if result is None:
-        state.messages.append(AIMessage(content="Error in final decision: API returned None"))
-        # Use the decision we already made
-        state.keys["final_decision"] = decision
-        state.messages.append(AIMessage(content=f"Final decision (local): {decision} - {reason}"))
-        # Update the application status
-        state.keys["status"] = ApplicationStatus.APPROVED if decision == "Approved" else ApplicationStatus.REJECTED
-        return state
-    
-    if "error" in result:
-        state.messages.append(AIMessage(content=f"Error in final decision: {result['error']}"))
-        # Use the decision we already made
-        state.keys["final_decision"] = decision
-        state.messages.append(AIMessage(content=f"Final decision (local): {decision} - {reason}"))
-        # Update the application status
-        state.keys["status"] = ApplicationStatus.APPROVED if decision == "Approved" else ApplicationStatus.REJECTED
-        return state
-    
-    state.keys["final_decision"] = decision
-    state.messages.append(AIMessage(content=f"Final decision: {decision} - {reason}"))
+    result = await make_final_decision.ainvoke({"application_id": application_id, "decision": decision, "reason": reason})
     
     # Update the application status
-    state.keys["status"] = ApplicationStatus.APPROVED if decision == "Approved" else ApplicationStatus.REJECTED
+    keys = {
+        "final_decision": decision,
+        "status": ApplicationStatus.APPROVED if decision == "Approved" else ApplicationStatus.REJECTED
+    }
     
-    return state
-
-# Update state after each agent completes
-def update_status(state: CreditState) -> CreditState:
-    """Update the application status based on the last agent that ran"""
-    last_message = state.messages[-1] if state.messages else None
-    
-    if not last_message:
-        return state
-    
-    content = last_message.content.lower()
-    
-    if "credit score checked" in content:
-        state.keys["status"] = ApplicationStatus.CREDIT_CHECK
-    elif "kyc validation" in content:
-        state.keys["status"] = ApplicationStatus.KYC_CHECK
-    elif "income verification" in content:
-        state.keys["status"] = ApplicationStatus.INCOME_VERIFICATION
-    elif "background check" in content:
-        state.keys["status"] = ApplicationStatus.BACKGROUND_CHECK
-    elif "manual approval" in content:
-        state.keys["status"] = ApplicationStatus.MANUAL_APPROVAL
-    elif "final decision" in content:
-        if "approved" in content:
-            state.keys["status"] = ApplicationStatus.APPROVED
-        else:
-            state.keys["status"] = ApplicationStatus.REJECTED
-    
-    return state
+    # Handle None result
+    if result is None or "error" in result:
+        error = "API returned None" if result is None else result["error"]
+        # Use the decision we already made
+        return {"keys": keys, "messages": [
+            AIMessage(content=f"Error in final decision: {error}"),
+            AIMessage(content=f"Final decision (local): {decision} - {reason}")
+        ]}
+    
+    return {"keys": keys, "messages": [
+        AIMessage(content=f"Final decision: {decision} - {reason}")
+    ]}
 
 # Create the workflow graph
 def create_credit_approval_workflow():
-    """Create the credit approval workflow graph"""
+    """Create the credit approval workflow graph
+    
+    The credit score, KYC and income checks are independent calls to the
+    credit service, so they fan out in one step and collect_checks joins them;
+    an application takes as long as its slowest check rather than the sum.
+    The background check follows when the credit score calls for it, or joins
+    the fan-out when SPECULATIVE_CHECKS is set.
+    """
     # Create a new graph
     workflow = StateGraph(CreditState)
     
     # Add nodes for each agent
-    workflow.add_node("credit_score_checker", credit_score_checker)
-    workflow.add_node("kyc_validator", kyc_validator)
-    workflow.add_node("income_verifier", income_verifier)
-    workflow.add_node("background_checker", background_checker)
+    for name, check in [
+        ("credit_score_checker", credit_score_checker),
+        ("kyc_validator", kyc_validator),
+        ("income_verifier", income_verifier),
+        ("background_checker", background_checker),
+    ]:
+        workflow.add_node(name, check)
+        workflow.add_edge(name, "collect_checks")
+    workflow.add_node("collect_checks", collect_checks)
     workflow.add_node("manual_approver", manual_approver)
     workflow.add_node("final_decision_maker", final_decision_maker)
-    workflow.add_node("status_updater", update_status)
-    
-    # Add edges for the standard flow
-    workflow.add_edge("credit_score_checker", "status_updater")
-    workflow.add_edge("kyc_validator", "status_updater")
-    workflow.add_edge("income_verifier", "status_updater")
-    workflow.add_edge("background_checker", "status_updater")
-    workflow.add_edge("manual_approver", "status_updater")
-    workflow.add_edge("final_decision_maker", "status_updater")
-    
-    # Define routing logic after status update
-    def route_after_status_update(state):
-        status = state.keys.get("status", ApplicationStatus.PENDING)
-        
-        if status == ApplicationStatus.CREDIT_CHECK:
-            return "kyc_validator"
-        elif status == ApplicationStatus.KYC_CHECK:
-            return "income_verifier"
-        elif status == ApplicationStatus.INCOME_VERIFICATION:
-            # Check if background check is needed
-            # Convert credit_score to int for comparison
-            credit_score = int(state.keys.get("credit_score", 0))
-            if credit_score < 650:
-                return "background_checker"
-                
-            # Check if manual approval is needed
-            kyc_passed = state.keys.get("kyc_passed", False)
-            income_verified = state.keys.get("income_verified", False)
-            if credit_score >= 600 and (not kyc_passed or not income_verified):
-                return "manual_approver"
-                
-            return "final_decision_maker"
-        elif status == ApplicationStatus.BACKGROUND_CHECK:
-            # Check if manual approval is needed
-            # Convert credit_score to int for comparison
-            credit_score = int(state.keys.get("credit_score", 0))
-            kyc_passed = state.keys.get("kyc_passed", False)
-            income_verified = state.keys.get("income_verified", False)
-            background_check_passed = state.keys.get("background_check_passed", False)
-            
-            if credit_score >= 600 and (not kyc_passed or not income_verified or not background_check_passed):
-                return "manual_approver"
-                
-            return "final_decision_maker"
-        elif status == ApplicationStatus.MANUAL_APPROVAL:
-            return "final_decision_maker"
-        elif status in [ApplicationStatus.APPROVED, ApplicationStatus.REJECTED]:
-            return END
-        else:
-            # Default for PENDING status
-            return "credit_score_checker"
-    
-    # Add conditional edges from status updater
+    
+    # Run the pending checks in parallel
+    workflow.add_conditional_edges(
+        START,
+        required_checks,
+        [*VERIFICATION_CHECKS, "collect_checks"]
+    )
+    
+    # Route once, after every check has reported
     workflow.add_conditional_edges(
-        "status_updater",
-        route_after_status_update,
+        "collect_checks",
+        route_after_checks,
         {
-            "credit_score_checker": "credit_score_checker",
-            "kyc_validator": "kyc_validator",
-            "income_verifier": "income_verifier",
             "background_checker": "background_checker",
             "manual_approver": "manual_approver",
-            "final_decision_maker": "final_decision_maker",
-            END: END
+            "final_decision_maker": "final_decision_maker"
         }
     )
-    
-    # Set the entry point
-    workflow.set_entry_point("status_updater")
+    workflow.add_edge("manual_approver", "final_decision_maker")
+    workflow.add_edge("final_decision_maker", END)
     
     return workflow.compile()
 
@@ -548,7 +538,7 @@ def process_application(application_id: str, customer_id: str, product_type: str
         }
     )
     
-    # Run the workflow
-    result = graph.invoke(initial_state)
+    # Run the workflow; the nodes are async, so drive it on an event loop
+    result = asyncio.run(graph.ainvoke(initial_state))
     
     return result
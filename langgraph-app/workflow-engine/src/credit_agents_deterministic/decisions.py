@@ -0,0 +1,171 @@
+"""
+Structured decision fields for the credit approval workflow.
+
+Tool results are parsed and validated into typed fields (credit score, KYC
+result, manual approval, final decision) when a node runs, so routing reads
+a field instead of scanning the message history. Each log message records
+the fields parsed from its step, which lets results of parallel checks be
+applied only when collected, and lets checkpoints written before these
+fields existed be migrated from their log once.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, ToolMessage
+
+# Bumped when the fields change; checkpoints with an older version are migrated
+DECISIONS_VERSION = 1
+
+# Key under which a log message records the fields parsed from its step
+DECISIONS_KEY = "decisions"
+
+MIN_CREDIT_SCORE = 300
+MAX_CREDIT_SCORE = 850
+
+CREDIT_SCORE_PATTERN = re.compile(r'credit score(?:\s+is)?(?:\s*:)?\s*(\d+)')
+
+
+def parse_credit_score(value: Any) -> Optional[int]:
+    """A credit score in the valid range, or None"""
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        return None
+    return score if MIN_CREDIT_SCORE <= score <= MAX_CREDIT_SCORE else None
+
+def parse_flag(value: Any) -> Optional[bool]:
+    """A boolean from the service's booleans, SQLite integers or strings, or None"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "1", "yes", "false", "0", "no"):
+        return value.strip().lower() in ("true", "1", "yes")
+    return None
+
+def parse_decision(value: Any) -> Optional[str]:
+    """'Approved' or 'Rejected' from a free-form decision, or None"""
+    if not isinstance(value, str):
+        return None
+    text = value.strip().lower()
+    if not text or "not approved" in text:
+        return "Rejected" if text else None
+    if text.startswith("approv"):
+        return "Approved"
+    if text.startswith(("reject", "declin", "denied", "deny")):
+        return "Rejected"
+    return None
+
+
+# Tool name -> parser of the tool's JSON result into decision fields
+TOOL_PARSERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "check_credit_score": lambda data: {"credit_score": parse_credit_score(data.get("credit_score"))},
+    "validate_kyc": lambda data: {"kyc_passed": parse_flag(data.get("kyc_passed"))},
+    "manual_approval": lambda data: {"manual_approval": parse_flag(data.get("approved"))},
+    "make_final_decision": lambda data: {"final_decision": parse_decision(data.get("decision"))},
+}
+
+def parse_tool_output(tool_name: str, content: Any) -> Dict[str, Any]:
+    """
+    Parse one tool result into validated decision fields.
+
+    Args:
+        tool_name: Name of the tool that produced the result
+        content: The tool's result, as JSON text or already decoded
+
+    Returns:
+        The fields the result sets; empty for unknown tools, errors and
+        values that fail validation
+    """
+    parser = TOOL_PARSERS.get(tool_name)
+    if parser is None:
+        return {}
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except ValueError:
+            return {}
+    if not isinstance(content, dict) or "error" in content:
+        return {}
+    return {field: value for field, value in parser(content).items() if value is not None}
+
+
+def _text_fallback(agent_name: Optional[str], text: str) -> Dict[str, Any]:
+    """Fields stated in an agent's answer, for steps whose tool output is unusable"""
+    text = text.lower()
+    if agent_name == "credit_score_checker":
+        match = CREDIT_SCORE_PATTERN.search(text)
+        score = parse_credit_score(match.group(1)) if match else None
+        return {"credit_score": score} if score is not None else {}
+    if agent_name == "final_decision":
+        if "rejected" in text or "not approved" in text:
+            return {"final_decision": "Rejected"}
+        if "approved" in text:
+            return {"final_decision": "Approved"}
+    return {}
+
+def parse_agent_output(agent_name: str, new_messages: Sequence[BaseMessage]) -> Dict[str, Any]:
+    """
+    Decision fields from the messages an agent produced in one step.
+
+    Tool results win; the agent's final answer is only read for fields no
+    tool result provided.
+
+    Args:
+        agent_name: Name of the agent/node
+        new_messages: Messages the agent added, without its input
+
+    Returns:
+        The fields the step sets
+    """
+    fields: Dict[str, Any] = {}
+    for message in new_messages:
+        if isinstance(message, ToolMessage) and message.name:
+            fields.update(parse_tool_output(message.name, message.content))
+    if new_messages and isinstance(new_messages[-1].content, str):
+        for field, value in _text_fallback(agent_name, new_messages[-1].content).items():
+            fields.setdefault(field, value)
+    return fields
+
+
+def message_decisions(message: BaseMessage) -> Dict[str, Any]:
+    """The fields a log message recorded for its step"""
+    return message.additional_kwargs.get(DECISIONS_KEY) or {}
+
+def derive_decisions(messages: Iterable[BaseMessage]) -> Dict[str, Any]:
+    """
+    Rebuild the decision fields from a message log.
+
+    This is the migration path for checkpoints written before the fields
+    existed: messages that recorded their fields are used as they are, older
+    ones are read the way routing used to read them.
+
+    Args:
+        messages: The message log
+
+    Returns:
+        The decision fields found in the log
+    """
+    fields: Dict[str, Any] = {}
+    for message in messages:
+        recorded = message_decisions(message)
+        if recorded:
+            fields.update(recorded)
+            continue
+        if not isinstance(message.content, str):
+            continue
+        text = message.content.lower()
+        if "credit_score" not in fields:
+            match = CREDIT_SCORE_PATTERN.search(text)
+            score = parse_credit_score(match.group(1)) if match else None
+            if score is not None:
+                fields["credit_score"] = score
+        if message.name == "validate_kyc" and ("passed" in text or "failed" in text):
+            fields["kyc_passed"] = "passed" in text and "not passed" not in text
+        elif message.name == "manual_approval":
+            fields["manual_approval"] = "approved" in text and "not approved" not in text
+        elif message.name in ("final_decision", "make_final_decision"):
+            fields.update(_text_fallback("final_decision", text))
+    return fields
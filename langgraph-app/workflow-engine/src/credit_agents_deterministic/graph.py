@@ -2,33 +2,27 @@
 Main workflow graph for the credit approval system.
 This module defines the workflow nodes and graph structure with conditional edges.
 """
-from typing import Literal
-import re
+import os
+from functools import partial
+from typing import List, Literal, Optional, Union
 from typing_extensions import TypedDict
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command, interrupt
-from credit_agents_deterministic.utils import load_chat_model
 from credit_agents_deterministic.state import CreditState
-from credit_agents_deterministic.tools import (
-    check_credit_score, 
-    manual_approval, 
-    perform_background_check, 
-    validate_kyc, 
-    make_final_decision
-)
-from credit_agents_deterministic.prompts import create_agent
+from credit_agents_deterministic.agents import get_agent, get_llm
 from credit_agents_deterministic.node_utils import (
     prepare_messages_for_agent, 
     get_messages, 
-    create_node_handler
-)
-from credit_agents_deterministic.messages import (
-    FilterableHumanMessage, 
-    reverse_messages, 
-    create_messages,
-    normalize_messages
+    create_node_handler,
+    create_check_handler,
+    start_application,
+    decision,
+    migration_update,
+    step_decisions
 )
+from credit_agents_deterministic.decisions import message_decisions
+from credit_agents_deterministic.messages import is_visible, tagged_message
 
 # Define workflow members (agent types)
 MEMBERS = [
@@ -39,45 +33,29 @@ MEMBERS = [
     "manual_approver"
 ]
 
-# Load the language model
-LLM = load_chat_model("openai/gpt-4o-mini")
+def __getattr__(name: str):
+    """Build LLM and AGENTS on first access; the nodes build agents lazily through get_agent"""
+    if name == "LLM":
+        return get_llm()
+    if name == "AGENTS":
+        return {member: get_agent(member) for member in MEMBERS}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create all agents
-AGENTS = {
-    "credit_score_checker": create_agent("credit_score_checker", LLM, [check_credit_score]),
-    "background_checker": create_agent("background_checker", LLM, [perform_background_check]),
-    "validate_kyc": create_agent("validate_kyc", LLM, [validate_kyc]),
-    "manual_approver": create_agent("manual_approver", LLM, [manual_approval]),
-    "final_decision": create_agent("final_decision", LLM, [make_final_decision])
-}
-
-def extract_credit_score(state: CreditState) -> int:
+def extract_credit_score(state: CreditState) -> Optional[int]:
     """
-    Extracts credit score from the messages in the state.
+    Reads the credit score from the state.
     
     Args:
         state: Current workflow state
         
     Returns:
-        Credit score as an integer or None if not found
+        Credit score as an integer or None if not known yet
     """
-    # Default to None if we can't find a credit score
-    credit_score = None
-    
-    # Look through all messages for a credit score
-    for message in state.all_messages:
-        if hasattr(message, 'content') and isinstance(message.content, str):
-            # Look for patterns like "credit score: 720" or "credit score is 720"
-            match = re.search(r'credit score(?:\s+is)?(?:\s*:)?\s*(\d+)', message.content.lower())
-            if match:
-                credit_score = int(match.group(1))
-                break
-    
-    return credit_score
+    return decision(state, "credit_score")
 
 def get_approval_status(state: CreditState) -> bool:
     """
-    Checks if the application was approved based on messages.
+    Checks if the application was approved.
     
     Args:
         state: Current workflow state
@@ -85,11 +63,10 @@ def get_approval_status(state: CreditState) -> bool:
     Returns:
         True if approved, False if not approved or status unknown
     """
-    for message in state.all_messages:
-        if hasattr(message, 'content') and isinstance(message.content, str):
-            if 'approved' in message.content.lower() and not 'not approved' in message.content.lower():
-                return True
-    return False
+    final = decision(state, "final_decision")
+    if final is not None:
+        return final == "Approved"
+    return decision(state, "manual_approval") is True
 
 def has_manual_approval(state: CreditState) -> bool:
     """
@@ -101,10 +78,7 @@ def has_manual_approval(state: CreditState) -> bool:
     Returns:
         True if manual approval completed, False otherwise
     """
-    for message in state.all_messages:
-        if hasattr(message, 'name') and message.name == 'manual_approval':
-            return True
-    return False
+    return decision(state, "manual_approval") is not None
 
 def route_by_credit_score(state: CreditState) -> Literal["credit_score_checker", "background_checker", "validate_kyc", "final_decision"]:
     """
@@ -130,45 +104,110 @@ def route_by_credit_score(state: CreditState) -> Literal["credit_score_checker",
     else:  # Between 600 and 700
         return "validate_kyc"
 
-def route_after_background_check(state: CreditState) -> Literal["manual_approver", "final_decision"]:
+# Checks of the verification stage. Which of background_checker and validate_kyc
+# applies depends on the credit score, so by default it runs once the score is in
+VERIFICATION_CHECKS = ["credit_score_checker", "background_checker", "validate_kyc"]
+
+# Run background_checker and validate_kyc alongside the credit score check
+# instead of after it. Off by default: each is a full agent run, and on a 404
+# the tools create records for the applicant even when the score makes the
+# result irrelevant
+SPECULATIVE_CHECKS = os.getenv("CREDIT_SPECULATIVE_CHECKS", "false").lower() == "true"
+
+def score_check_batch(state: CreditState) -> Union[List[str], str]:
+    """The checks to run while the credit score is unknown"""
+    return VERIFICATION_CHECKS if SPECULATIVE_CHECKS else "credit_score_checker"
+
+def route_checks(state: CreditState) -> Union[List[str], str]:
     """
-    Routes after background check.
+    Routes a new application into the verification stage.
     
     Args:
         state: Current workflow state
         
     Returns:
-        Name of the next node
+        The credit score check (with the other checks when speculative) if
+        the credit score is unknown, otherwise the next node for the known score
     """
-    # After background check, go to manual approver
-    return "manual_approver"
+    if extract_credit_score(state) is None:
+        return score_check_batch(state)
+    return route_by_credit_score(state)
 
-def route_after_manual_approval(state: CreditState) -> Literal["final_decision"]:
+def collect_checks(state: CreditState) -> dict:
     """
-    Routes after manual approval.
+    Joins the parallel checks into the message log.
+    
+    Results are appended in a fixed order, and only those the credit score
+    calls for, so the log reads as if the checks had run one after another.
     
     Args:
         state: Current workflow state
         
     Returns:
-        Name of the next node
+        Messages to append with their decision fields, whether the check the
+        score calls for is in, and a reset of the collected results
     """
-    # After manual approval, go to final decision
-    return "final_decision"
+    results = state.check_results
+    credit_message = results.get("credit_score_checker")
+    credit_score = message_decisions(credit_message).get("credit_score") if credit_message else None
+    if credit_score is None:
+        credit_score = extract_credit_score(state)
+    
+    wanted = ["credit_score_checker"]
+    follow_up = None
+    if credit_score is not None and credit_score < 600:
+        follow_up = "background_checker"
+    elif credit_score is not None and credit_score <= 700:
+        follow_up = "validate_kyc"
+    if follow_up:
+        wanted.append(follow_up)
+    
+    new_messages = [results[name] for name in wanted if name in results]
+    decisions = {}
+    for message in new_messages:
+        decisions.update(message_decisions(message))
+    return {
+        "all_messages": new_messages,
+        "messages": [message for message in new_messages if is_visible(message)],
+        "check_results": None,
+        "verification_complete": credit_score is not None and (follow_up is None or follow_up in results),
+        **migration_update(state),
+        **decisions
+    }
 
-def route_after_kyc(state: CreditState) -> Literal["manual_approver", "final_decision"]:
+def route_after_checks(state: CreditState) -> Union[List[str], str]:
     """
-    Routes after KYC validation.
+    Routes once every verification result is in.
     
     Args:
         state: Current workflow state
         
     Returns:
-        Name of the next node
+        Name of the next node, or the checks again if no credit score was found
     """
-    # After KYC validation, go to manual approver
+    credit_score = extract_credit_score(state)
+    if credit_score is None:
+        return score_check_batch(state)
+    if not state.verification_complete:
+        # The background check or KYC the score calls for has not run yet
+        return route_by_credit_score(state)
+    if credit_score > 700:
+        return "final_decision"
     return "manual_approver"
 
+def route_after_manual_approval(state: CreditState) -> Literal["final_decision"]:
+    """
+    Routes after manual approval.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        Name of the next node
+    """
+    # After manual approval, go to final decision
+    return "final_decision"
+
 def is_process_complete(state: CreditState) -> bool:
     """
     Determines if the credit approval process is complete.
@@ -179,36 +218,31 @@ def is_process_complete(state: CreditState) -> bool:
     Returns:
         True if process is complete, False otherwise
     """
-    # Check if final decision has been made
-    for message in state.all_messages:
-        if hasattr(message, 'name') and message.name == 'make_final_decision':
-            return True
-    
-    return False
+    return decision(state, "final_decision") is not None
 
 # Create node handlers with default next nodes
 # These will be overridden by conditional edges
-credit_score_node = create_node_handler(
-    AGENTS["credit_score_checker"], 
+credit_score_node = create_check_handler(
+    partial(get_agent, "credit_score_checker"), 
     "credit_score_checker"
 )
 
-background_checker_node = create_node_handler(
-    AGENTS["background_checker"], 
+background_checker_node = create_check_handler(
+    partial(get_agent, "background_checker"), 
     "background_checker"
 )
 
-validate_kyc_node = create_node_handler(
-    AGENTS["validate_kyc"], 
+validate_kyc_node = create_check_handler(
+    partial(get_agent, "validate_kyc"), 
     "validate_kyc"
 )
 
 final_decision_node = create_node_handler(
-    AGENTS["final_decision"], 
+    partial(get_agent, "final_decision"), 
     "final_decision"
 )
 
-def manual_approver_node(state: CreditState) -> Command:
+async def manual_approver_node(state: CreditState) -> Command:
     """
     Manual approver node that requires user intervention.
     This is a custom node that can't use the standard handler.
@@ -219,34 +253,34 @@ def manual_approver_node(state: CreditState) -> Command:
     Returns:
         Command with updated state (next node decided by conditional edge)
     """
-    # Prepare messages for the agent
-    messages_for_llm = prepare_messages_for_agent(state)
-    
     # Interrupt the user for manual approval
     approved = interrupt("Approve the application now?")
     label = "Approved" if approved else "Rejected"
     
     # Create approval message
-    approval_message = FilterableHumanMessage(
+    approval_message = tagged_message(
         content=f"The application is '{label}'", 
         name="final_decision", 
         show_in_chat=False if "manual_approver" in state.filter_tools else True
     )
     
-    # Add approval message to existing messages
-    messages_for_llm = reverse_messages(state.all_messages + [approval_message])
+    # Add approval message to the log the agent reads
+    messages_for_llm = prepare_messages_for_agent(state) + [approval_message]
     
     # Invoke the agent
-    result = AGENTS["manual_approver"].invoke({"messages": messages_for_llm})
+    result = await get_agent("manual_approver").ainvoke({"messages": messages_for_llm})
     
-    # Process the result
-    messages_result = get_messages(state, result, "manual_approval")
+    # Process the result; the reviewer's answer is the approval, whatever the tool returned
+    decisions = {**step_decisions("manual_approver", result, messages_for_llm), "manual_approval": bool(approved)}
+    messages_result = get_messages(state, result, "manual_approval", decisions)
     
     # Return command to update state (next node decided by conditional edge)
     return Command(
         update={
             "messages": messages_result["chat_messages"],
-            "all_messages": messages_result["all_messages"]
+            "all_messages": messages_result["all_messages"],
+            **migration_update(state),
+            **decisions
         }
     )
 
@@ -254,16 +288,21 @@ def manual_approver_node(state: CreditState) -> Command:
 builder = StateGraph(CreditState)
 
 # Add all nodes
+builder.add_node("start_application", start_application)
 builder.add_node("credit_score_checker", credit_score_node)
 builder.add_node("background_checker", background_checker_node)
 builder.add_node("validate_kyc", validate_kyc_node)
+builder.add_node("collect_checks", collect_checks)
 builder.add_node("manual_approver", manual_approver_node)
 builder.add_node("final_decision", final_decision_node)
 
-# Add START edge based on credit score
+builder.add_edge(START, "start_application")
+
+# Fan out the verification checks together, or go straight to the next
+# step when the credit score is already known
 builder.add_conditional_edges(
-    START,
-    route_by_credit_score,
+    "start_application",
+    route_checks,
     {
         "credit_score_checker": "credit_score_checker",
         "background_checker": "background_checker",
@@ -272,33 +311,18 @@ builder.add_conditional_edges(
     }
 )
 
-# Add conditional edges from credit_score_checker node
+# Join the checks; collect_checks runs once all of them have finished
+for check in VERIFICATION_CHECKS:
+    builder.add_edge(check, "collect_checks")
+
+# Route on the credit score once every result is in
 builder.add_conditional_edges(
-    "credit_score_checker",
-    route_by_credit_score,
+    "collect_checks",
+    route_after_checks,
     {
         "credit_score_checker": "credit_score_checker",  # Retry if needed
         "background_checker": "background_checker",
         "validate_kyc": "validate_kyc",
-        "final_decision": "final_decision"
-    }
-)
-
-# Add edge from background_checker to manual_approver
-builder.add_conditional_edges(
-    "background_checker",
-    route_after_background_check,
-    {
-        "manual_approver": "manual_approver",
-        "final_decision": "final_decision"
-    }
-)
-
-# Add edge from validate_kyc to manual_approver
-builder.add_conditional_edges(
-    "validate_kyc",
-    route_after_kyc,
-    {
         "manual_approver": "manual_approver",
         "final_decision": "final_decision"
     }
@@ -324,4 +348,4 @@ builder.add_conditional_edges(
 )
 
 # Compile the graph
-graph = builder.compile()
\ No newline at end of file
+graph = builder.compile()
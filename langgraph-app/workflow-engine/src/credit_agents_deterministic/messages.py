@@ -1,131 +1,118 @@
-from langchain_core.messages import AIMessage, HumanMessage
-from typing import List, Union
+"""
+Messages tagged with their chat visibility.
 
-class FilterableAIMessage(AIMessage):
-    def __init__(self, content: str, name:str, show_in_chat: bool):
+Log entries are plain HumanMessage and AIMessage objects that carry their
+visibility in ``additional_kwargs``. Chat model integrations do not send
+unknown ``additional_kwargs`` to the provider, so a log can be handed to an
+agent as it is, without building a converted copy on every call.
+"""
+
+import uuid
+from itertools import compress
+from typing import List, Optional, Sequence, Type, Union
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    convert_to_messages,
+)
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+SHOW_IN_CHAT = "show_in_chat"
+
+def tagged_message(
+    content: str,
+    name: str,
+    show_in_chat: bool,
+    message_type: Type[BaseMessage] = HumanMessage
+) -> BaseMessage:
+    """Create a log message that records whether it is shown in the chat
+
+    The id is assigned here, so the same message can go to the log and the
+    chat without either reducer having to set it.
+    """
+    return message_type(
+        content=content,
+        name=name,
+        id=str(uuid.uuid4()),
+        additional_kwargs={SHOW_IN_CHAT: show_in_chat}
+    )
+
+def is_visible(message: BaseMessage) -> bool:
+    """Whether a message belongs in the chat; untagged messages do"""
+    visible = message.additional_kwargs.get(SHOW_IN_CHAT)
+    if visible is None:
+        # Entries written by older versions keep the flag as an attribute
+        visible = getattr(message, SHOW_IN_CHAT, True)
+    return visible
+
+def filter_messages(messages: Sequence[BaseMessage], show_in_chat: bool = True) -> List[BaseMessage]:
+    """Select the messages whose visibility matches, with a single mask pass"""
+    mask = map(is_visible, messages)
+    if not show_in_chat:
+        mask = (not visible for visible in mask)
+    return list(compress(messages, mask))
+
+
+class FilterableHumanMessage(HumanMessage):
+    """Legacy log entry, kept so checkpoints written before visibility moved into additional_kwargs still load"""
+
+    def __init__(self, content: str, name: str, show_in_chat: bool):
         super().__init__(content, name=name)
         self.show_in_chat = show_in_chat
-    
-    # factory to create an instance of this class from AIMessage
-    @classmethod
-    def from_aimessage(cls, aimessage: AIMessage, show_in_chat: bool) -> "FilterableAIMessage":
-        return cls(aimessage.content, name=aimessage.name, show_in_chat=show_in_chat)
-    
-    def to_aimessage(self) -> AIMessage:
-        return AIMessage(content=self.content, name=self.name)
 
-class FilterableHumanMessage(HumanMessage):
-    def __init__(self, content: str, name:str, show_in_chat: bool):
+
+class FilterableAIMessage(AIMessage):
+    """Legacy log entry, kept so checkpoints written before visibility moved into additional_kwargs still load"""
+
+    def __init__(self, content: str, name: str, show_in_chat: bool):
         super().__init__(content, name=name)
         self.show_in_chat = show_in_chat
 
-    # factory to create an instance of this class from HumanMessage
-    @classmethod
-    def from_humanmessage(cls, humanmessage: HumanMessage, show_in_chat: bool) -> "FilterableHumanMessage":
-        return cls(humanmessage.content, name=humanmessage.name, show_in_chat=show_in_chat)
-    
-    def to_humanmessage(self) -> HumanMessage:
-        return HumanMessage(content=self.content, name=self.name)
-    
-
-# factory to create an instance of this class from list of messages
-def create_messages(messages: List[Union[HumanMessage, AIMessage, dict]], show_in_chat: bool) -> List[Union[FilterableHumanMessage, FilterableAIMessage]]:
-    print(f"create_messages - input type: {type(messages)}")
-    result = []
-    
-    for msg in messages:
-        if isinstance(msg, HumanMessage):
-            result.append(FilterableHumanMessage.from_humanmessage(msg, show_in_chat))
-        elif isinstance(msg, AIMessage):
-            result.append(FilterableAIMessage.from_aimessage(msg, show_in_chat))
-        elif isinstance(msg, dict) and 'content' in msg:
-            # Handle dictionary messages
-            msg_type = msg.get('type', 'human')  # Default to human if type not specified
-            msg_content = msg['content']
-            msg_name = msg.get('name', None)
-            
-            if msg_type == 'human':
-                human_msg = HumanMessage(content=msg_content, name=msg_name)
-                result.append(FilterableHumanMessage.from_humanmessage(human_msg, show_in_chat))
-            elif msg_type == 'ai':
-                ai_msg = AIMessage(content=msg_content, name=msg_name)
-                result.append(FilterableAIMessage.from_aimessage(ai_msg, show_in_chat))
-        else:
-            print(f"Unknown message type: {type(msg)}, content: {msg}")
-    
-    print(f"create_messages - created {len(result)} filterable messages")
-    return result
-
-# factory to create an instance of HumanMessage or AIMessage from list of FilterableHumanMessage or FilterableAIMessage
-def reverse_messages(messages: List[Union[FilterableHumanMessage, FilterableAIMessage]]) -> List[Union[HumanMessage, AIMessage]]:
-    print(f"reverse_messages - input type: {type(messages)}")
-    
-    if not messages:
-        print("Warning: Empty messages list passed to reverse_messages")
-        return []
-    
-    result = []
-    for msg in messages:
-        if isinstance(msg, FilterableHumanMessage):
-            result.append(msg.to_humanmessage())
-        elif isinstance(msg, FilterableAIMessage):
-            result.append(msg.to_aimessage())
-        elif isinstance(msg, HumanMessage):
-            # Already a HumanMessage, just add it
-            result.append(msg)
-        elif isinstance(msg, AIMessage):
-            # Already an AIMessage, just add it
-            result.append(msg)
-        elif isinstance(msg, dict) and 'content' in msg:
-            # Handle dictionary messages
-            msg_type = msg.get('type', 'human')  # Default to human if type not specified
-            msg_content = msg['content']
-            msg_name = msg.get('name', None)
-            
-            if msg_type == 'human':
-                result.append(HumanMessage(content=msg_content, name=msg_name))
-            elif msg_type == 'ai':
-                result.append(AIMessage(content=msg_content, name=msg_name))
-        else:
-            print(f"Unknown message type: {type(msg)}, content: {msg}")
-    
-    print(f"reverse_messages - converted {len(result)} messages")
-    return result
-
-def filter_messages(messages: List[Union[FilterableHumanMessage, FilterableAIMessage]], show_in_chat: bool) -> List[Union[FilterableHumanMessage, FilterableAIMessage]]:
-    return [msg for msg in messages if not hasattr(msg, 'show_in_chat') or msg.show_in_chat == show_in_chat]
-
-
-def normalize_messages(messages: List[Union[dict, HumanMessage, AIMessage]]) -> List[Union[HumanMessage, AIMessage]]:
+
+def _is_legacy(message: Union[BaseMessage, dict]) -> bool:
+    return isinstance(message, (dict, FilterableHumanMessage, FilterableAIMessage))
+
+def _upgrade(message: Union[BaseMessage, dict]) -> BaseMessage:
+    if isinstance(message, dict):
+        return convert_to_messages([message])[0]
+    if isinstance(message, (FilterableHumanMessage, FilterableAIMessage)):
+        message_type = HumanMessage if isinstance(message, HumanMessage) else AIMessage
+        return tagged_message(message.content, message.name, message.show_in_chat, message_type)
+    return message
+
+
+def llm_view(messages: List[Union[BaseMessage, dict]]) -> List[BaseMessage]:
     """
-    Normalize messages to ensure they are proper HumanMessage or AIMessage objects.
-    This handles conversion from dictionaries or other formats to the proper message types.
-    
+    The message log as an agent should receive it.
+
+    A log of tagged messages is returned as it is. Legacy entries are replaced
+    in the log itself by log_upgrade; until then, e.g. when a run resumes
+    before reaching the node that migrates the log, they are upgraded in a copy.
+
     Args:
-        messages: A list of messages in various formats (dict, HumanMessage, AIMessage)
-        
+        messages: The message log
+
+    Returns:
+        Messages ready for agent invocation
+    """
+    if not any(map(_is_legacy, messages)):
+        return messages
+    return [_upgrade(message) for message in messages]
+
+def log_upgrade(messages: List[Union[BaseMessage, dict]]) -> Optional[List[BaseMessage]]:
+    """
+    The log update that replaces legacy entries restored from older checkpoints.
+
+    Args:
+        messages: The message log
+
     Returns:
-        A list of properly formatted HumanMessage and AIMessage objects
+        Messages for the log reducer that replace the whole log with tagged
+        messages, or None when there are no legacy entries
     """
-    if not messages:
-        return []
-        
-    result = []
-    for msg in messages:
-        if isinstance(msg, (HumanMessage, AIMessage)):
-            # Already a proper message object
-            result.append(msg)
-        elif isinstance(msg, dict) and 'content' in msg:
-            # Convert dictionary to proper message object
-            msg_type = msg.get('type', 'human')  # Default to human if type not specified
-            msg_content = msg['content']
-            msg_name = msg.get('name', None)
-            
-            if msg_type == 'human':
-                result.append(HumanMessage(content=msg_content, name=msg_name))
-            elif msg_type == 'ai':
-                result.append(AIMessage(content=msg_content, name=msg_name))
-        else:
-            print(f"Warning: Unknown message format: {type(msg)}, content: {msg}")
-    
-    return result
\ No newline at end of file
+    if not any(map(_is_legacy, messages)):
+        return None
+    return [RemoveMessage(id=REMOVE_ALL_MESSAGES), *(_upgrade(message) for message in messages)]
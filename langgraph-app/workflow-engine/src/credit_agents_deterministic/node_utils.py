@@ -3,52 +3,133 @@ Node utilities for the credit approval workflow.
 This module provides common functionality for workflow nodes to reduce duplication.
 """
 
-from typing import List, Union,Callable
-from langchain_core.messages import AIMessage, HumanMessage
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage
 from langgraph.types import Command
 
-from credit_agents_deterministic.state import CreditState
+from credit_agents_deterministic.decisions import (
+    DECISIONS_KEY,
+    DECISIONS_VERSION,
+    derive_decisions,
+    parse_agent_output,
+)
 from credit_agents_deterministic.messages import (
-    FilterableHumanMessage, 
-    normalize_messages, 
-    create_messages, 
-    reverse_messages, 
-    filter_messages
+    is_visible,
+    llm_view,
+    log_upgrade,
+    tagged_message,
 )
+from credit_agents_deterministic.state import CreditState
 
-def get_messages(state: CreditState, result: dict, tool_name: str) -> dict:
-    """Process agent result and update message state
+
+def result_message(
+    state: CreditState, 
+    result: dict, 
+    tool_name: str, 
+    decisions: Optional[Dict[str, Any]] = None
+) -> BaseMessage:
+    """Wrap the agent's final answer as a message tagged with its visibility
     
     Args:
         state: Current workflow state
         result: Result from agent invocation
         tool_name: Name of the tool/agent that generated the result
+        decisions: Decision fields parsed from the step, recorded on the message
         
     Returns:
-        Dictionary with all_messages and chat_messages
+        The new message
     """
-    # Create a new message from the agent result
-    new_message = FilterableHumanMessage(
+    message = tagged_message(
         content=result["messages"][-1].content, 
         name=tool_name,
         # Set show_in_chat based on whether this tool should be filtered
         show_in_chat=tool_name not in state.filter_tools
     )
+    if decisions:
+        message.additional_kwargs[DECISIONS_KEY] = decisions
+    return message
+
+def get_messages(
+    state: CreditState, 
+    result: dict, 
+    tool_name: str, 
+    decisions: Optional[Dict[str, Any]] = None
+) -> dict:
+    """Process agent result into message updates
     
-    # Add the new message to all existing messages
-    all_messages = state.all_messages + [new_message]
+    The state's message channels append, so only the new message is returned.
     
-    # Get messages that should be shown in chat (show_in_chat=True)
-    chat_messages = filter_messages(all_messages, show_in_chat=True)
+    Args:
+        state: Current workflow state
+        result: Result from agent invocation
+        tool_name: Name of the tool/agent that generated the result
+        decisions: Decision fields parsed from the step
+        
+    Returns:
+        Dictionary with the all_messages and chat_messages to append
+    """
+    new_message = result_message(state, result, tool_name, decisions)
     
     return { 
-        "all_messages": all_messages, 
-        "chat_messages": chat_messages 
+        "all_messages": [new_message], 
+        # Only visible messages go to the chat
+        "chat_messages": [new_message] if is_visible(new_message) else []
     }
 
-def prepare_messages_for_agent(state: CreditState) -> List[Union[HumanMessage, AIMessage]]:
+def step_decisions(tool_name: str, result: dict, messages_for_llm: List[BaseMessage]) -> Dict[str, Any]:
     """
-    Prepare messages for agent invocation by normalizing and converting as needed.
+    Parse the decision fields out of what the agent added in this step.
+    
+    Args:
+        tool_name: Name of the tool/agent
+        result: Result from agent invocation
+        messages_for_llm: The messages the agent was invoked with
+        
+    Returns:
+        The decision fields the step sets
+    """
+    return parse_agent_output(tool_name, result["messages"][len(messages_for_llm):])
+
+def decision(state: CreditState, field: str) -> Any:
+    """
+    Read a decision field for routing.
+    
+    Checkpoints written before the fields existed have them derived from the
+    log until the next node stores them; see migration_update.
+    
+    Args:
+        state: Current workflow state
+        field: credit_score, kyc_passed, manual_approval or final_decision
+        
+    Returns:
+        The field's value, or None if not decided yet
+    """
+    if state.decisions_version >= DECISIONS_VERSION:
+        return getattr(state, field)
+    return derive_decisions(state.all_messages).get(field)
+
+def migration_update(state: CreditState) -> Dict[str, Any]:
+    """
+    Fill in the decision fields of a checkpoint written before they existed.
+    
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        The derived fields and the current version, or nothing when the
+        state is up to date
+    """
+    if state.decisions_version >= DECISIONS_VERSION:
+        return {}
+    return {**derive_decisions(state.all_messages), "decisions_version": DECISIONS_VERSION}
+
+def prepare_messages_for_agent(state: CreditState) -> List[BaseMessage]:
+    """
+    Prepare messages for agent invocation.
+    
+    The log is passed as it is; see llm_view. The state is only read: the log
+    is seeded once by start_application.
     
     Args:
         state: Current workflow state
@@ -56,50 +137,92 @@ def prepare_messages_for_agent(state: CreditState) -> List[Union[HumanMessage, A
     Returns:
         List of messages ready for agent invocation
     """
-    # Normalize state.messages to ensure proper message objects
-    if state.messages:
-        state.messages = normalize_messages(state.messages)
+    if state.all_messages:
+        return llm_view(state.all_messages)
+    # The log has not been seeded yet; use the incoming chat messages
+    return state.messages
+
+def start_application(state: CreditState) -> dict:
+    """
+    Seed the message log from the incoming chat messages.
     
-    # Initialize all_messages if needed
-    if not state.all_messages or len(state.all_messages) == 0:
-        state.all_messages = create_messages(state.messages, True)
+    The chat reducer has already converted them, and untagged messages count
+    as visible, so they are logged as they are.
     
-    # Get messages for the LLM (either from state.messages or by converting all_messages back)
-    return state.messages if len(state.all_messages) == 0 else reverse_messages(state.all_messages)
+    Args:
+        state: Current workflow state
+        
+    Returns:
+        Update appending the chat messages, if the log is still empty, or
+        migrating the decision fields and legacy log entries of an older
+        checkpoint
+    """
+    if state.all_messages:
+        upgrade = log_upgrade(state.all_messages)
+        return {**migration_update(state), **({"all_messages": upgrade} if upgrade else {})}
+    return {"all_messages": list(state.messages), "decisions_version": DECISIONS_VERSION}
 
 def create_node_handler(
-    agent: Callable, 
+    agent: Callable[[], Any], 
     tool_name: str, 
     next_node: str = "supervisor"
-) -> Callable[[CreditState], Command]:
+) -> Callable[[CreditState], Awaitable[Command]]:
     """
     Create a standard node handler for the workflow.
     
     Args:
-        agent: Agent to invoke
+        agent: Returns the agent to invoke; called per run, so agents are
+            only built once a node first runs
         tool_name: Name of the tool/agent
         next_node: Name of the next node to go to
         
     Returns:
         Node handler function
     """
-    def node_handler(state: CreditState) -> Command:
+    async def node_handler(state: CreditState) -> Command:
         # Prepare messages for the agent
         messages_for_llm = prepare_messages_for_agent(state)
         
         # Invoke the agent
-        result = agent.invoke({"messages": messages_for_llm})
+        result = await agent().ainvoke({"messages": messages_for_llm})
         
         # Process the result
-        messages = get_messages(state, result, tool_name)
+        decisions = step_decisions(tool_name, result, messages_for_llm)
+        messages = get_messages(state, result, tool_name, decisions)
         
         # Return command to update state and go to next node
         return Command(
             update={
                 "messages": messages["chat_messages"],
-                "all_messages": messages["all_messages"]
+                "all_messages": messages["all_messages"],
+                **migration_update(state),
+                **decisions
             },
             goto=next_node,
         )
     
     return node_handler
+
+def create_check_handler(agent: Callable[[], Any], tool_name: str) -> Callable[[CreditState], Awaitable[dict]]:
+    """
+    Create a handler for a check that runs in the parallel verification stage.
+    
+    Parallel checks must not append to the message log themselves, since the
+    order would depend on which finished first; their results are collected
+    once all of them are in. The same goes for their decision fields, which
+    travel on the result message.
+    
+    Args:
+        agent: Returns the agent to invoke; called per run
+        tool_name: Name of the tool/agent
+        
+    Returns:
+        Node handler function
+    """
+    async def check_handler(state: CreditState) -> dict:
+        messages_for_llm = prepare_messages_for_agent(state)
+        result = await agent().ainvoke({"messages": messages_for_llm})
+        decisions = step_decisions(tool_name, result, messages_for_llm)
+        return {"check_results": {tool_name: result_message(state, result, tool_name, decisions)}}
+    
+    return check_handler
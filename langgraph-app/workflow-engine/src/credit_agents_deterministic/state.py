@@ -1,11 +1,95 @@
+import uuid
 from dataclasses import dataclass, field
-from typing import List, Union
-from langchain_core.messages import AIMessage, HumanMessage
-from credit_agents_deterministic.messages import FilterableHumanMessage, FilterableAIMessage
+from typing import Dict, List, Optional, Sequence, Union
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    convert_to_messages,
+)
+from langgraph.graph import add_messages
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from typing_extensions import Annotated
+
+
+def append_log(current: List[BaseMessage], update: Union[BaseMessage, Sequence[BaseMessage], None]) -> List[BaseMessage]:
+    """Reducer for the message log: appends the update
+
+    Like any LangGraph reducer it returns a new list, so the log is copied
+    once per step; unlike add_messages, logged entries are not converted or
+    matched by id. The only other update is the one of messages.log_upgrade:
+    a RemoveMessage of all messages followed by the log that replaces them.
+    """
+    if not update:
+        return current
+    if isinstance(update, BaseMessage):
+        update = [update]
+    if isinstance(update[0], RemoveMessage) and update[0].id == REMOVE_ALL_MESSAGES:
+        return list(update[1:])
+    return current + list(update)
+
+def append_chat(
+    current: List[BaseMessage],
+    update: Union[BaseMessage, Sequence[Union[BaseMessage, dict, str]], None]
+) -> List[BaseMessage]:
+    """Reducer for the chat view: appends new messages, replaces or removes by id
+
+    Nodes write messages made by messages.tagged_message, which carry an id;
+    one without an id, such as run input, is appended as a copy with a new id,
+    leaving the caller's object as it is. Removals and messages whose id is
+    already in the chat go through add_messages, so one with the id of a chat
+    message replaces it. Like any LangGraph reducer this returns a new list,
+    so the chat is copied once per step; for plain appends only the ids of
+    the history are read, instead of add_messages converting all of it.
+    """
+    if not update:
+        return current
+    if not isinstance(update, (list, tuple)):
+        update = [update]
+    new_messages = [
+        message if message.id is not None else message.model_copy(update={"id": str(uuid.uuid4())})
+        for message in convert_to_messages(update)
+    ]
+    if any(isinstance(message, RemoveMessage) for message in new_messages):
+        return add_messages(current, new_messages)
+    chat_ids = {message.id for message in current}
+    if any(message.id in chat_ids for message in new_messages):
+        return add_messages(current, new_messages)
+    return current + new_messages
+
+def merge_check_results(
+    current: Dict[str, BaseMessage],
+    update: Optional[Dict[str, BaseMessage]]
+) -> Dict[str, BaseMessage]:
+    """Merge results of parallel checks; a None update clears them once they are collected"""
+    if update is None:
+        return {}
+    return {**current, **update}
+
+def latest_version(current: int, update: int) -> int:
+    """Keep the highest version written; several nodes of one step may write it"""
+    return max(current, update)
+
 # Define the state for our credit approval workflow
 @dataclass
 class CreditState:
     next: str = "supervisor"
     filter_tools: List[str] = field(default_factory=lambda: ["credit_score_checker", "background_checker"])
-    messages: List[Union[HumanMessage, AIMessage]] = field(default_factory=list)
-    all_messages: List[Union[FilterableHumanMessage, FilterableAIMessage]] = field(default_factory=list)
+    # Both message channels are append-only: nodes return just their new
+    # messages. messages is the chat view, holding the visible log entries;
+    # all_messages is the full log the agents read
+    messages: Annotated[List[Union[HumanMessage, AIMessage]], append_chat] = field(default_factory=list)
+    all_messages: Annotated[List[BaseMessage], append_log] = field(default_factory=list)
+    # Result message of each check running in the parallel verification stage
+    check_results: Annotated[Dict[str, BaseMessage], merge_check_results] = field(default_factory=dict)
+    # Set by collect_checks once the check the credit score calls for has been collected
+    verification_complete: bool = False
+    # Decision fields parsed from tool results, read by routing (see decisions.py)
+    credit_score: Optional[int] = None
+    kyc_passed: Optional[bool] = None
+    manual_approval: Optional[bool] = None
+    final_decision: Optional[str] = None
+    # 0 for checkpoints written before the decision fields existed
+    decisions_version: Annotated[int, latest_version] = 0
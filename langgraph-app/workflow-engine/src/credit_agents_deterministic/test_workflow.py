@@ -3,6 +3,7 @@
 This module contains functions to test the credit approval workflow with different scenarios.
 """
 
+import asyncio
 import dotenv
 from unittest.mock import patch
 from langchain_core.messages import HumanMessage
@@ -13,6 +14,10 @@ from credit_agents_deterministic.state import CreditState
 # Load environment variables
 dotenv.load_dotenv()
 
+async def collect_steps(initial_state):
+    """Run the graph, whose nodes are async, and return the streamed steps"""
+    return [output async for output in graph.astream(initial_state)]
+
 def run_workflow(application_id, customer_id, product_type, amount, auto_approve=True):
     """Helper function to run the workflow with different parameters
     
@@ -45,7 +50,7 @@ def run_workflow(application_id, customer_id, product_type, amount, auto_approve
     # Mock the interrupt function to return auto_approve
     with patch('credit_agents_dynamic.graph.interrupt', return_value=auto_approve):
         # Run the workflow and track steps
-        for i, output in enumerate(graph.stream(initial_state)):
+        for i, output in enumerate(asyncio.run(collect_steps(initial_state))):
             print(f"Step {i+1}:")
             
             # For debugging, print the output keys on first step
@@ -0,0 +1,103 @@
+"""Lazy agent construction for the credit approval workflow.
+
+The chat model and the agents are built on first use instead of at import
+time, so importing the graph stays cheap for workers and tests that never
+run it. Each is built once per process, under a lock, and shared by all
+runs; warm_up builds them ahead of the first request.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+
+from credit_agents_dynamic.prompts import create_agent
+from credit_agents_dynamic.tools import (
+    check_credit_score,
+    make_final_decision,
+    manual_approval,
+    perform_background_check,
+    validate_kyc,
+)
+from credit_agents_dynamic.utils import load_chat_model
+
+MODEL_NAME = "openai/gpt-4o-mini"
+
+# Tools of each agent
+AGENT_TOOLS: Dict[str, List[BaseTool]] = {
+    "credit_score_checker": [check_credit_score],
+    "background_checker": [perform_background_check],
+    "validate_kyc": [validate_kyc],
+    "manual_approver": [manual_approval],
+    "final_decision": [make_final_decision]
+}
+
+_llm: BaseChatModel | None = None
+_agents: Dict[str, Any] = {}
+_structured: Dict[type, Runnable] = {}
+_lock = threading.RLock()
+
+def get_llm() -> BaseChatModel:
+    """Return the shared chat model, loading it on first use.
+
+    Returns:
+        The chat model used by every agent
+    """
+    global _llm
+    if _llm is None:
+        with _lock:
+            if _llm is None:
+                _llm = load_chat_model(MODEL_NAME)
+    return _llm
+
+def get_agent(name: str) -> Any:
+    """Return the shared agent for a workflow member, building it on first use.
+
+    Args:
+        name: Agent name, a key of AGENT_TOOLS
+
+    Returns:
+        The agent
+    """
+    agent = _agents.get(name)
+    if agent is None:
+        if name not in AGENT_TOOLS:
+            raise ValueError(f"Unknown agent type: {name}")
+        with _lock:
+            agent = _agents.get(name)
+            if agent is None:
+                agent = _agents[name] = create_agent(name, get_llm(), AGENT_TOOLS[name])
+    return agent
+
+def get_structured_llm(schema: type) -> Runnable:
+    """Return the shared chat model bound to a structured output schema.
+
+    Args:
+        schema: The output schema, e.g. the supervisor's Router
+
+    Returns:
+        The structured output runnable
+    """
+    runnable = _structured.get(schema)
+    if runnable is None:
+        with _lock:
+            runnable = _structured.get(schema)
+            if runnable is None:
+                runnable = _structured[schema] = get_llm().with_structured_output(schema)
+    return runnable
+
+def warm_up(names: Iterable[str] | None = None) -> List[str]:
+    """Build agents ahead of the first run, e.g. from a background thread after startup.
+
+    Args:
+        names: Agents to build; all of them by default
+
+    Returns:
+        Names of the agents that are ready
+    """
+    names = list(AGENT_TOOLS if names is None else names)
+    for name in names:
+        get_agent(name)
+    return names
@@ -2,32 +2,22 @@
 Main workflow graph for the credit approval system.
 This module defines the workflow nodes and graph structure.
 """
+from functools import partial
 from typing import Literal
-from typing_extensions import TypedDict
 
-from langgraph.graph import StateGraph, START, END
+from langgraph.graph import END, START, StateGraph
 from langgraph.types import Command, interrupt
-from credit_agents_dynamic.utils import load_chat_model
-from credit_agents_dynamic.state import CreditState
-from credit_agents_dynamic.tools import (
-    check_credit_score, 
-    manual_approval, 
-    perform_background_check, 
-    validate_kyc, 
-    make_final_decision
-)
-from credit_agents_dynamic.prompts import get_supervisor_prompt, create_agent
+from typing_extensions import TypedDict
+
+from credit_agents_dynamic.agents import get_agent, get_llm, get_structured_llm
+from credit_agents_dynamic.messages import log_upgrade, tagged_message
 from credit_agents_dynamic.node_utils import (
-    prepare_messages_for_agent, 
-    get_messages, 
-    create_node_handler
-)
-from credit_agents_dynamic.messages import (
-    FilterableHumanMessage, 
-    reverse_messages, 
-    create_messages,
-    normalize_messages
+    create_node_handler,
+    get_messages,
+    prepare_messages_for_agent,
 )
+from credit_agents_dynamic.prompts import get_supervisor_prompt
+from credit_agents_dynamic.state import CreditState
 
 # Define workflow members (agent types)
 MEMBERS = [
@@ -44,25 +34,21 @@ OPTIONS = MEMBERS + ["FINISH"]
 # Get the supervisor prompt
 SYSTEM_PROMPT = get_supervisor_prompt(MEMBERS)
 
-# Load the language model
-LLM = load_chat_model("openai/gpt-4o-mini")
-
 class Router(TypedDict):
     """Worker to route to next. If no workers needed, route to FINISH."""
 
     next: Literal[*OPTIONS]
 
 
-# Create all agents
-AGENTS = {
-    "credit_score_checker": create_agent("credit_score_checker", LLM, [check_credit_score]),
-    "background_checker": create_agent("background_checker", LLM, [perform_background_check]),
-    "validate_kyc": create_agent("validate_kyc", LLM, [validate_kyc]),
-    "manual_approver": create_agent("manual_approver", LLM, [manual_approval]),
-    "final_decision": create_agent("final_decision", LLM, [make_final_decision])
-}
+def __getattr__(name: str):
+    """Build LLM and AGENTS on first access; the nodes build agents lazily through get_agent"""
+    if name == "LLM":
+        return get_llm()
+    if name == "AGENTS":
+        return {member: get_agent(member) for member in MEMBERS}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def supervisor_node(state: CreditState) -> Command[Literal[*MEMBERS, "__end__"]]:
+async def supervisor_node(state: CreditState) -> Command[Literal[*MEMBERS, "__end__"]]:
     """
     Supervisor node that decides which agent to call next.
     
@@ -72,59 +58,60 @@ def supervisor_node(state: CreditState) -> Command[Literal[*MEMBERS, "__end__"]]
     Returns:
         Command with the next node to go to
     """
-    # Normalize state.messages to ensure proper message objects
-    if state.messages:
-        state.messages = normalize_messages(state.messages)
-        
     # Create base messages with system prompt
     base_messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
     ]
 
-    # Initialize all_messages if needed
-    if not state.all_messages or len(state.all_messages) == 0:
-        state.all_messages = create_messages(state.messages, True)
-
-    # Combine base messages with converted messages
-    messages = base_messages + reverse_messages(state.all_messages)
+    # Seed the log from the incoming chat messages on the first turn; the chat
+    # reducer has already converted them and untagged messages count as visible.
+    # Later turns replace legacy entries of older checkpoints, once
+    if state.all_messages:
+        upgrade = log_upgrade(state.all_messages)
+        update = {"all_messages": upgrade} if upgrade else {}
+    else:
+        update = {"all_messages": list(state.messages)}
+
+    # Combine base messages with the log
+    messages = base_messages + prepare_messages_for_agent(state)
     
     # Get routing decision from LLM
-    response = LLM.with_structured_output(Router).invoke(messages)
+    response = await get_structured_llm(Router).ainvoke(messages)
     goto = response["next"]
     
     # If FINISH, go to end
     if goto == "FINISH":
-        return Command(goto="__end__")
+        return Command(goto="__end__", update=update)
     
     # Otherwise, go to the specified node
-    return Command(goto=goto)
+    return Command(goto=goto, update=update)
 
 # Create standard node handlers for most agents
 credit_score_node = create_node_handler(
-    AGENTS["credit_score_checker"], 
+    partial(get_agent, "credit_score_checker"), 
     "credit_score_checker", 
     "supervisor"
 )
 
 background_checker_node = create_node_handler(
-    AGENTS["background_checker"], 
+    partial(get_agent, "background_checker"), 
     "background_checker", 
     "manual_approver"
 )
 
 validate_kyc_node = create_node_handler(
-    AGENTS["validate_kyc"], 
+    partial(get_agent, "validate_kyc"), 
     "validate_kyc", 
     "manual_approver"
 )
 
 final_decision_node = create_node_handler(
-    AGENTS["final_decision"], 
+    partial(get_agent, "final_decision"), 
     "final_decision", 
     "supervisor"
 )
 
-def manual_approver_node(state: CreditState) -> Command[Literal["supervisor"]]:
+async def manual_approver_node(state: CreditState) -> Command[Literal["supervisor"]]:
     """
     Manual approver node that requires user intervention.
     This is a custom node that can't use the standard handler.
@@ -135,25 +122,22 @@ def manual_approver_node(state: CreditState) -> Command[Literal["supervisor"]]:
     Returns:
         Command with updated state and next node
     """
-    # Prepare messages for the agent
-    messages_for_llm = prepare_messages_for_agent(state)
-    
     # Interrupt the user for manual approval
     approved = interrupt("Approve the application now?")
     label = "Approved" if approved else "Rejected"
     
     # Create approval message
-    approval_message = FilterableHumanMessage(
+    approval_message = tagged_message(
         content=f"The application is '{label}'", 
         name="final_decision", 
         show_in_chat=False if "manual_approver" in state.filter_tools else True
     )
     
-    # Add approval message to existing messages
-    messages_for_llm = reverse_messages(state.all_messages + [approval_message])
+    # Add approval message to the log the agent reads
+    messages_for_llm = prepare_messages_for_agent(state) + [approval_message]
     
     # Invoke the agent
-    result = AGENTS["manual_approver"].invoke({"messages": messages_for_llm})
+    result = await get_agent("manual_approver").ainvoke({"messages": messages_for_llm})
     
     # Process the result
     messages_result = get_messages(state, result, "manual_approval")
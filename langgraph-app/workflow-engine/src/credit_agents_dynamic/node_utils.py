@@ -3,21 +3,17 @@ Node utilities for the credit approval workflow.
 This module provides common functionality for workflow nodes to reduce duplication.
 """
 
-from typing import List, Union,Callable
-from langchain_core.messages import AIMessage, HumanMessage
+from typing import Any, Awaitable, Callable, List
+from langchain_core.messages import BaseMessage
 from langgraph.types import Command
 
 from credit_agents_dynamic.state import CreditState
-from credit_agents_dynamic.messages import (
-    FilterableHumanMessage, 
-    normalize_messages, 
-    create_messages, 
-    reverse_messages, 
-    filter_messages
-)
+from credit_agents_dynamic.messages import is_visible, llm_view, tagged_message
 
 def get_messages(state: CreditState, result: dict, tool_name: str) -> dict:
-    """Process agent result and update message state
+    """Process agent result into message updates
+    
+    The state's message channels append, so only the new message is returned.
     
     Args:
         state: Current workflow state
@@ -25,30 +21,28 @@ def get_messages(state: CreditState, result: dict, tool_name: str) -> dict:
         tool_name: Name of the tool/agent that generated the result
         
     Returns:
-        Dictionary with all_messages and chat_messages
+        Dictionary with the all_messages and chat_messages to append
     """
     # Create a new message from the agent result
-    new_message = FilterableHumanMessage(
+    new_message = tagged_message(
         content=result["messages"][-1].content, 
         name=tool_name,
         # Set show_in_chat based on whether this tool should be filtered
         show_in_chat=tool_name not in state.filter_tools
     )
     
-    # Add the new message to all existing messages
-    all_messages = state.all_messages + [new_message]
-    
-    # Get messages that should be shown in chat (show_in_chat=True)
-    chat_messages = filter_messages(all_messages, show_in_chat=True)
-    
     return { 
-        "all_messages": all_messages, 
-        "chat_messages": chat_messages 
+        "all_messages": [new_message], 
+        # Only visible messages go to the chat
+        "chat_messages": [new_message] if is_visible(new_message) else []
     }
 
-def prepare_messages_for_agent(state: CreditState) -> List[Union[HumanMessage, AIMessage]]:
+def prepare_messages_for_agent(state: CreditState) -> List[BaseMessage]:
     """
-    Prepare messages for agent invocation by normalizing and converting as needed.
+    Prepare messages for agent invocation.
+    
+    The log is passed as it is; see llm_view. The state is only read: the
+    supervisor seeds the log on its first turn.
     
     Args:
         state: Current workflow state
@@ -56,39 +50,34 @@ def prepare_messages_for_agent(state: CreditState) -> List[Union[HumanMessage, A
     Returns:
         List of messages ready for agent invocation
     """
-    # Normalize state.messages to ensure proper message objects
-    if state.messages:
-        state.messages = normalize_messages(state.messages)
-    
-    # Initialize all_messages if needed
-    if not state.all_messages or len(state.all_messages) == 0:
-        state.all_messages = create_messages(state.messages, True)
-    
-    # Get messages for the LLM (either from state.messages or by converting all_messages back)
-    return state.messages if len(state.all_messages) == 0 else reverse_messages(state.all_messages)
+    if state.all_messages:
+        return llm_view(state.all_messages)
+    # The log has not been seeded yet; use the incoming chat messages
+    return state.messages
 
 def create_node_handler(
-    agent: Callable, 
+    agent: Callable[[], Any], 
     tool_name: str, 
     next_node: str = "supervisor"
-) -> Callable[[CreditState], Command]:
+) -> Callable[[CreditState], Awaitable[Command]]:
     """
     Create a standard node handler for the workflow.
     
     Args:
-        agent: Agent to invoke
+        agent: Returns the agent to invoke; called per run, so agents are
+            only built once a node first runs
         tool_name: Name of the tool/agent
         next_node: Name of the next node to go to
         
     Returns:
         Node handler function
     """
-    def node_handler(state: CreditState) -> Command:
+    async def node_handler(state: CreditState) -> Command:
         # Prepare messages for the agent
         messages_for_llm = prepare_messages_for_agent(state)
         
         # Invoke the agent
-        result = agent.invoke({"messages": messages_for_llm})
+        result = await agent().ainvoke({"messages": messages_for_llm})
         
         # Process the result
         messages = get_messages(state, result, tool_name)
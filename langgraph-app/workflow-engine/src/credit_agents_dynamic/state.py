@@ -1,11 +1,71 @@
+import uuid
 from dataclasses import dataclass, field
-from typing import List, Union
-from langchain_core.messages import AIMessage, HumanMessage
-from credit_agents_dynamic.messages import FilterableHumanMessage, FilterableAIMessage
+from typing import List, Sequence, Union
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    convert_to_messages,
+)
+from langgraph.graph import add_messages
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from typing_extensions import Annotated
+
+
+def append_log(current: List[BaseMessage], update: Union[BaseMessage, Sequence[BaseMessage], None]) -> List[BaseMessage]:
+    """Reducer for the message log: appends the update
+
+    Like any LangGraph reducer it returns a new list, so the log is copied
+    once per step; unlike add_messages, logged entries are not converted or
+    matched by id. The only other update is the one of messages.log_upgrade:
+    a RemoveMessage of all messages followed by the log that replaces them.
+    """
+    if not update:
+        return current
+    if isinstance(update, BaseMessage):
+        update = [update]
+    if isinstance(update[0], RemoveMessage) and update[0].id == REMOVE_ALL_MESSAGES:
+        return list(update[1:])
+    return current + list(update)
+
+def append_chat(
+    current: List[BaseMessage],
+    update: Union[BaseMessage, Sequence[Union[BaseMessage, dict, str]], None]
+) -> List[BaseMessage]:
+    """Reducer for the chat view: appends new messages, replaces or removes by id
+
+    Nodes write messages made by messages.tagged_message, which carry an id;
+    one without an id, such as run input, is appended as a copy with a new id,
+    leaving the caller's object as it is. Removals and messages whose id is
+    already in the chat go through add_messages, so one with the id of a chat
+    message replaces it. Like any LangGraph reducer this returns a new list,
+    so the chat is copied once per step; for plain appends only the ids of
+    the history are read, instead of add_messages converting all of it.
+    """
+    if not update:
+        return current
+    if not isinstance(update, (list, tuple)):
+        update = [update]
+    new_messages = [
+        message if message.id is not None else message.model_copy(update={"id": str(uuid.uuid4())})
+        for message in convert_to_messages(update)
+    ]
+    if any(isinstance(message, RemoveMessage) for message in new_messages):
+        return add_messages(current, new_messages)
+    chat_ids = {message.id for message in current}
+    if any(message.id in chat_ids for message in new_messages):
+        return add_messages(current, new_messages)
+    return current + new_messages
+
 # Define the state for our credit approval workflow
 @dataclass
 class CreditState:
     next: str = "supervisor"
     filter_tools: List[str] = field(default_factory=lambda: ["credit_score_checker", "background_checker"])
-    messages: List[Union[HumanMessage, AIMessage]] = field(default_factory=list)
-    all_messages: List[Union[FilterableHumanMessage, FilterableAIMessage]] = field(default_factory=list)
+    # Both message channels are append-only: nodes return just their new
+    # messages. messages is the chat view, holding the visible log entries;
+    # all_messages is the full log the agents read
+    messages: Annotated[List[Union[HumanMessage, AIMessage]], append_chat] = field(default_factory=list)
+    all_messages: Annotated[List[BaseMessage], append_log] = field(default_factory=list)
@@ -1,28 +1,27 @@
 from langchain_core.tools import tool
-import requests
+from credit_service import get_credit_client
 from typing import Dict, List, Optional, Union, Any
-import os
 
 # API Tools for each agent
-#BASE_URL = "https://fabricate.mockaroo.com/api/v1/databases/credit_demo/api"
-PORT = os.getenv("PORT", 3000) 
-BASE_URL = f"http://localhost:{PORT}"
+# Requests go through the shared credit service client; set CREDIT_SERVICE_URL
+# (or PORT) to point it at another server
 # Authentication token
 AUTH_TOKEN = "46ada160-f07b-4461-9f77-0eb36f383ded"
 AUTH_HEADERS = {"Authorization": f"Bearer {AUTH_TOKEN}"}
 
 # Credit Score Checker Agent tools
 @tool
-def check_credit_score(customer_id: str) -> Dict[str, Any]:
+async def check_credit_score(customer_id: str) -> Dict[str, Any]:
     """Check the credit score for a given customer"""
     """ Parameters:
     - customer_id: str""" 
 
     try:
         print("Checking credit score...\n")
-        response = requests.get(
-            f"{BASE_URL}/credit-check", 
+        response = await get_credit_client().get(
+            "/credit-check", 
             params={"customer_id": customer_id},
+            cache_key=customer_id,
             headers=AUTH_HEADERS
         )
         if response.status_code == 200:
@@ -35,14 +34,15 @@ def check_credit_score(customer_id: str) -> Dict[str, Any]:
 
 # KYC Validator Agent tools
 @tool
-def validate_kyc(customer_id: str) -> Dict[str, Any]:
+async def validate_kyc(customer_id: str) -> Dict[str, Any]:
     """Validate KYC for a given customer"""
     """ Parameters:
     - customer_id: str"""
     try:
-        response = requests.get(
-            f"{BASE_URL}/kyc-check", 
+        response = await get_credit_client().get(
+            "/kyc-check", 
             params={"customer_id": customer_id},
+            cache_key=customer_id,
             headers=AUTH_HEADERS
         )
         if response.status_code == 200:
@@ -54,13 +54,13 @@ def validate_kyc(customer_id: str) -> Dict[str, Any]:
 
 # Income Verifier Agent tools
 @tool
-def verify_income(customer_id: str) -> Dict[str, Any]:
+async def verify_income(customer_id: str) -> Dict[str, Any]:
     """Verify income for a given customer"""
     """ Parameters:
     - customer_id: str"""
     try:
-        response = requests.get(
-            f"{BASE_URL}/income-verification", 
+        response = await get_credit_client().get(
+            "/income-verification", 
             params={"customer_id": customer_id},
             headers=AUTH_HEADERS
         )
@@ -73,14 +73,15 @@ def verify_income(customer_id: str) -> Dict[str, Any]:
 
 # Background Check Agent tools
 @tool
-def perform_background_check(customer_id: str) -> Dict[str, Any]:
+async def perform_background_check(customer_id: str) -> Dict[str, Any]:
     """Perform background check for a given customer"""
     """ Parameters:
     - customer_id: str"""
     try:
-        response = requests.get(
-            f"{BASE_URL}/background-check", 
+        response = await get_credit_client().get(
+            "/background-check", 
             params={"customer_id": customer_id},
+            cache_key=customer_id,
             headers=AUTH_HEADERS
         )
         if response.status_code == 200:
@@ -92,7 +93,7 @@ def perform_background_check(customer_id: str) -> Dict[str, Any]:
 
 # Manual Approver Agent tools
 @tool
-def manual_approval(application_id: str, approve: bool, notes: str) -> Dict[str, Any]:
+async def manual_approval(application_id: str, approve: bool, notes: str) -> Dict[str, Any]:
     """Perform manual approval for a given application"""
     """ Parameters:
     - application_id: str
@@ -102,8 +103,8 @@ def manual_approval(application_id: str, approve: bool, notes: str) -> Dict[str,
         # Convert boolean to integer for SQLite compatibility
         approved_int = 1 if approve else 0
         
-        response = requests.post(
-            f"{BASE_URL}/manual-approval", 
+        response = await get_credit_client().post(
+            "/manual-approval", 
             json={
                 "application_id": application_id, 
                 "approver_name": "AI Agent",
@@ -118,7 +119,7 @@ def manual_approval(application_id: str, approve: bool, notes: str) -> Dict[str,
 
 # Final Decision Agent tools
 @tool
-def make_final_decision(application_id: str, decision: str, reason: str) -> Dict[str, Any]:
+async def make_final_decision(application_id: str, decision: str, reason: str) -> Dict[str, Any]:
     """Make the final decision for a given application"""
     """Parameters:
     - application_id: str
@@ -126,8 +127,8 @@ def make_final_decision(application_id: str, decision: str, reason: str) -> Dict
     - reason: str
     """
     try:
-        response = requests.post(
-            f"{BASE_URL}/final-decision", 
+        response = await get_credit_client().post(
+            "/final-decision", 
             json={
                 "application_id": application_id, 
                 "decision": decision,
@@ -1,7 +1,6 @@
 from typing import Optional
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
 
 def load_chat_model(model_name: str, temperature: float = 0.0) -> BaseChatModel:
     """Load a chat model based on the model name.
@@ -13,6 +12,8 @@ def load_chat_model(model_name: str, temperature: float = 0.0) -> BaseChatModel:
     Returns:
         A chat language model instance
     """
+    # Imported here: the OpenAI client is slow to import and only needed once a model is loaded
+    from langchain_openai import ChatOpenAI
     try:
         # Parse provider and model name
         if "/" in model_name:
@@ -0,0 +1,27 @@
+"""Credit Service Client.
+
+Shared async HTTP client for the credit service used by the credit_agents
+graphs: one keep-alive pool per event loop, per-endpoint timeouts, jittered
+retries and a circuit breaker per endpoint. Credit, KYC and background
+lookups are cached per customer with a TTL per endpoint.
+"""
+
+from credit_service.cache import LookupCache
+from credit_service.client import (
+    CircuitOpenError,
+    CreditServiceClient,
+    CreditServiceError,
+    credit_service_stats,
+    get_credit_client,
+    invalidate_credit_cache,
+)
+
+__all__ = [
+    "get_credit_client",
+    "credit_service_stats",
+    "invalidate_credit_cache",
+    "CreditServiceClient",
+    "CreditServiceError",
+    "CircuitOpenError",
+    "LookupCache",
+]
@@ -0,0 +1,147 @@
+"""Per-customer cache of credit service lookups with an LRU memory tier and an optional SQLite tier."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Tuple
+
+CACHE_ENABLED = os.getenv("CREDIT_CACHE_ENABLED", "true").lower() == "true"
+# Set to a file path to keep lookups across restarts and share them between workers
+CACHE_PATH = os.getenv("CREDIT_CACHE_PATH")
+CACHE_MAX_ENTRIES = int(os.getenv("CREDIT_CACHE_MAX_ENTRIES", "10000"))
+
+
+def _ttl(path: str, default: float) -> float:
+    # /credit-check -> CREDIT_CACHE_TTL_CREDIT_CHECK
+    return float(os.getenv(f"CREDIT_CACHE_TTL_{path.strip('/').replace('-', '_').upper()}", default))
+
+
+# Seconds a lookup stays valid; endpoints not listed are never cached
+ENDPOINT_TTLS = {
+    "/credit-check": _ttl("/credit-check", 24 * 3600),
+    "/kyc-check": _ttl("/kyc-check", 7 * 24 * 3600),
+    "/background-check": _ttl("/background-check", 24 * 3600),
+}
+
+
+class LookupCache:
+    """Successful lookups keyed by (endpoint, customer id), each endpoint with its own TTL.
+
+    The memory tier is an LRU bounded by ``max_entries``; the SQLite tier,
+    when configured, is checked on a memory miss and refills memory on a hit.
+    """
+
+    def __init__(self, path: str | None = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES,
+                 ttls: Dict[str, float] | None = None):
+        """Create the cache, opening or creating the SQLite tier when ``path`` is set."""
+        self.max_entries = max_entries
+        self.ttls = dict(ENDPOINT_TTLS if ttls is None else ttls)
+        self._memory: OrderedDict[Tuple[str, str], Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.counters: Dict[str, Counter] = {}
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    """CREATE TABLE IF NOT EXISTS credit_lookups (
+                        endpoint TEXT NOT NULL,
+                        lookup_key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        expires_at REAL NOT NULL,
+                        PRIMARY KEY (endpoint, lookup_key)
+                    )"""
+                )
+
+    def caches(self, endpoint: str) -> bool:
+        """Whether lookups of an endpoint are cached, i.e. it has a TTL."""
+        return endpoint in self.ttls
+
+    def _count(self, endpoint: str, event: str) -> None:
+        self.counters.setdefault(endpoint, Counter())[event] += 1
+
+    def get(self, endpoint: str, key: str) -> Any | None:
+        """Return a live cached lookup from memory or disk, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get((endpoint, key))
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end((endpoint, key))
+                    self._count(endpoint, "memory_hits")
+                    return entry[1]
+                del self._memory[(endpoint, key)]
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM credit_lookups WHERE endpoint = ? AND lookup_key = ? AND expires_at > ?",
+                    (endpoint, key, now),
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember((endpoint, key), row[1], value)
+                    self._count(endpoint, "disk_hits")
+                    return value
+            self._count(endpoint, "misses")
+            return None
+
+    def put(self, endpoint: str, key: str, value: Any) -> None:
+        """Store a lookup with its endpoint TTL in memory and on disk; uncached endpoints are ignored."""
+        if not self.caches(endpoint):
+            return
+        expires_at = time.time() + self.ttls[endpoint]
+        with self._lock:
+            self._remember((endpoint, key), expires_at, value)
+            self._count(endpoint, "stores")
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO credit_lookups (endpoint, lookup_key, value, expires_at) VALUES (?, ?, ?, ?)",
+                        (endpoint, key, json.dumps(value), expires_at),
+                    )
+
+    def _remember(self, memory_key: Tuple[str, str], expires_at: float, value: Any) -> None:
+        self._memory[memory_key] = (expires_at, value)
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate(self, key: str | None = None, endpoint: str | None = None) -> int:
+        """Drop cached lookups for a customer, an endpoint, both, or everything; returns how many were in memory."""
+        with self._lock:
+            doomed = [
+                memory_key for memory_key in self._memory
+                if (endpoint is None or memory_key[0] == endpoint) and (key is None or memory_key[1] == key)
+            ]
+            for memory_key in doomed:
+                del self._memory[memory_key]
+            if self._conn is not None:
+                clauses, args = [], []
+                if endpoint is not None:
+                    clauses.append("endpoint = ?")
+                    args.append(endpoint)
+                if key is not None:
+                    clauses.append("lookup_key = ?")
+                    args.append(key)
+                where = " WHERE " + " AND ".join(clauses) if clauses else ""
+                with self._conn:
+                    self._conn.execute(f"DELETE FROM credit_lookups{where}", args)
+            for endpoint_name in {memory_key[0] for memory_key in doomed}:
+                self._count(endpoint_name, "invalidations")
+            return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return sizes, TTLs and per-endpoint hit counters."""
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "durable": self._conn is not None,
+                "ttls": self.ttls,
+                "endpoints": {endpoint: dict(counts) for endpoint, counts in self.counters.items()},
+            }
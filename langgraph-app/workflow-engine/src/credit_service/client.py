@@ -0,0 +1,265 @@
+"""Async HTTP client for the credit service with pooling, retries and circuit breaking."""
+
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Tuple
+
+import httpx
+
+from credit_service.cache import CACHE_ENABLED, LookupCache
+
+BASE_URL = os.getenv("CREDIT_SERVICE_URL", f"http://localhost:{os.getenv('PORT', 3000)}")
+POOL_SIZE = int(os.getenv("CREDIT_SERVICE_POOL_SIZE", "200"))
+POOL_KEEPALIVE = int(os.getenv("CREDIT_SERVICE_POOL_KEEPALIVE", "50"))
+DEFAULT_TIMEOUT = float(os.getenv("CREDIT_SERVICE_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("CREDIT_SERVICE_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("CREDIT_SERVICE_BACKOFF", "0.2"))
+BACKOFF_CAP = 5.0
+# Consecutive failures that open an endpoint's circuit, and how long it stays open
+BREAKER_THRESHOLD = int(os.getenv("CREDIT_SERVICE_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("CREDIT_SERVICE_BREAKER_RESET", "30"))
+
+# Read timeouts per endpoint; bureau-backed checks are slower than local writes
+ENDPOINT_TIMEOUTS = {
+    "/credit-check": 5.0,
+    "/kyc-check": 10.0,
+    "/income-verification": 10.0,
+    "/background-check": 15.0,
+    "/application": 5.0,
+    "/manual-approval": 10.0,
+    "/final-decision": 10.0,
+}
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class CreditServiceError(Exception):
+    """The credit service could not be reached."""
+
+
+class CircuitOpenError(CreditServiceError):
+    """Calls to an endpoint are short-circuited after repeated failures."""
+
+
+class CircuitBreaker:
+    """Open after ``threshold`` consecutive failures; after ``reset_after`` seconds let one trial call through."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_after: float = BREAKER_RESET):
+        """Start closed, with no failures recorded."""
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """``closed``, ``open``, or ``half_open`` once ``reset_after`` has passed since it opened."""
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through; in the half-open state only one trial call is admitted."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """End an admitted call that produced no result, e.g. cancelled, without counting it."""
+        with self._lock:
+            self._trial = False
+
+    def record(self, ok: bool) -> None:
+        """Close the circuit after a success, or count a failure and open it at the threshold."""
+        with self._lock:
+            self._trial = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class CreditServiceClient:
+    """Pooled async client shared by every credit graph in the process.
+
+    GET requests are retried on connection errors, timeouts and 429/5xx
+    responses with jittered exponential backoff; POST requests are only
+    retried when the connection failed before the request was sent. Each
+    endpoint has its own circuit breaker, so a failing bureau check does not
+    stall the others. HTTP error statuses are returned, not raised, so
+    callers keep handling 404 and friends themselves.
+
+    GETs made with a ``cache_key`` are answered from the lookup cache while
+    the endpoint's TTL lasts; only 200 responses are stored.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, max_retries: int = MAX_RETRIES,
+                 cache: LookupCache | None = None):
+        """Create a client for ``base_url``; pools are opened lazily per event loop."""
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.cache = cache if cache is not None else (LookupCache() if CACHE_ENABLED else None)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # httpx pools are bound to the event loop that opened them
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "retries": 0, "failures": 0, "short_circuited": 0}
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(loop)
+                if client is None:
+                    client = self._clients[loop] = httpx.AsyncClient(
+                        base_url=self.base_url,
+                        limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_KEEPALIVE),
+                        timeout=DEFAULT_TIMEOUT,
+                    )
+        return client
+
+    def breaker(self, path: str) -> CircuitBreaker:
+        """Return the circuit breaker of an endpoint, creating it on first use."""
+        breaker = self._breakers.get(path)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(path, CircuitBreaker())
+        return breaker
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a request to the credit service.
+
+        Args:
+            method: HTTP method.
+            path: Endpoint path, e.g. ``/credit-check``.
+            **kwargs: Passed to ``httpx.AsyncClient.request`` (params, json, headers).
+
+        Raises:
+            CircuitOpenError: The endpoint's circuit is open.
+            CreditServiceError: The request failed after all retries.
+        """
+        breaker = self.breaker(path)
+        if not breaker.allow():
+            self.counters["short_circuited"] += 1
+            raise CircuitOpenError(f"Circuit open for {path}, retry in {breaker.reset_after:.0f}s")
+
+        kwargs.setdefault("timeout", httpx.Timeout(ENDPOINT_TIMEOUTS.get(path, DEFAULT_TIMEOUT), connect=3.0))
+        self.counters["requests"] += 1
+        # Every admitted call ends in record() or release(), so a half-open trial
+        # that is cancelled or raises unexpectedly does not keep the circuit shut
+        outcome: bool | None = None
+        try:
+            response, outcome = await self._send(method, path, **kwargs)
+            return response
+        except CreditServiceError:
+            outcome = False
+            self.counters["failures"] += 1
+            raise
+        finally:
+            if outcome is None:
+                breaker.release()
+            else:
+                breaker.record(outcome)
+
+    async def _send(self, method: str, path: str, **kwargs: Any) -> Tuple[httpx.Response, bool]:
+        """Send with retries; return the response and whether it counts as a success for the breaker."""
+        idempotent = method.upper() in ("GET", "HEAD")
+        for attempt in range(self.max_retries + 1):
+            last = attempt == self.max_retries
+            try:
+                response = await self._client().request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                error: Exception = e
+            except httpx.TransportError as e:
+                # The request may have reached the service, so only reads are retried
+                if not idempotent:
+                    raise CreditServiceError(f"{method} {path} failed: {e!r}") from e
+                error = e
+            else:
+                if idempotent and response.status_code in RETRY_STATUSES and not last:
+                    error = CreditServiceError(f"{method} {path} returned {response.status_code}")
+                else:
+                    return response, response.status_code < 500
+            if last:
+                raise CreditServiceError(f"{method} {path} failed after {attempt + 1} attempts: {error!r}") from error
+            self.counters["retries"] += 1
+            # Full jitter keeps hundreds of concurrent runs from retrying in lockstep
+            await asyncio.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+        raise AssertionError("unreachable")
+
+    async def get(self, path: str, cache_key: str | None = None, **kwargs: Any) -> httpx.Response:
+        """GET an endpoint, going through the lookup cache when ``cache_key`` (the customer id) is given."""
+        if cache_key is None or self.cache is None or not self.cache.caches(path):
+            return await self.request("GET", path, **kwargs)
+        cached = self.cache.get(path, cache_key)
+        if cached is not None:
+            return httpx.Response(200, json=cached, request=httpx.Request("GET", self.base_url + path))
+        response = await self.request("GET", path, **kwargs)
+        if response.status_code == 200:
+            try:
+                self.cache.put(path, cache_key, response.json())
+            except ValueError:
+                pass
+        return response
+
+    async def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        """POST to an endpoint; see request()."""
+        return await self.request("POST", path, **kwargs)
+
+    def invalidate(self, customer_id: str | None = None, path: str | None = None) -> int:
+        """Forget cached lookups for a customer and/or endpoint; with no arguments, forget all of them."""
+        return self.cache.invalidate(customer_id, path) if self.cache is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request counters, breaker states and cache stats."""
+        return {
+            "base_url": self.base_url,
+            **self.counters,
+            "breakers": {path: {"state": b.state, "failures": b.failures} for path, b in self._breakers.items()},
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the current event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_default: CreditServiceClient | None = None
+_default_lock = threading.Lock()
+
+
+def get_credit_client() -> CreditServiceClient:
+    """Return the process-wide credit service client."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = CreditServiceClient()
+    return _default
+
+
+def credit_service_stats() -> Dict[str, Any]:
+    """Return the stats of the process-wide client."""
+    return get_credit_client().stats()
+
+
+def invalidate_credit_cache(customer_id: str | None = None, path: str | None = None) -> int:
+    """Forget cached lookups of the process-wide client; see CreditServiceClient.invalidate()."""
+    return get_credit_client().invalidate(customer_id, path)
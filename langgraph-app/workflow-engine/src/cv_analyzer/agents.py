@@ -1,13 +1,20 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from typing_extensions import TypedDict
+from langchain_core.embeddings import Embeddings
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_openai import ChatOpenAI
-import PyPDF2
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from model_registry import get_chat_model, response_cache
+from cv_analyzer.ingestion import TextCache, iter_pdf_texts
+from cv_analyzer.search import SHORTLIST_SIZE, CandidateIndex, compact_profile, get_embeddings, shortlist
 import os
 import json
 from pathlib import Path
 
+# Shared request budget for all cv_analyzer LLM calls; 0 disables throttling
+REQUESTS_PER_SECOND = float(os.getenv("CV_ANALYZER_REQUESTS_PER_SECOND", "0"))
+RATE_LIMITER = InMemoryRateLimiter(requests_per_second=REQUESTS_PER_SECOND) if REQUESTS_PER_SECOND > 0 else None
+
 class CVData(TypedDict):
     file_name: str
     content: str
@@ -21,48 +28,37 @@ class JobRequirements(TypedDict):
     key_responsibilities: List[str]
 
 class CVReaderAgent:
-    def __init__(self):
-        pass
+    def __init__(self, text_cache: Optional[TextCache] = None):
+        self.text_cache = text_cache or TextCache()
 
-    def process(self, cv_folder_path: str) -> List[CVData]:
-        cv_data_list = []
+    def stream(self, cv_folder_path: str) -> Iterator[CVData]:
+        """Yield CVs as their text becomes available, cached ones first."""
         folder_path = Path(cv_folder_path)
         
         if not folder_path.exists():
             print(f"Error: Folder {folder_path} does not exist")
-            return cv_data_list
+            return
             
         if not folder_path.is_dir():
             print(f"Error: {folder_path} is not a directory")
-            return cv_data_list
+            return
 
-        # Get all PDF files in the folder
-        pdf_files = list(folder_path.glob("*.pdf"))
-        print(f"Found {len(pdf_files)} PDF files in {folder_path}")
+        print(f"Found {len(list(folder_path.glob('*.pdf')))} PDF files in {folder_path}")
 
-        for file_path in pdf_files:
-            try:
-                with open(file_path, "rb") as file:
-                    reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text()
-                    
-                    cv_data_list.append(CVData(
-                        file_name=file_path.name,
-                        content=text,
-                        extracted_info=None,
-                        score=None
-                    ))
-                    print(f"Successfully processed {file_path.name}")
-            except Exception as e:
-                print(f"Error processing {file_path.name}: {str(e)}")
-
-        return cv_data_list
+        for file_name, text in iter_pdf_texts(folder_path, self.text_cache):
+            yield CVData(
+                file_name=file_name,
+                content=text,
+                extracted_info=None,
+                score=None
+            )
+
+    def process(self, cv_folder_path: str) -> List[CVData]:
+        return sorted(self.stream(cv_folder_path), key=lambda cv_data: cv_data["file_name"])
 
 class JobDescriptionAnalyzerAgent:
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini")
+        self.llm = get_chat_model("openai/gpt-4o-mini", cache=response_cache("cv_analyzer"), rate_limiter=RATE_LIMITER)
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", """You are an expert job description analyzer. Your task is to extract key information from job descriptions and provide meaningful insights even when the description is sparse or unclear.
 
@@ -159,7 +155,7 @@ Never return empty arrays. If information is unclear, provide reasonable industr
 
 class CVInformationExtractorAgent:
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini")
+        self.llm = get_chat_model("openai/gpt-4o-mini", cache=response_cache("cv_analyzer"), rate_limiter=RATE_LIMITER)
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", """You are an expert CV analyzer. Your task is to carefully extract key information from the CV text.
 You must return a valid JSON object with exactly these keys and formats:
@@ -250,7 +246,7 @@ Important rules:
 
 class CandidateRankerAgent:
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini")
+        self.llm = get_chat_model("openai/gpt-4o-mini", cache=response_cache("cv_analyzer"), rate_limiter=RATE_LIMITER)
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", """You are an expert candidate evaluator. Compare the candidate's profile against the job 
 requirements and provide a score from 0-100 along with a brief explanation of the match.
@@ -277,34 +273,56 @@ Format your response as a JSON object:
         return cv_data
 
 class UserQueryAgent:
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini")
+    def __init__(self, embeddings: Optional[Embeddings] = None, shortlist_size: int = SHORTLIST_SIZE):
+        self.llm = get_chat_model("openai/gpt-4o-mini", cache=response_cache("cv_analyzer"), rate_limiter=RATE_LIMITER)
+        self.embeddings = embeddings
+        self.shortlist_size = shortlist_size
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", """You are an expert at refining candidate searches based on user queries. 
-Analyze the query and adjust candidate rankings accordingly. Return a JSON object with the explanation:
+You are given a shortlist of candidates retrieved for the query, best match first.
+Analyze the query and adjust the shortlist ranking accordingly. Return a JSON object with the explanation
+and the shortlisted file names in your preferred order:
 {{
-    "explanation": "Explanation of ranking adjustment"
+    "explanation": "Explanation of ranking adjustment",
+    "ranking": ["file_name1", "file_name2"]
 }}"""),
             MessagesPlaceholder(variable_name="chat_history"),
-            ("human", "{query}")
+            ("human", "{query}\n\nShortlisted candidates:\n{shortlist}")
         ])
         self.chat_history = []
 
-    def process(self, query: str, candidates: List[CVData]) -> List[CVData]:
-        self.chat_history.append(HumanMessage(content=query))
+    def process(
+        self, query: str, candidates: List[CVData], index: Optional[CandidateIndex] = None
+    ) -> Tuple[List[CVData], CandidateIndex]:
+        """Re-rank candidates for a follow-up query.
+
+        Only the top-k candidates retrieved from the index are sent to the LLM;
+        the index is updated with any new candidates and returned for the next turn.
+        """
+        embeddings = self.embeddings or get_embeddings()
+        index = index or CandidateIndex()
+        index.update(candidates, embeddings)
+        shortlisted = shortlist(query, candidates, index, embeddings, self.shortlist_size)
+
         chain = self.prompt | self.llm
         result = chain.invoke({
             "chat_history": self.chat_history,
-            "query": query
+            "query": query,
+            "shortlist": "\n".join(compact_profile(cv_data) for cv_data in shortlisted)
         })
+        self.chat_history.append(HumanMessage(content=query))
         try:
             response = json.loads(result.content)
             self.chat_history.append(AIMessage(content=response["explanation"]))
-        except json.JSONDecodeError as e:
+            order = {name: i for i, name in enumerate(response.get("ranking", []))}
+            shortlisted = sorted(shortlisted, key=lambda x: order.get(x["file_name"], len(order)))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
             print(f"Error parsing query response: {e}")
             self.chat_history.append(AIMessage(content=result.content))
-        
-        return sorted(candidates, key=lambda x: x["score"] or 0, reverse=True)
+
+        names = {cv_data["file_name"] for cv_data in shortlisted}
+        rest = sorted((x for x in candidates if x["file_name"] not in names), key=lambda x: x["score"] or 0, reverse=True)
+        return shortlisted + rest, index
 
 class OutputFormatterAgent:
     def __init__(self, output_format: str = "text"):
@@ -1,7 +1,10 @@
-from typing import Annotated, Sequence, List, Dict, Any
+import functools
+import logging
+import os
+from typing import Annotated, List, Dict, Any, Optional
 from typing_extensions import TypedDict
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import BaseMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 
 from cv_analyzer.agents import (
     CVReaderAgent,
@@ -13,20 +16,40 @@ from cv_analyzer.agents import (
     CVData,
     JobRequirements,
 )
+from cv_analyzer.search import CandidateIndex
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on CVs screened at the same time; LLM calls are additionally
+# throttled by CV_ANALYZER_REQUESTS_PER_SECOND in the agents
+MAX_CONCURRENCY = int(os.getenv("CV_ANALYZER_MAX_CONCURRENCY", "8"))
+
+def collect(existing: Optional[list], update: Optional[list]) -> list:
+    """Append results from parallel branches; an update of None starts a new batch."""
+    if update is None:
+        return []
+    return (existing or []) + update
 
 class CVScreeningState(TypedDict, total=False):
     cv_folder_path: str
     job_description: str
     cv_data_list: List[CVData]
     job_requirements: JobRequirements
+    screened_cvs: Annotated[List[CVData], collect]
+    failed_cvs: Annotated[List[Dict[str, str]], collect]
     ranked_candidates: List[CVData]
+    candidate_index: Dict[str, Any]
     user_query: str
     output: str
     should_continue: bool
 
-def create_cv_screening_graph() -> StateGraph:
-    # Initialize agents
-    cv_reader = CVReaderAgent()
+class CVTask(TypedDict):
+    cv_data: CVData
+    job_requirements: JobRequirements
+
+def create_cv_screening_graph(max_concurrency: int = MAX_CONCURRENCY) -> StateGraph:
+    # Initialize agents; the CV reader opens its on-disk text cache on the first run, not at import
+    cv_reader = functools.cache(CVReaderAgent)
     job_analyzer = JobDescriptionAnalyzerAgent()
     cv_extractor = CVInformationExtractorAgent()
     candidate_ranker = CandidateRankerAgent()
@@ -36,49 +59,73 @@ def create_cv_screening_graph() -> StateGraph:
     # Define the workflow graph
     workflow = StateGraph(CVScreeningState)
 
-    # Node 1: Read CVs
+    # Nodes return only the keys they change, so the collected lists are not re-appended
+
+    # Node 1: Read all CVs, cached ones first, then the rest as the process pool
+    # parses them. The node returns once every PDF is read, so screening starts
+    # after parsing; the overlap is with the job analysis, not per CV
     def read_cvs(state: CVScreeningState) -> CVScreeningState:
-        state["cv_data_list"] = cv_reader.process(state["cv_folder_path"])
-        return state
+        return {
+            "cv_data_list": list(cv_reader().stream(state["cv_folder_path"])),
+            "screened_cvs": None,
+            "failed_cvs": None,
+        }
 
     # Node 2: Analyze Job Description
     def analyze_job(state: CVScreeningState) -> CVScreeningState:
-        state["job_requirements"] = job_analyzer.process(state["job_description"])
-        return state
-
-    # Node 3: Extract CV Information
-    def extract_cv_info(state: CVScreeningState) -> CVScreeningState:
-        for i, cv_data in enumerate(state["cv_data_list"]):
-            state["cv_data_list"][i] = cv_extractor.process(cv_data)
-        return state
-
-    # Node 4: Rank Candidates
-    def rank_candidates(state: CVScreeningState) -> CVScreeningState:
-        ranked_candidates = []
-        for cv_data in state["cv_data_list"]:
-            ranked_cv = candidate_ranker.process(cv_data, state["job_requirements"])
-            ranked_candidates.append(ranked_cv)
-        
-        state["ranked_candidates"] = sorted(
-            ranked_candidates,
-            key=lambda x: x["score"] or 0,
-            reverse=True
-        )
-        return state
+        return {"job_requirements": job_analyzer.process(state["job_description"])}
+
+    # Join point of reading CVs and analyzing the job, which run in parallel
+    def start_screening(state: CVScreeningState) -> CVScreeningState:
+        return {}
+
+    # Fan out one screening task per CV
+    def dispatch_cvs(state: CVScreeningState):
+        if not state.get("cv_data_list"):
+            return "merge_rankings"
+        return [
+            Send("screen_cv", {"cv_data": cv_data, "job_requirements": state["job_requirements"]})
+            for cv_data in state["cv_data_list"]
+        ]
+
+    # Node 3: Extract and rank a single CV
+    def screen_cv(task: CVTask) -> CVScreeningState:
+        cv_data = dict(task["cv_data"])
+        try:
+            cv_data = cv_extractor.process(cv_data)
+            cv_data = candidate_ranker.process(cv_data, task["job_requirements"])
+        except Exception as e:
+            # Keep the rest of the batch; the CV is reported and ranked last
+            logger.warning("Error screening %s: %s", cv_data["file_name"], e)
+            return {
+                "screened_cvs": [{**cv_data, "score": None}],
+                "failed_cvs": [{"file_name": cv_data["file_name"], "error": str(e)}],
+            }
+        return {"screened_cvs": [cv_data]}
+
+    # Node 4: Merge the parallel results and rank candidates
+    def merge_rankings(state: CVScreeningState) -> CVScreeningState:
+        screened = state.get("screened_cvs") or []
+        by_name = {cv_data["file_name"]: cv_data for cv_data in screened}
+        return {
+            "cv_data_list": [by_name.get(cv_data["file_name"], cv_data) for cv_data in state.get("cv_data_list", [])],
+            "ranked_candidates": sorted(screened, key=lambda x: x["score"] or 0, reverse=True),
+        }
 
-    # Node 5: Process User Query
+    # Node 5: Process User Query against the thread's candidate index
     def process_user_query(state: CVScreeningState) -> CVScreeningState:
-        if state.get("user_query"):
-            state["ranked_candidates"] = user_query_agent.process(
-                state["user_query"],
-                state["ranked_candidates"]
-            )
-        return state
+        if not state.get("user_query"):
+            return {}
+        ranked_candidates, index = user_query_agent.process(
+            state["user_query"],
+            state["ranked_candidates"],
+            CandidateIndex(state.get("candidate_index"))
+        )
+        return {"ranked_candidates": ranked_candidates, "candidate_index": index.to_state()}
 
     # Node 6: Format Output
     def format_output(state: CVScreeningState) -> CVScreeningState:
-        state["output"] = output_formatter.process(state["ranked_candidates"])
-        return state
+        return {"output": output_formatter.process(state["ranked_candidates"])}
 
     # Conditional: Check if should continue
     def should_continue(state: CVScreeningState) -> str:
@@ -88,17 +135,20 @@ def create_cv_screening_graph() -> StateGraph:
     # Add nodes to the graph
     workflow.add_node("read_cvs", read_cvs)
     workflow.add_node("analyze_job", analyze_job)
-    workflow.add_node("extract_cv_info", extract_cv_info)
-    workflow.add_node("rank_candidates", rank_candidates)
+    workflow.add_node("start_screening", start_screening)
+    workflow.add_node("screen_cv", screen_cv)
+    workflow.add_node("merge_rankings", merge_rankings)
     workflow.add_node("process_user_query", process_user_query)
     workflow.add_node("format_output", format_output)
 
     # Define the edges
-    workflow.set_entry_point("read_cvs")
-    workflow.add_edge("read_cvs", "analyze_job")
-    workflow.add_edge("analyze_job", "extract_cv_info")
-    workflow.add_edge("extract_cv_info", "rank_candidates")
-    workflow.add_edge("rank_candidates", "process_user_query")
+    # PDF parsing overlaps the job description LLM call
+    workflow.add_edge(START, "read_cvs")
+    workflow.add_edge(START, "analyze_job")
+    workflow.add_edge(["read_cvs", "analyze_job"], "start_screening")
+    workflow.add_conditional_edges("start_screening", dispatch_cvs, ["screen_cv", "merge_rankings"])
+    workflow.add_edge("screen_cv", "merge_rankings")
+    workflow.add_edge("merge_rankings", "process_user_query")
     workflow.add_edge("process_user_query", "format_output")
 
     # Add conditional branching for user queries
@@ -111,7 +161,8 @@ def create_cv_screening_graph() -> StateGraph:
         }
     )
 
-    return workflow.compile()
+    # Parallel screen_cv branches share this bound
+    return workflow.compile().with_config({"max_concurrency": max_concurrency})
 
 def run_cv_screening(
     cv_folder_path: str,
@@ -144,6 +195,8 @@ def run_cv_screening(
             "qualifications": [],
             "key_responsibilities": []
         },
+        "screened_cvs": [],
+        "failed_cvs": [],
         "ranked_candidates": [],
         "user_query": user_query,
         "output": "",
@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import PyPDF2
+
+TEXT_CACHE_PATH = os.getenv("CV_ANALYZER_TEXT_CACHE", ".langgraph_api/cv_text_cache.db")
+PDF_WORKERS = int(os.getenv("CV_ANALYZER_PDF_WORKERS", "0")) or os.cpu_count() or 1
+
+logger = logging.getLogger(__name__)
+
+
+def extract_pdf_text(path: str) -> str:
+    """Extract the text of every page of a PDF. Runs in worker processes."""
+    with open(path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        return "".join(page.extract_text() or "" for page in reader.pages)
+
+
+def file_fingerprint(path: Path) -> str:
+    """Key a file by path, size, mtime and content hash."""
+    stat = path.stat()
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return hashlib.sha256(
+        f"{path.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}\0{digest.hexdigest()}".encode()
+    ).hexdigest()
+
+
+class TextCache:
+    """Extracted PDF text on disk, so unchanged files are never parsed twice."""
+
+    def __init__(self, path: str = TEXT_CACHE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cv_text (fingerprint TEXT PRIMARY KEY, file_name TEXT, content TEXT)"
+            )
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM cv_text WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, fingerprint: str, file_name: str, content: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cv_text (fingerprint, file_name, content) VALUES (?, ?, ?)",
+                (fingerprint, file_name, content),
+            )
+
+
+def iter_pdf_texts(
+    folder_path: Path, cache: Optional[TextCache] = None, workers: int = PDF_WORKERS
+) -> Iterator[Tuple[str, str]]:
+    """Yield (file name, text) for each PDF in a folder as soon as it is available.
+
+    Cached files are yielded first without parsing; the rest are parsed in a
+    process pool and yielded in completion order. Files that fail to parse are
+    reported and skipped.
+    """
+    pending = []
+    for file_path in sorted(folder_path.glob("*.pdf")):
+        try:
+            fingerprint = file_fingerprint(file_path)
+        except OSError as e:
+            logger.warning("Error processing %s: %s", file_path.name, e)
+            continue
+        content = cache.get(fingerprint) if cache is not None else None
+        if content is not None:
+            yield file_path.name, content
+        else:
+            pending.append((file_path, fingerprint))
+
+    def parsed(file_path: Path, fingerprint: str, content: str) -> Tuple[str, str]:
+        if cache is not None:
+            cache.put(fingerprint, file_path.name, content)
+        logger.info("Successfully processed %s", file_path.name)
+        return file_path.name, content
+
+    # A pool only pays for itself when there is more than one file to parse
+    if len(pending) <= 1 or workers <= 1:
+        for file_path, fingerprint in pending:
+            try:
+                yield parsed(file_path, fingerprint, extract_pdf_text(str(file_path)))
+            except Exception as e:
+                logger.warning("Error processing %s: %s", file_path.name, e)
+        return
+
+    # Spawned workers do not inherit the server's threads and locks, which a forked child could deadlock on
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=spawn) as pool:
+        futures = {pool.submit(extract_pdf_text, str(file_path)): (file_path, fingerprint)
+                   for file_path, fingerprint in pending}
+        for future in as_completed(futures):
+            file_path, fingerprint = futures[future]
+            try:
+                yield parsed(file_path, fingerprint, future.result())
+            except Exception as e:
+                logger.warning("Error processing %s: %s", file_path.name, e)
@@ -0,0 +1,115 @@
+import base64
+import hashlib
+import json
+import os
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from model_registry import cosine_similarity
+
+EMBEDDINGS_MODEL = os.getenv("CV_ANALYZER_EMBEDDINGS", "openai:text-embedding-3-small")
+SHORTLIST_SIZE = int(os.getenv("CV_ANALYZER_SHORTLIST", "10"))
+
+# Weight of query similarity against the screening score when re-ranking the shortlist
+SIMILARITY_WEIGHT = 0.7
+
+_embeddings: Optional[Embeddings] = None
+
+
+def get_embeddings() -> Embeddings:
+    global _embeddings
+    if _embeddings is None:
+        from langchain.embeddings import init_embeddings
+
+        _embeddings = init_embeddings(EMBEDDINGS_MODEL)
+    return _embeddings
+
+
+def profile_text(cv_data: Dict[str, Any]) -> str:
+    """Text embedded for a candidate: the extracted profile, not the raw CV."""
+    info = cv_data.get("extracted_info") or {}
+    return "\n".join([
+        info.get("profile_summary", ""),
+        "Skills: " + ", ".join(info.get("skills", [])),
+        "Experience: " + "; ".join(info.get("experience", [])),
+        "Education: " + "; ".join(info.get("education", [])),
+    ])
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class CandidateIndex:
+    """Vector index over a screening's candidates, stored in graph state between turns.
+
+    Entries are keyed by file name and carry a fingerprint of the embedded text,
+    so updating the index only embeds candidates that are new or changed.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.model = EMBEDDINGS_MODEL
+        # Vectors from a different embedding model are not comparable, so start over
+        same_model = data.get("model") == EMBEDDINGS_MODEL
+        self.entries: Dict[str, Dict[str, str]] = dict(data.get("entries", {})) if same_model else {}
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"model": self.model, "entries": self.entries}
+
+    def update(self, candidates: List[Dict[str, Any]], embeddings: Embeddings) -> int:
+        """Embed new or changed candidates in one batch; returns how many were embedded."""
+        stale = []
+        for cv_data in candidates:
+            text = profile_text(cv_data)
+            entry = self.entries.get(cv_data["file_name"])
+            if entry is None or entry["fingerprint"] != _fingerprint(text):
+                stale.append((cv_data["file_name"], text))
+        if stale:
+            vectors = embeddings.embed_documents([text for _, text in stale])
+            for (file_name, text), vector in zip(stale, vectors):
+                self.entries[file_name] = {
+                    "fingerprint": _fingerprint(text),
+                    "vector": base64.b64encode(array("f", vector).tobytes()).decode(),
+                }
+        return len(stale)
+
+    def search(self, query_vector: List[float]) -> List[Tuple[str, float]]:
+        """Return (file name, cosine similarity) pairs, most similar first."""
+        scored = [
+            (file_name, cosine_similarity(query_vector, array("f", base64.b64decode(entry["vector"]))))
+            for file_name, entry in self.entries.items()
+        ]
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+
+def shortlist(
+    query: str,
+    candidates: List[Dict[str, Any]],
+    index: CandidateIndex,
+    embeddings: Embeddings,
+    k: int = SHORTLIST_SIZE,
+) -> List[Dict[str, Any]]:
+    """Retrieve the top-k candidates for a query and re-rank them by similarity and score."""
+    by_name = {cv_data["file_name"]: cv_data for cv_data in candidates}
+    hits = [(name, sim) for name, sim in index.search(embeddings.embed_query(query)) if name in by_name][:k]
+
+    def blended(hit: Tuple[str, float]) -> float:
+        score = (by_name[hit[0]].get("score") or 0) / 100
+        return SIMILARITY_WEIGHT * hit[1] + (1 - SIMILARITY_WEIGHT) * score
+
+    return [by_name[name] for name, _ in sorted(hits, key=blended, reverse=True)]
+
+
+def compact_profile(cv_data: Dict[str, Any]) -> str:
+    """Serialize just what the LLM needs to judge a shortlisted candidate."""
+    info = cv_data.get("extracted_info") or {}
+    return json.dumps({
+        "file_name": cv_data["file_name"],
+        "score": cv_data.get("score"),
+        "skills": info.get("skills", []),
+        "experience": info.get("experience", []),
+        "profile_summary": info.get("profile_summary", ""),
+    })
@@ -1,13 +1,13 @@
 from dataclasses import dataclass
 from langgraph.graph import END, StateGraph
-from langchain_openai import ChatOpenAI
+from model_registry import get_chat_model, response_cache
 from langchain.schema import BaseOutputParser
 from langchain.prompts import PromptTemplate
 from typing import Optional
 import os
 import sqlite3
 from langgraph.checkpoint.sqlite import SqliteSaver
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.4)
+llm = get_chat_model("openai/gpt-4o-mini", temperature=0.4, cache=response_cache("design_doc_generator"))
 
 @dataclass
 class DesignState:
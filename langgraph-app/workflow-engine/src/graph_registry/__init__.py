@@ -0,0 +1,25 @@
+"""Lazy loading and import-time budgets for the graphs of langgraph.json."""
+
+from graph_registry.budget import (
+    ImportMeasurement,
+    check_import_budgets,
+    format_report,
+    load_budgets,
+)
+from graph_registry.registry import (
+    GraphRegistry,
+    GraphSpec,
+    get_graph_registry,
+    graph_registry_stats,
+)
+
+__all__ = [
+    "GraphRegistry",
+    "GraphSpec",
+    "ImportMeasurement",
+    "check_import_budgets",
+    "format_report",
+    "get_graph_registry",
+    "graph_registry_stats",
+    "load_budgets",
+]
@@ -0,0 +1,62 @@
+"""Command line for the graph registry.
+
+    python -m graph_registry report            # fails when a graph import is over budget
+    python -m graph_registry lazy-config       # langgraph.json with lazy graph factories
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from graph_registry.budget import check_import_budgets, format_report
+from graph_registry.registry import CONFIG_PATH
+
+SERVER_MODULE = "./src/graph_registry/server.py"
+
+
+def lazy_config(config_path: str) -> dict:
+    """Return the langgraph.json at config_path with every graph served by graph_registry.server."""
+    with open(config_path, encoding="utf-8") as file:
+        config = json.load(file)
+    config["graphs"] = {name: f"{SERVER_MODULE}:{name}" for name in config.get("graphs", {})}
+    return config
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m graph_registry")
+    parser.add_argument("--config", default=CONFIG_PATH, help="langgraph.json to read")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="measure graph import times against their budgets")
+    report.add_argument("--graph", action="append", dest="graphs", help="graph to check; repeatable, all by default")
+    report.add_argument("--budget", type=float, help="budget in seconds for every graph, overriding pyproject.toml")
+    report.add_argument("--repeat", type=int, default=1, help="imports per graph, the fastest counts")
+    report.add_argument("--json", action="store_true", help="print the measurements as JSON")
+
+    lazy = commands.add_parser("lazy-config", help="print a langgraph.json that loads graphs on first use")
+    lazy.add_argument("--output", help="write to this file instead of stdout")
+
+    args = parser.parse_args(argv)
+    config_path = os.path.abspath(args.config)
+
+    if args.command == "lazy-config":
+        text = json.dumps(lazy_config(config_path), indent=2) + "\n"
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                file.write(text)
+        else:
+            sys.stdout.write(text)
+        return 0
+
+    measurements = check_import_budgets(config_path, args.graphs, args.budget, args.repeat)
+    if args.json:
+        print(json.dumps([m.to_dict() for m in measurements], indent=2))
+    else:
+        print(format_report(measurements))
+    return 0 if all(m.status == "ok" for m in measurements) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Import-time budget check for the graphs of langgraph.json.
+
+Each graph module is imported in a fresh interpreter, so a measurement is
+what the module costs on its own at server startup, not what is left after
+other graphs have already imported the shared dependencies.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tomllib
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import dotenv_values
+
+from graph_registry.registry import CONFIG_PATH, GraphSpec, load_specs
+
+DEFAULT_BUDGET = float(os.getenv("GRAPH_IMPORT_BUDGET", "3.0"))
+IMPORT_TIMEOUT = float(os.getenv("GRAPH_IMPORT_TIMEOUT", "120"))
+
+_PROBE = (
+    "import importlib, sys, time\n"
+    "started = time.perf_counter()\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+
+@dataclass
+class ImportMeasurement:
+    name: str
+    module: str
+    budget: float
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "error"
+        return "ok" if self.seconds <= self.budget else "over"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {**asdict(self), "status": self.status}
+
+
+def load_budgets(pyproject_path: str) -> Tuple[float, Dict[str, float]]:
+    """Read the default and per-graph budgets from ``[tool.graph_registry]`` of a pyproject.toml.
+
+    Returns:
+        The default budget in seconds and the per-graph overrides.
+    """
+    if not os.path.exists(pyproject_path):
+        return DEFAULT_BUDGET, {}
+    with open(pyproject_path, "rb") as file:
+        settings = tomllib.load(file).get("tool", {}).get("graph_registry", {})
+    budgets = {name: float(seconds) for name, seconds in settings.get("budgets", {}).items()}
+    return float(settings.get("import_budget", DEFAULT_BUDGET)), budgets
+
+
+def load_config_env(config_path: str) -> Dict[str, str]:
+    """Return the ``env`` of a langgraph.json, an env file or a mapping, as the server would load it."""
+    with open(config_path, encoding="utf-8") as file:
+        env = json.load(file).get("env") or {}
+    if isinstance(env, str):
+        path = os.path.join(os.path.dirname(os.path.abspath(config_path)), env)
+        env = dotenv_values(path) if os.path.exists(path) else {}
+    return {key: value for key, value in env.items() if value is not None}
+
+
+def measure_import(
+    module: str,
+    project_dir: str,
+    extra_env: Optional[Dict[str, str]] = None,
+    timeout: float = IMPORT_TIMEOUT,
+) -> Tuple[Optional[float], Optional[str]]:
+    """Import a module in a fresh interpreter.
+
+    Args:
+        module: Dotted module name.
+        project_dir: Directory of langgraph.json; it and its ``src`` go on the path.
+        extra_env: Variables set for the import unless already in the environment.
+        timeout: Seconds before the import counts as failed.
+
+    Returns:
+        The import time in seconds, or the error that stopped the import.
+    """
+    env = {**(extra_env or {}), **os.environ}
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(project_dir, "src"), project_dir] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE, module],
+            cwd=project_dir, env=env, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return None, f"import did not finish within {timeout:.0f}s"
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return None, lines[-1] if lines else f"exited with status {completed.returncode}"
+    return float(completed.stdout.strip().splitlines()[-1]), None
+
+
+def check_import_budgets(
+    config_path: str = CONFIG_PATH,
+    names: Optional[Iterable[str]] = None,
+    budget: Optional[float] = None,
+    repeat: int = 1,
+) -> List[ImportMeasurement]:
+    """Measure the graph modules of a langgraph.json against their budgets.
+
+    Args:
+        config_path: The langgraph.json to check; budgets come from the pyproject.toml next to it.
+        names: Graphs to check; all of them by default.
+        budget: Budget for every graph, overriding the configured ones.
+        repeat: Imports per graph; the fastest counts, to keep noise out of the report.
+    """
+    project_dir = os.path.dirname(os.path.abspath(config_path))
+    default, budgets = load_budgets(os.path.join(project_dir, "pyproject.toml"))
+    specs = load_specs(config_path)
+    extra_env = load_config_env(config_path)
+    selected: List[GraphSpec] = [specs[name] for name in names] if names else list(specs.values())
+
+    measurements = []
+    for spec in selected:
+        measurement = ImportMeasurement(spec.name, spec.module, budget if budget is not None else budgets.get(spec.name, default))
+        for _ in range(max(1, repeat)):
+            seconds, error = measure_import(spec.module, project_dir, extra_env)
+            if error is not None:
+                measurement.seconds, measurement.error = None, error
+                break
+            measurement.seconds = seconds if measurement.seconds is None else min(measurement.seconds, seconds)
+        measurements.append(measurement)
+    return measurements
+
+
+def format_report(measurements: List[ImportMeasurement]) -> str:
+    """Render measurements as a table, slowest first."""
+    rows = sorted(measurements, key=lambda m: (m.seconds is not None, m.seconds or 0), reverse=True)
+    width = max([len("graph")] + [len(m.name) for m in rows])
+    lines = [f"{'graph':<{width}}  {'import':>8}  {'budget':>8}  status"]
+    for m in rows:
+        seconds = f"{m.seconds:.2f}s" if m.seconds is not None else "-"
+        line = f"{m.name:<{width}}  {seconds:>8}  {m.budget:>7.2f}s  {m.status.upper()}"
+        lines.append(line + (f"  {m.error}" if m.error else ""))
+    failed = sum(m.status != "ok" for m in measurements)
+    lines.append(f"{len(measurements) - failed} of {len(measurements)} graphs within budget")
+    return "\n".join(lines)
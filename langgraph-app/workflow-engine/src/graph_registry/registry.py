@@ -0,0 +1,169 @@
+"""Lazy registry of the graphs declared in langgraph.json, with per-graph import timing."""
+
+import importlib
+import inspect
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph.state import StateGraph
+from langgraph.pregel import Pregel
+
+# langgraph.json of this project: src/graph_registry/registry.py -> workflow-engine/
+CONFIG_PATH = os.getenv(
+    "LANGGRAPH_CONFIG",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "langgraph.json"),
+)
+
+
+@dataclass(frozen=True)
+class GraphSpec:
+    """One ``"name": "./src/package/module.py:attribute"`` entry of langgraph.json."""
+
+    name: str
+    path: str
+    attribute: str
+
+    @property
+    def module(self) -> str:
+        """Dotted module name, relative to ``src`` when the file lives there."""
+        path = os.path.normpath(self.path)
+        if path.startswith("src" + os.sep):
+            path = path[len("src" + os.sep):]
+        return os.path.splitext(path)[0].replace(os.sep, ".")
+
+    @classmethod
+    def parse(cls, name: str, target: str) -> "GraphSpec":
+        """Parse a langgraph.json target of the form ``path.py:attribute``."""
+        path, _, attribute = target.rpartition(":")
+        if not path or not attribute:
+            raise ValueError(f"Graph {name!r} must be declared as 'path.py:attribute', got {target!r}")
+        return cls(name, path, attribute)
+
+
+def load_specs(config_path: str = CONFIG_PATH) -> Dict[str, GraphSpec]:
+    """Read the graph entries of a langgraph.json file."""
+    with open(config_path, encoding="utf-8") as file:
+        graphs = json.load(file).get("graphs", {})
+    return {name: GraphSpec.parse(name, target) for name, target in graphs.items()}
+
+
+def is_graph(target: Any) -> bool:
+    """Whether a target is a graph rather than a graph factory."""
+    return isinstance(target, (Pregel, StateGraph))
+
+
+def build(target: Any, config: RunnableConfig | None = None) -> Any:
+    """Return the graph behind a target, calling it first if it is a factory like ``make_graph``."""
+    if is_graph(target) or not callable(target):
+        return target
+    try:
+        takes_config = bool(inspect.signature(target).parameters)
+    except (TypeError, ValueError):
+        takes_config = False
+    return target(config) if takes_config else target()
+
+
+class GraphRegistry:
+    """Graphs of a langgraph.json file, each imported on first use.
+
+    The module behind a graph is imported the first time the graph is asked
+    for, under a per-graph lock, and the import time is recorded. A module
+    that fails to import is not retried until ``reset``; the error is
+    re-raised on every request so callers see why.
+    """
+
+    def __init__(self, config_path: str = CONFIG_PATH):
+        """Read the graph entries of ``config_path``; nothing is imported yet."""
+        self.config_path = config_path
+        self.specs = load_specs(config_path)
+        self._targets: Dict[str, Any] = {}
+        self._errors: Dict[str, Exception] = {}
+        self._import_seconds: Dict[str, float] = {}
+        self._locks = {name: threading.Lock() for name in self.specs}
+
+    def names(self) -> List[str]:
+        """Return the graph names in langgraph.json order."""
+        return list(self.specs)
+
+    def spec(self, name: str) -> GraphSpec:
+        """Return the entry of a graph, raising KeyError with the known names if there is none."""
+        try:
+            return self.specs[name]
+        except KeyError:
+            raise KeyError(f"Unknown graph {name!r}; known graphs: {', '.join(self.specs)}") from None
+
+    def target(self, name: str) -> Any:
+        """Return the object langgraph.json points at, a graph or a graph factory, importing it if needed."""
+        spec = self.spec(name)
+        if name not in self._targets and name not in self._errors:
+            with self._locks[name]:
+                if name not in self._targets and name not in self._errors:
+                    started = time.perf_counter()
+                    try:
+                        module = importlib.import_module(spec.module)
+                        self._targets[name] = getattr(module, spec.attribute)
+                    except Exception as e:
+                        self._errors[name] = e
+                    finally:
+                        self._import_seconds[name] = time.perf_counter() - started
+        if name in self._errors:
+            raise self._errors[name]
+        return self._targets[name]
+
+    def get(self, name: str, config: RunnableConfig | None = None) -> Any:
+        """Return the graph, built by its factory when langgraph.json points at one."""
+        return build(self.target(name), config)
+
+    def factory(self, name: str):
+        """Return a graph factory for the LangGraph server that defers the import to the first run."""
+        self.spec(name)
+
+        def make_graph(config: RunnableConfig) -> Any:
+            return self.get(name, config)
+
+        make_graph.__name__ = make_graph.__qualname__ = name
+        make_graph.__doc__ = f"Graph {name!r}, imported from {self.specs[name].path} on first use."
+        return make_graph
+
+    def reset(self, name: str | None = None) -> None:
+        """Forget loaded targets and import errors, for one graph or all of them."""
+        for key in [name] if name else list(self.specs):
+            self._targets.pop(key, None)
+            self._errors.pop(key, None)
+            self._import_seconds.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return, per graph, its module, whether it is loaded, the import time and any import error."""
+        return {
+            name: {
+                "module": spec.module,
+                "loaded": name in self._targets,
+                "import_seconds": round(self._import_seconds[name], 4) if name in self._import_seconds else None,
+                "error": repr(self._errors[name]) if name in self._errors else None,
+            }
+            for name, spec in self.specs.items()
+        }
+
+
+_default: GraphRegistry | None = None
+_default_lock = threading.Lock()
+
+
+def get_graph_registry() -> GraphRegistry:
+    """Return the registry for this project's langgraph.json."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = GraphRegistry()
+    return _default
+
+
+def graph_registry_stats() -> Dict[str, Any]:
+    """Return the stats of the process-wide registry."""
+    return get_graph_registry().stats()
@@ -0,0 +1,21 @@
+"""Lazy graph factories for the LangGraph server.
+
+Every graph of langgraph.json is exposed here under its own name as a
+factory that imports the graph's module on the first run, so server
+startup only imports this module. ``langgraph.lazy.json`` points the server
+at these factories::
+
+    langgraph dev --config langgraph.lazy.json
+"""
+
+from typing import Any
+
+from graph_registry.registry import get_graph_registry
+
+
+def __getattr__(name: str) -> Any:
+    registry = get_graph_registry()
+    if name not in registry.specs:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    factory = globals()[name] = registry.factory(name)
+    return factory
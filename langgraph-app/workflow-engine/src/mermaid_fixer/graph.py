@@ -2,7 +2,7 @@ from langgraph.graph import StateGraph, END, add_messages
 from langgraph.prebuilt import ToolNode , create_react_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
+from model_registry import get_chat_model
 from langchain_core.messages import HumanMessage, AnyMessage
 from typing import Annotated, TypedDict, List, Dict, Sequence
 from dataclasses import dataclass, field
@@ -62,18 +62,18 @@ def check_mermaid_syntax(diagram: str) -> str:
     return "The Mermaid syntax is valid."
 
 # --- Create the tool for fixing mermaid diagram syntax ---
+fix_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You are a helpful assistant that fixes Mermaid diagrams."),
+    MessagesPlaceholder(variable_name="messages"),
+    ("human", "Here is the invalid Mermaid diagram : {diagram}"),
+])
+
 @tool
 def fix_mermaid_diagram(diagram: str) -> str:
     """
     Fixes a Mermaid diagram using an LLM.
     """
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are a helpful assistant that fixes Mermaid diagrams."),
-        MessagesPlaceholder(variable_name="messages"),
-        ("human", "Here is the invalid Mermaid diagram : {diagram}"),
-    ])
-    llm = ChatOpenAI(model="gpt-4o-mini")
-    chain = prompt | llm
+    chain = fix_prompt | get_chat_model("openai/gpt-4o-mini")
     response = chain.invoke({"diagram":diagram,"messages":[]})
     return response.content
 
@@ -86,7 +86,7 @@ agent_prompt = ChatPromptTemplate.from_messages([
     ("system", "You are a helpful assistant. You should use tools to fix the mermaid diagram."),
     MessagesPlaceholder(variable_name="messages"),
 ])
-llm = ChatOpenAI(model="gpt-4o-mini")
+llm = get_chat_model("openai/gpt-4o-mini")
 agent = agent_prompt | llm
 
 agent_executor = create_react_agent(llm, tools=tools)
@@ -0,0 +1,28 @@
+"""Model Registry.
+
+Process-wide cache of chat models and tool-bound runnables shared by all graphs,
+so HTTP connection pools and model setup are reused across nodes, runs and threads,
+plus opt-in response caches that let graphs skip repeated LLM calls.
+"""
+
+from model_registry.cache import (
+    MemoryCacheStorage,
+    ResponseCache,
+    SQLiteCacheStorage,
+    cache_stats,
+    cosine_similarity,
+    response_cache,
+)
+from model_registry.registry import clear_registry, get_chat_model, registry_stats
+
+__all__ = [
+    "get_chat_model",
+    "registry_stats",
+    "clear_registry",
+    "response_cache",
+    "cache_stats",
+    "cosine_similarity",
+    "ResponseCache",
+    "MemoryCacheStorage",
+    "SQLiteCacheStorage",
+]
@@ -0,0 +1,418 @@
+"""LLM response cache with an exact-match tier and an optional embedding-similarity tier.
+
+ResponseCache plugs into LangChain's BaseCache hook, so any chat model created with
+``cache=response_cache("<graph>")`` serves repeated prompts without calling the provider.
+"""
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.embeddings import Embeddings
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, Generation
+
+CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory | sqlite | off
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".langgraph_api/llm_cache.db")
+CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+CACHE_EMBEDDINGS = os.getenv("LLM_CACHE_EMBEDDINGS", "openai:text-embedding-3-small")
+CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.97"))
+# Most recently used entries compared against a prompt on an exact miss
+CACHE_SEMANTIC_SCAN = int(os.getenv("LLM_CACHE_SEMANTIC_SCAN", "1000"))
+
+# Serialized message fields that vary between otherwise identical prompts
+VOLATILE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+# Prompt embeddings kept between a miss and the update that stores its response
+MISS_VECTORS = 128
+
+# The only classes revived from stored entries, so a shared cache file cannot inject other objects
+CACHED_TYPES = [Generation, ChatGeneration, ChatGenerationChunk, AIMessage, AIMessageChunk]
+
+
+@dataclass
+class CacheEntry:
+    """One cached response."""
+
+    key: str
+    llm_string: str
+    value: str
+    expires_at: float | None = None
+    vector: List[float] | None = None
+
+    def expired(self, now: float) -> bool:
+        """Whether the entry is past its TTL at ``now``."""
+        return self.expires_at is not None and self.expires_at <= now
+
+
+class CacheStorage(ABC):
+    """Where cache entries live; implementations must be thread safe."""
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """Return an entry and mark it as recently used."""
+
+    @abstractmethod
+    def put(self, entry: CacheEntry) -> None:
+        """Store an entry, evicting the least recently used ones over capacity."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+
+    @abstractmethod
+    def vectors(self, llm_string: str, limit: int) -> Iterable[Tuple[str, List[float]]]:
+        """Yield (key, embedding) for the ``limit`` most recently used entries of one model configuration."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+
+
+class MemoryCacheStorage(CacheStorage):
+    """In-process LRU storage."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        """Keep at most ``max_entries`` entries."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return an entry and move it to the most recently used end."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        """Store an entry, dropping the least recently used ones over capacity."""
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def vectors(self, llm_string: str, limit: int) -> Iterable[Tuple[str, List[float]]]:
+        """Return (key, embedding) for the most recently used entries with an embedding."""
+        found = []
+        with self._lock:
+            for entry in reversed(self._entries.values()):
+                if len(found) >= limit:
+                    break
+                if entry.llm_string == llm_string and entry.vector is not None:
+                    found.append((entry.key, entry.vector))
+        return found
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+        return len(self._entries)
+
+
+class SQLiteCacheStorage(CacheStorage):
+    """On-disk LRU storage shared by every process using the same file."""
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES):
+        """Open or create the cache table in ``path``, keeping at most ``max_entries`` rows."""
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    llm_string TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    vector BLOB,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_llm_string ON llm_cache (llm_string)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at)")
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return an entry and record the access time."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT llm_string, value, expires_at, vector FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        llm_string, value, expires_at, vector = row
+        return CacheEntry(key, llm_string, value, expires_at, _unpack_vector(vector))
+
+    def put(self, entry: CacheEntry) -> None:
+        """Store an entry and delete the least recently used rows over capacity in one transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    """INSERT OR REPLACE INTO llm_cache (key, llm_string, value, expires_at, vector, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)""",
+                    (entry.key, entry.llm_string, entry.value, entry.expires_at, _pack_vector(entry.vector),
+                     time.time()),
+                )
+                self._conn.execute(
+                    """DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+    def vectors(self, llm_string: str, limit: int) -> Iterable[Tuple[str, List[float]]]:
+        """Return (key, embedding) for the most recently used rows with an embedding."""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT key, vector FROM llm_cache WHERE llm_string = ? AND vector IS NOT NULL
+                ORDER BY accessed_at DESC LIMIT ?""",
+                (llm_string, limit),
+            ).fetchall()
+        return [(key, _unpack_vector(vector)) for key, vector in rows]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class ResponseCache(BaseCache):
+    """Exact-match response cache with an optional semantic tier.
+
+    Args:
+        namespace: Name used in metrics, usually the graph name.
+        storage: Where entries are kept.
+        ttl: Seconds an entry stays valid; None or 0 keeps it until evicted.
+        embeddings: Enables the semantic tier: on an exact miss, a cached response for
+            the same model configuration is reused when its prompt embedding has cosine
+            similarity of at least ``similarity`` with the new prompt.
+        similarity: Threshold for semantic hits.
+        semantic_scan: How many of the most recently used entries a prompt is compared with.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        storage: CacheStorage,
+        ttl: float | None = CACHE_TTL,
+        embeddings: Embeddings | None = None,
+        similarity: float = CACHE_SIMILARITY,
+        semantic_scan: int = CACHE_SEMANTIC_SCAN,
+    ):
+        """Create a cache over ``storage``; see the class docstring for the arguments."""
+        self.namespace = namespace
+        self.storage = storage
+        self.ttl = ttl or None
+        self.embeddings = embeddings
+        self.similarity = similarity
+        self.semantic_scan = semantic_scan
+        self.counters: Counter = Counter()
+        # Embeddings of prompts that missed, reused when LangChain stores the response for them
+        self._miss_vectors: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Name the cache by its namespace."""
+        return f"ResponseCache({self.namespace!r})"
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Return the cached generations for a prompt, trying the exact tier before the semantic one."""
+        normalized = normalize_prompt(prompt)
+        key = _cache_key(normalized, llm_string)
+        entry = self._live(self.storage.get(key))
+        if entry is not None:
+            self.counters["exact_hits"] += 1
+            return loads(entry.value, allowed_objects=CACHED_TYPES)
+        if self.embeddings is not None:
+            vector = self.embeddings.embed_query(_prompt_text(normalized))
+            entry = self._nearest(vector, llm_string)
+            if entry is not None:
+                self.counters["semantic_hits"] += 1
+                return loads(entry.value, allowed_objects=CACHED_TYPES)
+            with self._lock:
+                self._miss_vectors[key] = vector
+                while len(self._miss_vectors) > MISS_VECTORS:
+                    self._miss_vectors.popitem(last=False)
+        self.counters["misses"] += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations for a prompt, with its embedding when the semantic tier is on."""
+        normalized = normalize_prompt(prompt)
+        key = _cache_key(normalized, llm_string)
+        vector = None
+        if self.embeddings is not None:
+            with self._lock:
+                vector = self._miss_vectors.pop(key, None)
+            if vector is None:
+                vector = self.embeddings.embed_query(_prompt_text(normalized))
+        self.storage.put(CacheEntry(
+            key=key,
+            llm_string=llm_string,
+            value=dumps(list(return_val)),
+            expires_at=time.time() + self.ttl if self.ttl else None,
+            vector=vector,
+        ))
+        self.counters["updates"] += 1
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every entry and the embeddings kept for pending misses."""
+        self.storage.clear()
+        with self._lock:
+            self._miss_vectors.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of stored entries."""
+        return {
+            "exact_hits": self.counters["exact_hits"],
+            "semantic_hits": self.counters["semantic_hits"],
+            "misses": self.counters["misses"],
+            "updates": self.counters["updates"],
+            "expired": self.counters["expired"],
+            "entries": len(self.storage),
+        }
+
+    def _live(self, entry: CacheEntry | None) -> CacheEntry | None:
+        if entry is not None and entry.expired(time.time()):
+            self.storage.delete(entry.key)
+            self.counters["expired"] += 1
+            return None
+        return entry
+
+    def _nearest(self, query: List[float], llm_string: str) -> CacheEntry | None:
+        best_key, best_score = None, self.similarity
+        for key, vector in self.storage.vectors(llm_string, self.semantic_scan):
+            score = cosine_similarity(query, vector)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return self._live(self.storage.get(best_key)) if best_key is not None else None
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonicalize a serialized message list so ids and provider metadata do not affect the key."""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt.strip()
+    for message in messages if isinstance(messages, list) else []:
+        fields = message.get("kwargs") if isinstance(message, dict) else None
+        if not isinstance(fields, dict):
+            continue
+        for field in VOLATILE_FIELDS:
+            fields.pop(field, None)
+        if isinstance(fields.get("content"), str):
+            fields["content"] = " ".join(fields["content"].split())
+    return json.dumps(messages, sort_keys=True, separators=(",", ":"))
+
+
+def _prompt_text(normalized: str) -> str:
+    """Text embedded for a prompt: each message's role and content, so the same words from another role differ."""
+    try:
+        messages = json.loads(normalized)
+        return "\n".join(f"{m['kwargs'].get('type') or m['id'][-1]}: {m['kwargs'].get('content', '')}" for m in messages)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return normalized
+
+
+def _cache_key(normalized: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\0{normalized}".encode()).hexdigest()
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors; 0 when either is all zeros."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _pack_vector(vector: List[float] | None) -> bytes | None:
+    return array("f", vector).tobytes() if vector is not None else None
+
+
+def _unpack_vector(blob: bytes | None) -> List[float] | None:
+    return array("f", blob).tolist() if blob is not None else None
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+_shared_sqlite: SQLiteCacheStorage | None = None
+
+
+def response_cache(namespace: str, semantic: bool = False, ttl: float | None = CACHE_TTL) -> ResponseCache | None:
+    """Return the shared response cache for a graph, or None when LLM_CACHE_BACKEND is 'off'.
+
+    Args:
+        namespace: Graph name; each graph opts in by passing its cache to its chat models.
+        semantic: Also reuse responses for near-identical prompts (needs embeddings).
+        ttl: Seconds an entry stays valid.
+    """
+    if CACHE_BACKEND == "off":
+        return None
+    global _shared_sqlite
+    with _caches_lock:
+        if namespace not in _caches:
+            if CACHE_BACKEND == "sqlite":
+                if _shared_sqlite is None:
+                    _shared_sqlite = SQLiteCacheStorage()
+                storage: CacheStorage = _shared_sqlite
+            else:
+                storage = MemoryCacheStorage()
+            embeddings = None
+            if semantic:
+                from langchain.embeddings import init_embeddings
+
+                embeddings = init_embeddings(CACHE_EMBEDDINGS)
+            _caches[namespace] = ResponseCache(namespace, storage, ttl=ttl, embeddings=embeddings)
+        return _caches[namespace]
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return counters for every response cache created so far."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {namespace: cache.stats() for namespace, cache in caches.items()}
@@ -0,0 +1,245 @@
+"""Shared chat model registry with pooled HTTP clients and in-flight metrics."""
+
+import asyncio
+import os
+import threading
+import weakref
+from collections import Counter
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import httpx
+from langchain.chat_models import init_chat_model
+from langchain_core.caches import BaseCache
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+
+from model_registry.cache import cache_stats
+
+# Providers whose LangChain integration accepts caller-supplied httpx clients
+POOLED_PROVIDERS = {"openai", "azure_openai"}
+
+POOL_SIZE = int(os.getenv("MODEL_POOL_SIZE", "100"))
+POOL_KEEPALIVE = int(os.getenv("MODEL_POOL_KEEPALIVE", "20"))
+HTTP_TIMEOUT = float(os.getenv("MODEL_HTTP_TIMEOUT", "120"))
+
+
+class _InFlightTracker(BaseCallbackHandler):
+    """Count model calls currently running and completed for one registry entry."""
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+
+    def on_llm_start(self, *args: Any, **kwargs: Any) -> None:
+        self.on_chat_model_start()
+
+    def on_llm_end(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def on_llm_error(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.errors += 1
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """Async transport with one connection pool per event loop.
+
+    Models hold on to the async client they were built with, but httpx pools
+    are bound to the event loop that opened them, so the shared client hands
+    each request to the pool of the loop it runs on.
+    """
+
+    def __init__(self, limits: httpx.Limits) -> None:
+        self._limits = limits
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            with self._lock:
+                transport = self._transports.get(loop)
+                if transport is None:
+                    transport = self._transports[loop] = httpx.AsyncHTTPTransport(limits=self._limits)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport().handle_async_request(request)
+
+    def open_connections(self) -> int:
+        return sum(_open_connections(transport) for transport in list(self._transports.values()))
+
+    def close(self) -> None:
+        """Close every loop's pool; pools of running loops are closed on their own loop."""
+        with self._lock:
+            transports = list(self._transports.items())
+            self._transports.clear()
+        for loop, transport in transports:
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(transport.aclose(), loop)
+            else:
+                loop.run_until_complete(transport.aclose())
+
+    async def aclose(self) -> None:
+        self.close()
+
+
+class ModelRegistry:
+    """Cache chat models by (provider, model, temperature, options) and tool-bound runnables by tools."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._models: Dict[Hashable, Tuple[BaseChatModel, _InFlightTracker]] = {}
+        self._bound: Dict[Hashable, Runnable] = {}
+        self._clients: Dict[str, Tuple[httpx.Client, _LoopLocalTransport, httpx.AsyncClient]] = {}
+        self._lookups: Counter = Counter()
+
+    def get(
+        self,
+        model_name: str,
+        temperature: Optional[float] = None,
+        tools: Sequence[Any] = (),
+        cache: Optional[BaseCache] = None,
+        **kwargs: Any,
+    ) -> Runnable:
+        """Return a shared model, bound to tools when given.
+
+        Args:
+            model_name: 'provider/model', or a bare model name for OpenAI.
+            temperature: Sampling temperature; None keeps the provider default.
+            tools: Tools to bind. Tools are keyed by identity, so pass the same objects to reuse the binding.
+            cache: Response cache for the model, usually ``response_cache(<graph name>)``.
+            **kwargs: Extra model options, part of the cache key.
+        """
+        if cache is not None:
+            kwargs["cache"] = cache
+        provider, model = model_name.split("/", maxsplit=1) if "/" in model_name else ("openai", model_name)
+        model_key = (provider, model, temperature, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        with self._lock:
+            if model_key in self._models:
+                self._lookups["hits"] += 1
+            else:
+                self._lookups["misses"] += 1
+                self._models[model_key] = self._create(provider, model, temperature, kwargs)
+            chat_model, _ = self._models[model_key]
+            if not tools:
+                return chat_model
+            bound_key = (model_key, tuple(id(t) for t in tools))
+            if bound_key not in self._bound:
+                # Keep the tools alive with the binding so their ids stay unique
+                self._bound[bound_key] = chat_model.bind_tools(list(tools))
+            return self._bound[bound_key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache, connection pool and in-flight metrics."""
+        with self._lock:
+            models = {
+                "/".join(key[:2]) + (f"@{key[2]}" if key[2] is not None else ""): {
+                    "in_flight": tracker.in_flight,
+                    "calls": tracker.calls,
+                    "errors": tracker.errors,
+                }
+                for key, (_, tracker) in self._models.items()
+            }
+            pools = {
+                provider: {
+                    "max_connections": POOL_SIZE,
+                    "open_connections": _open_connections(sync_client._transport) + async_pools.open_connections(),
+                }
+                for provider, (sync_client, async_pools, _) in self._clients.items()
+            }
+            return {
+                "models": models,
+                "bound_runnables": len(self._bound),
+                "in_flight": sum(m["in_flight"] for m in models.values()),
+                "pools": pools,
+                "hits": self._lookups["hits"],
+                "misses": self._lookups["misses"],
+                "response_caches": cache_stats(),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._bound.clear()
+            for sync_client, async_pools, _ in self._clients.values():
+                sync_client.close()
+                async_pools.close()
+            self._clients.clear()
+
+    def _create(
+        self, provider: str, model: str, temperature: Optional[float], kwargs: Dict[str, Any]
+    ) -> Tuple[BaseChatModel, _InFlightTracker]:
+        tracker = _InFlightTracker()
+        options = dict(kwargs)
+        if temperature is not None:
+            options["temperature"] = temperature
+        if provider in POOLED_PROVIDERS:
+            sync_client, _, async_client = self._http_clients(provider)
+            options.setdefault("http_client", sync_client)
+            options.setdefault("http_async_client", async_client)
+        chat_model = init_chat_model(model, model_provider=provider, callbacks=[tracker], **options)
+        return chat_model, tracker
+
+    def _http_clients(self, provider: str) -> Tuple[httpx.Client, _LoopLocalTransport, httpx.AsyncClient]:
+        if provider not in self._clients:
+            limits = httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_KEEPALIVE)
+            async_pools = _LoopLocalTransport(limits)
+            self._clients[provider] = (
+                httpx.Client(limits=limits, timeout=HTTP_TIMEOUT),
+                async_pools,
+                httpx.AsyncClient(transport=async_pools, timeout=HTTP_TIMEOUT),
+            )
+        return self._clients[provider]
+
+
+def _open_connections(transport: Any) -> int:
+    pool = getattr(transport, "_pool", None)
+    return len(getattr(pool, "connections", []))
+
+
+_registry = ModelRegistry()
+
+
+def get_chat_model(
+    model_name: str,
+    temperature: Optional[float] = None,
+    tools: Sequence[Any] = (),
+    cache: Optional[BaseCache] = None,
+    **kwargs: Any,
+) -> Runnable:
+    """Return a process-wide shared chat model, optionally bound to tools.
+
+    Args:
+        model_name: 'provider/model', or a bare model name for OpenAI.
+        temperature: Sampling temperature; None keeps the provider default.
+        tools: Tools to bind to the model.
+        cache: Response cache for the model; graphs opt in with ``response_cache(<graph name>)``.
+        **kwargs: Extra model options.
+    """
+    return _registry.get(model_name, temperature=temperature, tools=tools, cache=cache, **kwargs)
+
+
+def registry_stats() -> Dict[str, Any]:
+    """Return pool-size, in-flight, model cache and response cache metrics."""
+    return _registry.stats()
+
+
+def clear_registry() -> None:
+    """Drop all cached models and close the shared HTTP clients."""
+    _registry.clear()
@@ -1,8 +1,13 @@
 """Utility & helper functions."""
 
-from langchain.chat_models import init_chat_model
+from typing import Any, Optional, Sequence
+
+from langchain_core.caches import BaseCache
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+
+from model_registry import get_chat_model
 
 
 def get_message_text(msg: BaseMessage) -> str:
@@ -17,11 +22,12 @@ def get_message_text(msg: BaseMessage) -> str:
         return "".join(txts).strip()
 
 
-def load_chat_model(fully_specified_name: str) -> BaseChatModel:
-    """Load a chat model from a fully specified name.
+def load_chat_model(fully_specified_name: str, tools: Sequence[Any] = (), cache: Optional[BaseCache] = None) -> BaseChatModel | Runnable:
+    """Load a shared chat model from a fully specified name.
 
     Args:
         fully_specified_name (str): String in the format 'provider/model'.
+        tools: Tools to bind to the model; the binding is cached with the model.
+        cache: Optional response cache, e.g. ``response_cache("agent")``.
     """
-    provider, model = fully_specified_name.split("/", maxsplit=1)
-    return init_chat_model(model, model_provider=provider)
+    return get_chat_model(fully_specified_name, tools=tools, cache=cache)
@@ -0,0 +1,190 @@
+"""Data-driven sales person assignment.
+
+Territory rules are loaded from a JSON or CSV file and compiled into a hash
+index keyed by (geo_location, industry, engagement). A rule field may be the
+wildcard ``*``; with three fields there are eight wildcard patterns, so a
+lookup is at most eight dictionary probes however many rules there are.
+The rule file is re-read when it changes on disk.
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Iterable, List, Tuple
+
+RULES_PATH = os.getenv("SLACK_ASSIGNMENT_RULES")
+# Minimum seconds between checks of the rule file for changes
+RELOAD_INTERVAL = float(os.getenv("SLACK_ASSIGNMENT_RELOAD_INTERVAL", "5"))
+# Rule files whose compiled tables are kept; the least recently used is dropped
+MAX_ENGINES = 8
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = "*"
+FIELDS = ("geo_location", "industry", "engagement")
+
+Key = Tuple[str, str, str]
+# Priority, specificity, negated file position: higher wins
+Rank = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class AssignmentRule:
+    """A sales person for leads whose fields match; ``*`` matches any value."""
+
+    rule_id: str
+    sales_person: str
+    geo_location: str = WILDCARD
+    industry: str = WILDCARD
+    engagement: str = WILDCARD
+    priority: int = 0
+
+    @property
+    def key(self) -> Key:
+        """The normalized (geo_location, industry, engagement) the rule is indexed under."""
+        return tuple(_normalize(getattr(self, name)) for name in FIELDS)
+
+    @property
+    def specificity(self) -> int:
+        """Number of fields that are not the wildcard."""
+        return sum(part != WILDCARD for part in self.key)
+
+
+# The original hardcoded criteria, used when no rule file is configured
+DEFAULT_RULES = [
+    AssignmentRule("ny-insurance-services", "Edward", "New York", "Insurance", "services", priority=10),
+    AssignmentRule("ca-automobile-services", "John", "CA", "Automobile", "services", priority=10),
+    AssignmentRule("default", "Sales Team", priority=-1),
+]
+
+
+def _normalize(value: str | None) -> str:
+    value = (value or "").strip()
+    return WILDCARD if value in ("", WILDCARD) else value.casefold()
+
+
+class RuleTable:
+    """Rules compiled into a hash index.
+
+    Every rule is stored under its own key, wildcards included, keeping only
+    the winning rule per key: highest priority, then most specific, then
+    earliest in the file. A lookup probes the eight wildcard variants of the
+    lead's key and applies the same ordering to the hits.
+    """
+
+    def __init__(self, rules: Iterable[AssignmentRule]):
+        """Compile ``rules``, given in file order, into the index."""
+        self.rules: List[AssignmentRule] = list(rules)
+        self._index: Dict[Key, Tuple[Rank, AssignmentRule]] = {}
+        for position, rule in enumerate(self.rules):
+            rank = (rule.priority, rule.specificity, -position)
+            current = self._index.get(rule.key)
+            if current is None or rank > current[0]:
+                self._index[rule.key] = (rank, rule)
+
+    def match(self, geo_location: str | None, industry: str | None, engagement: str | None) -> AssignmentRule | None:
+        """Return the winning rule for a lead, or None if no rule matches."""
+        key = (_normalize(geo_location), _normalize(industry), _normalize(engagement))
+        best = None
+        for mask in product((False, True), repeat=len(FIELDS)):
+            hit = self._index.get(tuple(WILDCARD if wild else part for wild, part in zip(mask, key)))
+            if hit is not None and (best is None or hit[0] > best[0]):
+                best = hit
+        return best[1] if best else None
+
+
+def load_rules(path: str) -> List[AssignmentRule]:
+    """Read rules from a JSON list of objects or a CSV file with a header row.
+
+    Each rule needs ``sales_person``; ``geo_location``, ``industry`` and
+    ``engagement`` default to the wildcard, ``priority`` to 0 and ``rule_id``
+    to the rule's position in the file.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(file))
+        else:
+            rows = json.load(file)
+            if isinstance(rows, dict):
+                rows = rows.get("rules", [])
+    rules = []
+    for position, row in enumerate(rows, start=1):
+        if not row.get("sales_person"):
+            raise ValueError(f"Rule {position} in {path} has no sales_person")
+        rules.append(AssignmentRule(
+            rule_id=str(row.get("rule_id") or position),
+            sales_person=row["sales_person"],
+            geo_location=row.get("geo_location") or WILDCARD,
+            industry=row.get("industry") or WILDCARD,
+            engagement=row.get("engagement") or WILDCARD,
+            priority=int(row.get("priority") or 0),
+        ))
+    return rules
+
+
+class RuleEngine:
+    """A rule table backed by a file, recompiled when the file changes.
+
+    A file that fails to load leaves the previous table in place.
+    """
+
+    def __init__(self, path: str | None = None, reload_interval: float = RELOAD_INTERVAL):
+        """Load ``path`` if given, checking it for changes at most every ``reload_interval`` seconds."""
+        self.path = path
+        self.reload_interval = reload_interval
+        self._table = RuleTable(DEFAULT_RULES)
+        self._mtime: int | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        if path:
+            self._reload()
+
+    @property
+    def table(self) -> RuleTable:
+        """The current table, reloading the file first if it is due for a check and has changed."""
+        if self.path and time.monotonic() - self._checked >= self.reload_interval:
+            with self._lock:
+                if time.monotonic() - self._checked >= self.reload_interval:
+                    self._reload()
+        return self._table
+
+    def _reload(self) -> None:
+        self._checked = time.monotonic()
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime != self._mtime:
+                self._table = RuleTable(load_rules(self.path))
+                self._mtime = mtime
+                logger.info("Loaded %d assignment rules from %s", len(self._table.rules), self.path)
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            if self._mtime is None:
+                logger.warning("Could not load assignment rules from %s, using the default rules: %s", self.path, e)
+            else:
+                logger.warning("Could not reload assignment rules from %s, keeping the previous ones: %s", self.path, e)
+
+    def match(self, geo_location: str | None, industry: str | None, engagement: str | None) -> AssignmentRule | None:
+        """Return the winning rule of the current table, or None if no rule matches."""
+        return self.table.match(geo_location, industry, engagement)
+
+
+_engines: OrderedDict[str | None, RuleEngine] = OrderedDict()
+_engines_lock = threading.Lock()
+
+
+def get_rule_engine(path: str | None = RULES_PATH) -> RuleEngine:
+    """Return the shared engine for a rule file, or for the default rules when no path is given."""
+    with _engines_lock:
+        engine = _engines.get(path)
+        if engine is None:
+            engine = _engines[path] = RuleEngine(path)
+            while len(_engines) > MAX_ENGINES:
+                _engines.popitem(last=False)
+        else:
+            _engines.move_to_end(path)
+    return engine
@@ -33,6 +33,23 @@ class Configuration:
         },
     )
 
+    execution_mode: str = field(
+        default="rules_first",
+        metadata={
+            "description": "How nodes run their tools. 'rules_first' calls the deterministic rule tools "
+            "directly and only asks the model when the rules report low confidence; 'llm' always "
+            "has the model produce the tool call."
+        },
+    )
+
+    min_rule_confidence: float = field(
+        default=0.6,
+        metadata={
+            "description": "Confidence below which a rule result is discarded in favor of the model "
+            "when execution_mode is 'rules_first'."
+        },
+    )
+
     workflow_id: str = field(
         default=None,
         metadata={
@@ -40,6 +57,10 @@ class Configuration:
         },
     )
 
+    def trusts_rules(self, confidence: float = 1.0) -> bool:
+        """Whether a node should use a rule result instead of calling the model."""
+        return self.execution_mode == "rules_first" and confidence >= self.min_rule_confidence
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
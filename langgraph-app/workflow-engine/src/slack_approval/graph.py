@@ -10,9 +10,18 @@ from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
+from langgraph.types import interrupt
 
 from slack_approval.configuration import Configuration
-from slack_approval.tools import tools
+from slack_approval.tools import (
+    tools,
+    create_hubspot_lead,
+    match_lead_attributes,
+    match_sales_person,
+    match_structured_attributes,
+    notify_sales_person,
+    send_approval_request,
+)
 from slack_approval.state import State, InputState, LeadAttributes
 from slack_approval.utils import load_chat_model, extract_slack_message, create_initial_message
 
@@ -39,8 +48,24 @@ async def extract_lead_info(state: State, config: RunnableConfig) -> Dict[str, A
     # Create a message to extract lead information
     slack_message = extract_slack_message(state.slack_event)
     
+    # Attributes sent as fields on the event beat keyword matching on the text
+    configuration = Configuration.from_runnable_config(config)
+    rule = max(
+        match_structured_attributes(state.slack_event.get("slack_message", {}).get("lead_attributes")),
+        match_lead_attributes(slack_message),
+        key=lambda result: result.confidence
+    )
+    # A missing attribute is left to the model rather than guessed
+    if configuration.trusts_rules(rule.confidence) and None not in rule.value.values():
+        return {
+            "lead_attributes": LeadAttributes(**rule.value),
+            "messages": [
+                AIMessage(content=f"Extracted lead attributes: {rule.value}")
+            ]
+        }
+    
     # Use the extract_lead_attributes tool
-    model = load_chat_model("openai/gpt-4o-mini").bind_tools([tools[0]])  # extract_lead_attributes tool
+    model = load_chat_model("openai/gpt-4o-mini", tools=[tools[0]])  # extract_lead_attributes tool
     
     # Prepare the prompt
     prompt = f"""
@@ -98,11 +123,23 @@ async def assign_sales_person_node(state: State, config: RunnableConfig) -> Dict
             ]
         }
     
+    attributes = state.lead_attributes.to_dict()
+    configuration = Configuration.from_runnable_config(config)
+    # The rule file comes from the server's environment, never from the run configuration
+    rule = match_sales_person(**attributes)
+    if configuration.trusts_rules(rule.confidence):
+        return {
+            "assigned_sales_person": rule.value,
+            "assignment_rule": rule.rule,
+            "messages": [
+                AIMessage(content=f"Assigned sales person: {rule.value} (rule {rule.rule})")
+            ]
+        }
+    
     # Use the assign_sales_person tool
-    model = load_chat_model("openai/gpt-4o-mini").bind_tools([tools[1]])  # assign_sales_person tool
+    model = load_chat_model("openai/gpt-4o-mini", tools=[tools[1]])  # assign_sales_person tool
     
     # Prepare the prompt
-    attributes = state.lead_attributes.to_dict()
     prompt = f"""
     Please assign a sales person based on these lead attributes:
     
@@ -147,7 +184,8 @@ async def send_approval_request_node(state: State, config: RunnableConfig) -> Di
         config: Configuration for the node
         
     Returns:
-        Updated state with approval status
+        Updated state recording whether the request was sent; the decision
+        itself is left to await_approval_node
     """
     if not state.lead_attributes or not state.assigned_sales_person:
         return {
@@ -156,8 +194,22 @@ async def send_approval_request_node(state: State, config: RunnableConfig) -> Di
             ]
         }
     
+    # The tool only needs structured inputs, so call it without the model
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.trusts_rules():
+        approval_sent = await send_approval_request.ainvoke(
+            {"lead_attributes": state.lead_attributes.to_dict(), "assigned_person": state.assigned_sales_person},
+            config
+        )
+        return {
+            "approval_requested": bool(approval_sent),
+            "messages": [
+                AIMessage(content=f"Approval request sent: {approval_sent}")
+            ]
+        }
+    
     # Use the send_approval_request tool
-    model = load_chat_model("openai/gpt-4o-mini").bind_tools([tools[2]])  # send_approval_request tool
+    model = load_chat_model("openai/gpt-4o-mini", tools=[tools[2]])  # send_approval_request tool
     
     # Prepare the prompt
     attributes = state.lead_attributes.to_dict()
@@ -187,7 +239,7 @@ async def send_approval_request_node(state: State, config: RunnableConfig) -> Di
         
         # Update the state
         return {
-            "approval_status": approval_sent,
+            "approval_requested": bool(approval_sent),
             "messages": [
                 AIMessage(content=f"Approval request sent: {approval_sent}")
             ]
@@ -200,6 +252,36 @@ async def send_approval_request_node(state: State, config: RunnableConfig) -> Di
     }
 
 
+def await_approval_node(state: State) -> Dict[str, Any]:
+    """Pause until an admin decides, then record the decision.
+    
+    The run is resumed with ``Command(resume=<approved>)``, so an approval
+    needs a single call and no state round trip.
+    
+    Args:
+        state: The current state
+        
+    Returns:
+        Updated state with the admin's decision
+    """
+    decision = interrupt({
+        "type": "approval",
+        "assigned_sales_person": state.assigned_sales_person,
+        "lead_attributes": state.lead_attributes.to_dict() if state.lead_attributes else None,
+    })
+    if isinstance(decision, dict):
+        decision = decision.get("approved")
+    if isinstance(decision, str):
+        decision = decision.lower() == "true"
+    approved = bool(decision)
+    return {
+        "approval_status": approved,
+        "messages": [
+            AIMessage(content="Lead assignment approved." if approved else "Lead assignment rejected.")
+        ]
+    }
+
+
 async def create_hubspot_lead_node(state: State, config: RunnableConfig) -> Dict[str, Any]:
     """Create a lead in Hubspot.
     
@@ -217,8 +299,21 @@ async def create_hubspot_lead_node(state: State, config: RunnableConfig) -> Dict
             ]
         }
     
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.trusts_rules():
+        lead_created = await create_hubspot_lead.ainvoke(
+            {"lead_attributes": state.lead_attributes.to_dict(), "assigned_person": state.assigned_sales_person},
+            config
+        )
+        return {
+            "hubspot_lead_created": lead_created,
+            "messages": [
+                AIMessage(content=f"Hubspot lead created: {lead_created}")
+            ]
+        }
+    
     # Use the create_hubspot_lead tool
-    model = load_chat_model("openai/gpt-4o-mini").bind_tools([tools[3]])  # create_hubspot_lead tool
+    model = load_chat_model("openai/gpt-4o-mini", tools=[tools[3]])  # create_hubspot_lead tool
     
     # Prepare the prompt
     attributes = state.lead_attributes.to_dict()
@@ -276,8 +371,21 @@ async def notify_sales_person_node(state: State, config: RunnableConfig) -> Dict
             ]
         }
     
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.trusts_rules():
+        notification_sent = await notify_sales_person.ainvoke(
+            {"assigned_person": state.assigned_sales_person},
+            config
+        )
+        return {
+            "notification_sent": notification_sent,
+            "messages": [
+                AIMessage(content=f"Notification sent to {state.assigned_sales_person}: {notification_sent}")
+            ]
+        }
+    
     # Use the notify_sales_person tool
-    model = load_chat_model("openai/gpt-4o-mini").bind_tools([tools[4]])  # notify_sales_person tool
+    model = load_chat_model("openai/gpt-4o-mini", tools=[tools[4]])  # notify_sales_person tool
     
     # Prepare the prompt
     prompt = f"""
@@ -416,6 +524,7 @@ def create_graph() -> StateGraph:
     builder.add_node("extract_lead_info", extract_lead_info)
     builder.add_node("assign_sales_person", assign_sales_person_node)
     builder.add_node("send_approval", send_approval_request_node)
+    builder.add_node("await_approval", await_approval_node)
     builder.add_node("create_hubspot_lead", create_hubspot_lead_node)
     builder.add_node("notify_sales_person", notify_sales_person_node)
     
@@ -437,8 +546,9 @@ def create_graph() -> StateGraph:
             END: END
         }
     )
+    builder.add_edge("send_approval", "await_approval")
     builder.add_conditional_edges(
-        "send_approval",
+        "await_approval",
         route_after_approval,
         {
             "create_hubspot_lead": "create_hubspot_lead",
@@ -455,11 +565,9 @@ def create_graph() -> StateGraph:
     )
     builder.add_edge("notify_sales_person", END)
     
-    # Add interrupt after approval is sent to wait for manual approval
-    # This allows the workflow to pause and wait for human intervention
-    graph = builder.compile(
-        interrupt_after=["send_approval"]
-    )
+    # await_approval interrupts the run until it is resumed with the
+    # admin's decision
+    graph = builder.compile()
     
     return graph
 
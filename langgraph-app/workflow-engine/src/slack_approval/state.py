@@ -38,6 +38,8 @@ class State(InputState):
     is_last_step: IsLastStep = field(default=False)
     lead_attributes: Optional[LeadAttributes] = None
     assigned_sales_person: Optional[str] = None
+    assignment_rule: Optional[str] = None
+    approval_requested: bool = False
     approval_status: Optional[bool] = None
     hubspot_lead_created: bool = False
     notification_sent: bool = False
\ No newline at end of file
@@ -4,35 +4,113 @@ It includes tools for extracting lead information, assigning sales people,
 sending approval requests, creating leads in Hubspot, and notifying users.
 """
 
+from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional
 from typing_extensions import Annotated
 
 from langchain_core.tools import BaseTool, StructuredTool, Tool, tool
 from langchain_core.runnables import RunnableConfig
+from slack_approval.assignment import RULES_PATH, get_rule_engine
 from slack_approval.configuration import Configuration
 from slack_approval.state import LeadAttributes
 
 
+@dataclass
+class RuleResult:
+    """Output of a deterministic rule with how much of it was actually matched.
+    
+    A confidence of 1.0 means every input was present or found in the text;
+    values are defaults or guesses otherwise.
+    """
+    value: Any
+    confidence: float
+    rule: Optional[str] = None
+
+
+LEAD_ATTRIBUTE_KEYS = ("geo_location", "industry", "engagement")
+
+
+def match_lead_attributes(slack_message: str) -> RuleResult:
+    """Extract lead attributes from message text with keyword rules.
+    
+    Args:
+        slack_message: The message content from Slack
+        
+    Returns:
+        The attributes, None for those not found in the text, with
+        confidence the share of them found
+    """
+    attributes = {
+        "geo_location": "New York" if "New York" in slack_message else None,
+        "industry": "Insurance" if "Insurance" in slack_message else None,
+        "engagement": "services" if "service" in slack_message.lower() else None
+    }
+    found = sum(value is not None for value in attributes.values())
+    return RuleResult(attributes, found / len(attributes))
+
+
+def match_structured_attributes(attributes: Optional[Dict[str, Any]]) -> RuleResult:
+    """Take lead attributes supplied as fields on the event, such as from a Slack form.
+    
+    Args:
+        attributes: Attribute fields from the event, if any
+        
+    Returns:
+        The attributes, with confidence the share of them that are filled in
+    """
+    attributes = attributes or {}
+    values = {key: attributes.get(key) or None for key in LEAD_ATTRIBUTE_KEYS}
+    filled = sum(value is not None for value in values.values())
+    return RuleResult(values, filled / len(LEAD_ATTRIBUTE_KEYS))
+
+
+def match_sales_person(
+    geo_location: Optional[str],
+    industry: Optional[str],
+    engagement: Optional[str],
+    rules_path: Optional[str] = RULES_PATH
+) -> RuleResult:
+    """Apply the assignment rule table.
+    
+    The table ends in a catch-all rule, so the result is only uncertain
+    when attributes are missing.
+    
+    Args:
+        geo_location: Geographic location of the lead
+        industry: Industry of the lead
+        engagement: Type of engagement
+        rules_path: Rule file to use instead of the built-in criteria
+        
+    Returns:
+        The assigned sales person and the ID of the rule that matched, with
+        confidence the share of attributes present
+    """
+    rule = get_rule_engine(rules_path).match(geo_location, industry, engagement)
+    present = [geo_location, industry, engagement]
+    return RuleResult(
+        rule.sales_person if rule else "Sales Team", # Default assignment
+        sum(bool(value) for value in present) / len(present),
+        rule.rule_id if rule else None
+    )
+
+
 @tool
-async def extract_lead_attributes(slack_message: str) -> Dict[str, str]:
+async def extract_lead_attributes(slack_message: str) -> Dict[str, Optional[str]]:
     """Extract key attributes from a lead message.
     
     Args:
         slack_message: The message content from Slack
         
     Returns:
-        A dictionary with extracted lead attributes (geo_location, industry, engagement)
+        A dictionary with extracted lead attributes (geo_location, industry, engagement),
+        None for attributes that were not found
     """
     # In a real implementation, this would use an LLM or other extraction method
     # For demo purposes, we'll simulate extraction
     print(f"Extracting lead attributes from: {slack_message}")
     
     # Simulate extraction - in production this would be more sophisticated
-    return {
-        "geo_location": "New York" if "New York" in slack_message else "CA",
-        "industry": "Insurance" if "Insurance" in slack_message else "Automobile",
-        "engagement": "services"
-    }
+    return match_lead_attributes(slack_message).value
 
 
 @tool
@@ -47,13 +125,7 @@ async def assign_sales_person(geo_location: str, industry: str, engagement: str)
     Returns:
         The name of the assigned sales person
     """
-    # Assignment logic based on criteria
-    if geo_location == "New York" and industry == "Insurance" and engagement == "services":
-        return "Edward"
-    elif geo_location == "CA" and industry == "Automobile" and engagement == "services":
-        return "John"
-    else:
-        return "Sales Team" # Default assignment
+    return match_sales_person(geo_location, industry, engagement).value
 
 
 @tool
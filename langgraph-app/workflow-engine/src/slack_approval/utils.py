@@ -1,26 +1,30 @@
 """Utility functions for the Slack lead processing workflow."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence, Union
 from typing_extensions import Annotated
 
-from langchain.chat_models import init_chat_model
+from langchain_core.caches import BaseCache
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
+from langchain_core.runnables import Runnable
 
+from model_registry import get_chat_model
 
-def load_chat_model(model_name: str) -> BaseChatModel:
-    """Load a chat model based on the model name.
+
+def load_chat_model(model_name: str, tools: Sequence[Any] = (), cache: Optional[BaseCache] = None) -> Union[BaseChatModel, Runnable]:
+    """Load a shared chat model based on the model name.
     
     Args:
         model_name: The name of the model to load
+        tools: Tools to bind to the model
+        cache: Optional response cache for repeated prompts
         
     Returns:
-        A chat language model
+        A chat language model, bound to the tools when given
     """
-    # In a real implementation, this would load the appropriate model
-    # For demo purposes, we'll use a mock model
-    provider, model = model_name.split("/", maxsplit=1) if "/" in model_name else ("openai", model_name)
-    return init_chat_model(model, model_provider=provider)
+    # Models and tool bindings come from the process-wide registry so nodes
+    # reuse one pooled HTTP client instead of building a client per call
+    return get_chat_model(model_name, tools=tools, cache=cache)
 
 
 def extract_slack_message(slack_event: Dict[str, Any]) -> str:
@@ -1,4 +1,5 @@
 from langchain_openai import ChatOpenAI
+from model_registry import response_cache
 from .prompts import STRENGTHS_PROMPT, WEAKNESSES_PROMPT, OPPORTUNITIES_PROMPT, THREATS_PROMPT, SUMMARY_PROMPT, GREETING_PROMPT
 from typing import Dict, Any
 from langchain_core.tools import tool
@@ -17,6 +18,7 @@ llm = ChatOpenAI(
     temperature=0,
     max_tokens=100,
     api_key="not-needed",  # Dummy API key, not required for LM Studio in local mode
+    cache=response_cache("swot_analyzer"),
 )
 
 
@@ -0,0 +1,9 @@
+"""Workflow Compiler.
+
+Turns designer workflows (React Flow nodes/edges saved by the backend) into
+executable LangGraph graphs, caching compiled graphs per workflow version.
+"""
+
+from workflow_compiler.compiler import WorkflowCompileError, WorkflowCompiler
+
+__all__ = ["WorkflowCompiler", "WorkflowCompileError"]
@@ -0,0 +1,240 @@
+"""Compile designer workflows into LangGraph StateGraphs.
+
+A workflow is the JSON the backend stores for the React Flow designer: nodes with a
+``data.type`` from the backend ``NodeType`` enum and edges with an optional
+``data.condition``. START/END nodes map to the graph entry and exit, FORK nodes fan
+out to every outgoing edge in parallel, JOIN nodes wait for all incoming branches
+(unless ``joinType`` is ``"any"``), SUB_WORKFLOW nodes run a nested compiled graph
+and HUMAN_TASK nodes interrupt the run.
+
+Compiled graphs are kept in an LRU cache keyed by workflow id and content hash,
+including the hashes of embedded sub-workflows, so running the same version again
+skips validation and graph construction.
+"""
+
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Tuple
+
+from langchain_core.tools import BaseTool
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+
+from workflow_compiler.conditions import compile_condition
+from workflow_compiler.nodes import (
+    NODE_BUILDERS,
+    CompileContext,
+    NodeBuilder,
+    WorkflowCompileError,
+)
+from workflow_compiler.state import WorkflowState
+from workflow_compiler.utils import version_hash
+
+__all__ = ["WorkflowCompiler", "WorkflowCompileError"]
+
+
+class _LRUCache:
+    """Thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class WorkflowCompiler:
+    """Compile designer workflows to runnable graphs with a compiled-graph cache."""
+
+    def __init__(
+        self,
+        resolve: Callable[[str], Dict[str, Any] | None] | None = None,
+        functions: Mapping[str, Callable[..., Any]] | None = None,
+        tools: Mapping[str, BaseTool] | None = None,
+        checkpointer: Any = None,
+        builders: Mapping[str, NodeBuilder] | None = None,
+        default_model: str = "openai/gpt-4o-mini",
+        cache_size: int = 128,
+    ):
+        """Create a compiler.
+
+        Args:
+            resolve: Looks up a workflow by id; required for SUB_WORKFLOW nodes.
+            functions: FUNCTION node implementations keyed by ``functionName``.
+            tools: Tools keyed by id, used by TOOL nodes and bound to AGENT nodes.
+            checkpointer: Checkpointer for top-level graphs; needed to resume HUMAN_TASK interrupts.
+            builders: Overrides for the node builder of specific node types.
+            default_model: Model for AGENT nodes without a 'provider/model' llmConfigId.
+            cache_size: Maximum number of compiled graphs kept in the cache.
+        """
+        self.resolve = resolve
+        self.functions = dict(functions or {})
+        self.tools = dict(tools or {})
+        self.checkpointer = checkpointer
+        self.builders = {**NODE_BUILDERS, **(builders or {})}
+        self.default_model = default_model
+        self.cache = _LRUCache(cache_size)
+
+    def compile(self, workflow: Dict[str, Any]) -> CompiledStateGraph:
+        """Return the compiled graph for a workflow, building it on a cache miss.
+
+        Args:
+            workflow: The workflow JSON as stored by the backend.
+
+        Raises:
+            WorkflowCompileError: If the workflow graph is invalid.
+        """
+        return self._compile(workflow, subgraph=False, stack=())
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current size of the compiled-graph cache."""
+        return {"hits": self.cache.hits, "misses": self.cache.misses, "size": len(self.cache)}
+
+    def clear_cache(self) -> None:
+        """Drop every compiled graph, e.g. after workflows were edited in place."""
+        self.cache.clear()
+
+    def _compile(self, workflow: Dict[str, Any], subgraph: bool, stack: Tuple[str, ...]) -> CompiledStateGraph:
+        key = (workflow["id"], self._version(workflow, stack), subgraph)
+        compiled = self.cache.get(key)
+        if compiled is None:
+            graph = self._build(workflow, stack + (workflow["id"],))
+            # Subgraphs inherit the parent's checkpointer at runtime
+            compiled = graph.compile(checkpointer=None if subgraph else self.checkpointer)
+            compiled.name = workflow.get("name") or workflow["id"]
+            self.cache.put(key, compiled)
+        return compiled
+
+    def _version(self, workflow: Dict[str, Any], stack: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """Content hash of a workflow together with the versions of the sub-workflows it embeds, recursively.
+
+        A parent's compiled graph contains its compiled children, so editing a child
+        must change the parent's cache key as well.
+        """
+        stack = stack + (workflow["id"],)
+        children = {
+            workflow_id: self._version(self._resolve(workflow_id, stack), stack)
+            for workflow_id in _sub_workflow_ids(workflow)
+        }
+        return (version_hash(workflow), tuple(sorted(children.items())))
+
+    def _resolve(self, workflow_id: str, stack: Tuple[str, ...]) -> Dict[str, Any]:
+        if workflow_id in stack:
+            raise WorkflowCompileError(f"Sub-workflow cycle: {' -> '.join(stack + (workflow_id,))}")
+        workflow = self.resolve(workflow_id) if self.resolve else None
+        if workflow is None:
+            raise WorkflowCompileError(f"Sub-workflow {workflow_id!r} not found")
+        return workflow
+
+    def _subgraph(self, workflow_id: str, stack: Tuple[str, ...]) -> CompiledStateGraph:
+        return self._compile(self._resolve(workflow_id, stack), subgraph=True, stack=stack)
+
+    def _build(self, workflow: Dict[str, Any], stack: Tuple[str, ...]) -> StateGraph:
+        nodes = {node["id"]: node for node in workflow.get("nodes", [])}
+        if len(nodes) != len(workflow.get("nodes", [])):
+            raise WorkflowCompileError(f"Workflow {workflow['id']!r} has duplicate node ids")
+        types = {node_id: (node.get("data") or {}).get("type") or node.get("type") for node_id, node in nodes.items()}
+        starts = {node_id for node_id, t in types.items() if t == "start"}
+        ends = {node_id for node_id, t in types.items() if t == "end"}
+        if not starts:
+            raise WorkflowCompileError(f"Workflow {workflow['id']!r} has no start node")
+
+        ctx = CompileContext(
+            functions=self.functions,
+            tools=self.tools,
+            subgraph=lambda workflow_id: self._subgraph(workflow_id, stack),
+            default_model=self.default_model,
+        )
+        builder = StateGraph(WorkflowState)
+        for node_id, node in nodes.items():
+            if node_id in starts or node_id in ends:
+                continue
+            if types[node_id] not in self.builders:
+                raise WorkflowCompileError(f"Node {node_id!r} has unsupported type {types[node_id]!r}")
+            builder.add_node(node_id, self.builders[types[node_id]](node, ctx))
+
+        outgoing: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        incoming: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for edge in workflow.get("edges", []):
+            if edge["source"] not in nodes or edge["target"] not in nodes:
+                raise WorkflowCompileError(f"Edge {edge['id']!r} references a missing node")
+            outgoing[edge["source"]].append(edge)
+            incoming[edge["target"]].append(edge)
+
+        def graph_name(node_id: str) -> str:
+            return START if node_id in starts else END if node_id in ends else node_id
+
+        # Joins waiting on all branches get a single multi-source edge
+        wait_all = {
+            node_id for node_id, t in types.items()
+            if t == "join" and (nodes[node_id]["data"].get("joinType") or "all") == "all"
+        }
+        for join_id in wait_all:
+            sources = sorted({graph_name(edge["source"]) for edge in incoming[join_id]})
+            if sources:
+                builder.add_edge(sources if len(sources) > 1 else sources[0], join_id)
+
+        for source, edges in outgoing.items():
+            if source in ends:
+                raise WorkflowCompileError(f"End node {source!r} has outgoing edges")
+            edges = [edge for edge in edges if edge["target"] not in wait_all]
+            self._add_edges(builder, graph_name(source), [(graph_name(e["target"]), _condition(e)) for e in edges])
+        return builder
+
+    @staticmethod
+    def _add_edges(builder: StateGraph, source: str, targets: List[Tuple[str, str | None]]) -> None:
+        """Add plain edges, or one router that fans out to every target whose condition holds."""
+        if all(condition is None for _, condition in targets):
+            for target, _ in targets:
+                builder.add_edge(source, target)
+            return
+
+        try:
+            routes = [(target, compile_condition(condition) if condition else None) for target, condition in targets]
+        except ValueError as e:
+            raise WorkflowCompileError(f"Edge from {source!r}: {e}") from e
+
+        def route(state: WorkflowState) -> List[str]:
+            chosen = [target for target, predicate in routes if predicate is None or predicate(state)]
+            return chosen or [END]
+
+        builder.add_conditional_edges(source, route, sorted({t for t, _ in targets} | {END}))
+
+
+def _sub_workflow_ids(workflow: Dict[str, Any]) -> List[str]:
+    ids = []
+    for node in workflow.get("nodes", []):
+        data = node.get("data") or {}
+        if (data.get("type") or node.get("type")) == "sub_workflow" and data.get("workflowId"):
+            ids.append(data["workflowId"])
+    return ids
+
+
+def _condition(edge: Dict[str, Any]) -> str | None:
+    data = edge.get("data") or {}
+    condition = data.get("condition") or data.get("conditionExpression")
+    return condition.strip() if isinstance(condition, str) and condition.strip() else None
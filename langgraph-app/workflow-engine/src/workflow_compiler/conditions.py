@@ -0,0 +1,86 @@
+"""Safe evaluation of edge condition expressions.
+
+Conditions are small Python expressions such as ``outputs["review"] == "approved"``
+or ``score >= 700 and not flagged``. They are parsed once at compile time and only
+comparisons, boolean logic, literals, names and subscripts are allowed.
+"""
+
+import ast
+import operator
+from typing import Any, Callable, Dict, Mapping
+
+_COMPARE = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+
+def compile_condition(expression: str) -> Callable[[Mapping[str, Any]], bool]:
+    """Parse a condition into a predicate over the workflow state.
+
+    Names resolve against ``inputs`` and ``outputs`` first, then node outputs by id,
+    then workflow inputs.
+
+    Args:
+        expression: The condition text from the designer edge.
+
+    Raises:
+        ValueError: If the expression is not valid or uses unsupported syntax.
+    """
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid condition {expression!r}: {e.msg}") from e
+    _check(tree.body, expression)
+
+    def predicate(state: Mapping[str, Any]) -> bool:
+        outputs = state.get("outputs") or {}
+        inputs = state.get("inputs") or {}
+        names = {**inputs, **outputs, "inputs": inputs, "outputs": outputs}
+        try:
+            return bool(_eval(tree.body, names))
+        except (KeyError, IndexError, TypeError):
+            return False
+
+    return predicate
+
+
+def _check(node: ast.AST, expression: str) -> None:
+    allowed = (
+        ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.Compare, ast.Name,
+        ast.Load, ast.Constant, ast.Subscript, ast.List, ast.Tuple,
+    )
+    for child in ast.walk(node):
+        if not isinstance(child, allowed) and type(child) not in _COMPARE:
+            raise ValueError(f"Unsupported syntax in condition {expression!r}: {type(child).__name__}")
+
+
+def _eval(node: ast.AST, names: Dict[str, Any]) -> Any:
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return names.get(node.id)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_eval(e, names) for e in node.elts]
+    if isinstance(node, ast.Subscript):
+        return _eval(node.value, names)[_eval(node.slice, names)]
+    if isinstance(node, ast.UnaryOp):
+        return not _eval(node.operand, names)
+    if isinstance(node, ast.BoolOp):
+        values = (_eval(v, names) for v in node.values)
+        return all(values) if isinstance(node.op, ast.And) else any(values)
+    left = _eval(node.left, names)
+    for op, comparator in zip(node.ops, node.comparators):
+        right = _eval(comparator, names)
+        if not _COMPARE[type(op)](left, right):
+            return False
+        left = right
+    return True
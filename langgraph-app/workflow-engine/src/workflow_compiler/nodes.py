@@ -0,0 +1,168 @@
+"""Build LangGraph node callables for each designer node type."""
+
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import BaseTool
+from langgraph.types import interrupt
+
+from workflow_compiler.state import WorkflowState
+from workflow_compiler.utils import load_chat_model
+
+
+class WorkflowCompileError(ValueError):
+    """Raised when a designer workflow cannot be turned into a graph."""
+
+
+@dataclass
+class CompileContext:
+    """Dependencies available to node builders while compiling a workflow."""
+
+    functions: Mapping[str, Callable[..., Any]]
+    tools: Mapping[str, BaseTool]
+    subgraph: Callable[[str], Any]
+    default_model: str
+
+
+NodeBuilder = Callable[[Dict[str, Any], CompileContext], Callable[..., Any]]
+
+
+def _sync_and_async(func: Callable[..., Any], afunc: Callable[..., Any]) -> RunnableLambda:
+    """Node that runs func under ``invoke``/``stream`` and afunc under ``ainvoke``/``astream``."""
+    return RunnableLambda(func, afunc=afunc, name=afunc.__name__)
+
+
+def build_agent(node: Dict[str, Any], ctx: CompileContext) -> Callable[..., Any]:
+    """Call a chat model with the node's prompt template and any registered tools."""
+    node_id, data = node["id"], node["data"]
+    prompt = (data.get("template") or {}).get("content") or data.get("description") or ""
+    llm_config = data.get("llmConfigId") or ""
+    model_name = llm_config if "/" in llm_config else ctx.default_model
+    tools = [ctx.tools[t["id"]] for t in data.get("tools") or [] if t.get("id") in ctx.tools]
+    model: Optional[BaseChatModel] = None
+
+    def get_model() -> BaseChatModel:
+        nonlocal model
+        if model is None:
+            # Built on first run so compiling does not need provider credentials
+            model = load_chat_model(model_name)
+            if tools:
+                model = model.bind_tools(tools)
+        return model
+
+    def messages(state: WorkflowState) -> List[BaseMessage]:
+        return [SystemMessage(content=prompt), *state.get("messages", [])] if prompt else list(state.get("messages", []))
+
+    def update(response: BaseMessage) -> Dict[str, Any]:
+        return {"messages": [response], "outputs": {node_id: response.content}}
+
+    def agent_sync(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+        return update(get_model().invoke(messages(state), config))
+
+    async def agent(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+        return update(await get_model().ainvoke(messages(state), config))
+
+    return _sync_and_async(agent_sync, agent)
+
+
+def build_function(node: Dict[str, Any], ctx: CompileContext) -> Callable[..., Any]:
+    """Call a registered Python function with the current state."""
+    node_id, name = node["id"], node["data"].get("functionName")
+    if name not in ctx.functions:
+        raise WorkflowCompileError(f"Node {node_id!r} uses unknown function {name!r}")
+    function = ctx.functions[name]
+
+    if inspect.iscoroutinefunction(function):
+        async def run_async_function(state: WorkflowState) -> Dict[str, Any]:
+            return {"outputs": {node_id: await function(state)}}
+
+        return run_async_function
+
+    def run_function(state: WorkflowState) -> Dict[str, Any]:
+        return {"outputs": {node_id: function(state)}}
+
+    return run_function
+
+
+def build_tool(node: Dict[str, Any], ctx: CompileContext) -> Callable[..., Any]:
+    """Invoke a registered tool with the workflow inputs."""
+    node_id, tool_id = node["id"], node["data"].get("toolId")
+    if tool_id not in ctx.tools:
+        raise WorkflowCompileError(f"Node {node_id!r} uses unknown tool {tool_id!r}")
+    tool = ctx.tools[tool_id]
+
+    def run_tool_sync(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+        return {"outputs": {node_id: tool.invoke(state.get("inputs") or {}, config)}}
+
+    async def run_tool(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+        return {"outputs": {node_id: await tool.ainvoke(state.get("inputs") or {}, config)}}
+
+    return _sync_and_async(run_tool_sync, run_tool)
+
+
+def build_human_task(node: Dict[str, Any], ctx: CompileContext) -> Callable[..., Any]:
+    """Pause the run with an interrupt until a human resumes it with a response."""
+    node_id, data = node["id"], node["data"]
+    request = {
+        "node": node_id,
+        "task": data.get("taskName") or data.get("label"),
+        "description": data.get("description"),
+        "assignmentRules": data.get("assignmentRules"),
+        "inputFields": data.get("inputFields"),
+    }
+
+    def human_task(state: WorkflowState) -> Dict[str, Any]:
+        return {"outputs": {node_id: interrupt(request)}}
+
+    return human_task
+
+
+def build_sub_workflow(node: Dict[str, Any], ctx: CompileContext) -> Callable[..., Any]:
+    """Run another workflow as a nested compiled graph with mapped inputs."""
+    node_id, data = node["id"], node["data"]
+    workflow_id = data.get("workflowId")
+    if not workflow_id:
+        raise WorkflowCompileError(f"Sub-workflow node {node_id!r} has no workflowId")
+    subgraph = ctx.subgraph(workflow_id)
+    mapping = data.get("parameterMapping") or {}
+
+    def child_input(state: WorkflowState) -> Dict[str, Any]:
+        scope = {**(state.get("inputs") or {}), **(state.get("outputs") or {})}
+        inputs = {child: scope.get(parent) for child, parent in mapping.items()} if mapping else state.get("inputs") or {}
+        return {"inputs": inputs, "messages": state.get("messages", [])}
+
+    def update(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {"messages": result.get("messages", []), "outputs": {node_id: result.get("outputs", {})}}
+
+    def sub_workflow_sync(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+        return update(subgraph.invoke(child_input(state), config))
+
+    async def sub_workflow(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+        return update(await subgraph.ainvoke(child_input(state), config))
+
+    return _sync_and_async(sub_workflow_sync, sub_workflow)
+
+
+def build_passthrough(node: Dict[str, Any], ctx: CompileContext) -> Callable[..., Any]:
+    """Mark fork/join points; fan-out and fan-in are expressed by the edges."""
+    node_id = node["id"]
+
+    def passthrough(state: WorkflowState) -> Dict[str, Any]:
+        return {"outputs": {node_id: True}}
+
+    return passthrough
+
+
+NODE_BUILDERS: Dict[str, NodeBuilder] = {
+    "agent": build_agent,
+    "function": build_function,
+    "tool": build_tool,
+    "human_task": build_human_task,
+    "sub_workflow": build_sub_workflow,
+    "fork": build_passthrough,
+    "join": build_passthrough,
+}
@@ -0,0 +1,22 @@
+"""Define the state shared by compiled designer workflows."""
+
+from typing import Any, Dict, Sequence
+
+from langchain_core.messages import AnyMessage
+from langgraph.graph import add_messages
+from typing_extensions import Annotated, TypedDict
+
+
+def merge_outputs(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge per-node outputs so parallel branches can write concurrently."""
+    return {**(left or {}), **(right or {})}
+
+
+class WorkflowState(TypedDict, total=False):
+    """State flowing through a compiled designer workflow."""
+
+    messages: Annotated[Sequence[AnyMessage], add_messages]
+    inputs: Dict[str, Any]
+    """Inputs the workflow was started with; sub-workflows receive mapped inputs."""
+    outputs: Annotated[Dict[str, Any], merge_outputs]
+    """Output of each executed node, keyed by node id."""
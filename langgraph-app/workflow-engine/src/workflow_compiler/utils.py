@@ -0,0 +1,42 @@
+"""Utility functions for compiling designer workflows."""
+
+import hashlib
+import json
+from typing import Any, Dict
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+
+
+def load_chat_model(model_name: str) -> BaseChatModel:
+    """Load a chat model from a name in the form 'provider/model'.
+
+    Args:
+        model_name: The model name, defaulting to the OpenAI provider when no provider is given.
+    """
+    provider, model = model_name.split("/", maxsplit=1) if "/" in model_name else ("openai", model_name)
+    return init_chat_model(model, model_provider=provider)
+
+
+def version_hash(workflow: Dict[str, Any]) -> str:
+    """Hash the id-sorted nodes/edges of a workflow.
+
+    Matches the content hash the backend uses to key workflow revisions, which
+    stores workflows with None fields excluded.
+    """
+    content = _drop_none(
+        {
+            "nodes": sorted(workflow.get("nodes", []), key=lambda n: n["id"]),
+            "edges": sorted(workflow.get("edges", []), key=lambda e: e["id"]),
+        }
+    )
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _drop_none(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _drop_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_none(v) for v in value]
+    return value
@@ -0,0 +1,48 @@
+import json
+import os
+
+from slack_approval.assignment import AssignmentRule, RuleEngine, RuleTable
+from slack_approval.tools import match_sales_person
+
+
+def test_default_rules_match_original_criteria() -> None:
+    assert match_sales_person("New York", "Insurance", "services").value == "Edward"
+    assert match_sales_person("CA", "Automobile", "services").rule == "ca-automobile-services"
+    assert match_sales_person("Texas", "Retail", "services").value == "Sales Team"
+
+
+def test_wildcards_and_priority() -> None:
+    table = RuleTable([
+        AssignmentRule("any-ny", "Ann", geo_location="New York"),
+        AssignmentRule("ny-insurance", "Bob", geo_location="New York", industry="Insurance"),
+        AssignmentRule("vip-insurance", "Cat", industry="insurance", priority=5),
+        AssignmentRule("fallback", "Team", priority=-1),
+    ])
+    assert table.match("New York", "Retail", "services").rule_id == "any-ny"
+    # Higher priority beats a more specific rule
+    assert table.match("new york", "Insurance", "services").rule_id == "vip-insurance"
+    assert table.match("Ohio", "Retail", None).rule_id == "fallback"
+
+
+def test_rule_file_hot_reload(tmp_path) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"rule_id": "all", "sales_person": "Dana"}]))
+    engine = RuleEngine(str(path), reload_interval=0)
+    assert engine.match("CA", "Automobile", "services").sales_person == "Dana"
+
+    path.write_text(json.dumps([{"rule_id": "all", "sales_person": "Eli"}]))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert engine.match("CA", "Automobile", "services").sales_person == "Eli"
+
+    # A broken file keeps the last good table
+    path.write_text("[{")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert engine.match("CA", "Automobile", "services").sales_person == "Eli"
+
+
+def test_unloadable_rule_file_falls_back_to_default_rules_with_a_warning(tmp_path, caplog) -> None:
+    engine = RuleEngine(str(tmp_path / "missing.json"), reload_interval=60)
+
+    assert engine.match("New York", "Insurance", "services").sales_person == "Edward"
+    assert [record.levelname for record in caplog.records] == ["WARNING"]
+    assert "using the default rules" in caplog.text
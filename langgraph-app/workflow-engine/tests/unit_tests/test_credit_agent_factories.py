@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from credit_agents_deterministic import agents
+
+
+@pytest.fixture(autouse=True)
+def fresh_agents(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(agents, "_llm", None)
+    monkeypatch.setattr(agents, "_agents", {})
+
+
+def test_importing_the_graph_builds_no_agents() -> None:
+    # A fresh interpreter without an API key: nothing may touch the model at import
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    code = (
+        "import credit_agents_deterministic.graph, credit_agents_deterministic.agents as agents\n"
+        "assert agents._llm is None and agents._agents == {}"
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+
+def test_agents_are_built_once_and_shared() -> None:
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        built = list(pool.map(lambda _: agents.get_agent("validate_kyc"), range(16)))
+
+    assert all(agent is built[0] for agent in built)
+    assert list(agents._agents) == ["validate_kyc"]
+    assert agents.warm_up() == list(agents.AGENT_TOOLS)
+    assert agents.get_agent("validate_kyc") is built[0]
+    with pytest.raises(ValueError):
+        agents.get_agent("unknown")
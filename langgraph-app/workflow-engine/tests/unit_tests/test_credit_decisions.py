@@ -0,0 +1,45 @@
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from credit_agents_deterministic.decisions import (
+    derive_decisions,
+    parse_agent_output,
+    parse_tool_output,
+)
+from credit_agents_deterministic.messages import FilterableHumanMessage
+from credit_agents_deterministic.node_utils import decision, migration_update
+from credit_agents_deterministic.state import CreditState
+
+
+def test_tool_outputs_are_validated() -> None:
+    assert parse_tool_output("check_credit_score", '{"credit_score": 712}') == {"credit_score": 712}
+    assert parse_tool_output("check_credit_score", '{"credit_score": 9000}') == {}
+    assert parse_tool_output("validate_kyc", {"kyc_passed": 0}) == {"kyc_passed": False}
+    assert parse_tool_output("manual_approval", {"approved": 1}) == {"manual_approval": True}
+    assert parse_tool_output("make_final_decision", {"decision": "rejected: low income"}) == {"final_decision": "Rejected"}
+    assert parse_tool_output("validate_kyc", {"error": "API returned status code 500"}) == {}
+    assert parse_tool_output("validate_kyc", "not json") == {}
+
+
+def test_tool_results_win_over_the_agents_answer() -> None:
+    new_messages = [
+        ToolMessage(content=json.dumps({"credit_score": 640}), name="check_credit_score", tool_call_id="1"),
+        AIMessage(content="The credit score is 720"),
+    ]
+    assert parse_agent_output("credit_score_checker", new_messages) == {"credit_score": 640}
+    assert parse_agent_output("credit_score_checker", new_messages[1:]) == {"credit_score": 720}
+
+
+def test_older_checkpoints_are_migrated_from_the_log() -> None:
+    log = [
+        HumanMessage(content="Process application A1"),
+        FilterableHumanMessage("The credit score is 580", name="credit_score_checker", show_in_chat=False),
+        FilterableHumanMessage("The application was approved", name="manual_approval", show_in_chat=True),
+    ]
+    state = CreditState(all_messages=log)
+
+    assert derive_decisions(log) == {"credit_score": 580, "manual_approval": True}
+    assert decision(state, "credit_score") == 580
+    assert migration_update(state) == {"credit_score": 580, "manual_approval": True, "decisions_version": 1}
+    assert migration_update(CreditState(decisions_version=1)) == {}
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import httpx
+
+from credit_service import CreditServiceClient, LookupCache
+
+
+def _client(cache: LookupCache, calls: list) -> CreditServiceClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        customer_id = request.url.params["customer_id"]
+        if customer_id == "missing":
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(200, json={"customer_id": customer_id, "credit_score": 700})
+
+    client = CreditServiceClient("http://credit.test", max_retries=0, cache=cache)
+    client._clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+        base_url="http://credit.test", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_lookups_are_cached_per_customer_and_endpoint() -> None:
+    async def run() -> None:
+        calls: list = []
+        client = _client(LookupCache(path=None), calls)
+        for _ in range(3):
+            response = await client.get("/credit-check", params={"customer_id": "c1"}, cache_key="c1")
+            assert response.json()["credit_score"] == 700
+        await client.get("/credit-check", params={"customer_id": "c2"}, cache_key="c2")
+        await client.get("/income-verification", params={"customer_id": "c1"}, cache_key="c1")
+        await client.get("/income-verification", params={"customer_id": "c1"}, cache_key="c1")
+        for _ in range(2):
+            assert (await client.get("/kyc-check", params={"customer_id": "missing"}, cache_key="missing")).status_code == 404
+
+        assert calls.count("/credit-check") == 2
+        assert calls.count("/income-verification") == 2
+        assert calls.count("/kyc-check") == 2
+        counts = client.stats()["cache"]["endpoints"]
+        assert counts["/credit-check"] == {"misses": 2, "stores": 2, "memory_hits": 2}
+
+        assert client.invalidate("c1") == 1
+        await client.get("/credit-check", params={"customer_id": "c1"}, cache_key="c1")
+        assert calls.count("/credit-check") == 3
+
+    asyncio.run(run())
+
+
+def test_ttl_lru_and_durable_tier(tmp_path) -> None:
+    path = str(tmp_path / "credit.db")
+    cache = LookupCache(path, max_entries=1, ttls={"/credit-check": 60, "/kyc-check": 0.01})
+
+    cache.put("/credit-check", "a", {"score": 1})
+    cache.put("/credit-check", "b", {"score": 2})
+    assert cache.stats()["entries"] == 1
+    # Evicted from memory but still on disk
+    assert cache.get("/credit-check", "a") == {"score": 1}
+    assert cache.stats()["endpoints"]["/credit-check"]["disk_hits"] == 1
+
+    cache.put("/kyc-check", "a", {"kyc_passed": True})
+    time.sleep(0.02)
+    assert cache.get("/kyc-check", "a") is None
+
+    restarted = LookupCache(path, ttls={"/credit-check": 60})
+    assert restarted.get("/credit-check", "b") == {"score": 2}
+    restarted.invalidate(endpoint="/credit-check")
+    assert LookupCache(path, ttls={"/credit-check": 60}).get("/credit-check", "a") is None
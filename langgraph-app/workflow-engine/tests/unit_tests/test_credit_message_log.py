@@ -0,0 +1,66 @@
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+
+from credit_agents_deterministic.messages import (
+    FilterableHumanMessage,
+    filter_messages,
+    is_visible,
+    llm_view,
+    log_upgrade,
+    tagged_message,
+)
+from credit_agents_deterministic.state import append_chat, append_log
+
+
+def test_append_log_only_adds_the_delta() -> None:
+    first = tagged_message("credit score is 700", name="credit_score_checker", show_in_chat=False)
+    second = tagged_message("KYC passed", name="validate_kyc", show_in_chat=True)
+    log = append_log([], [first])
+
+    assert append_log(log, []) is log
+    assert append_log(log, second) == [first, second]
+    assert log == [first]
+
+
+def test_append_chat_converts_new_messages_and_keeps_removals() -> None:
+    chat = append_chat([], [{"type": "human", "content": "hi"}, ("ai", "hello")])
+    assert [type(message) for message in chat] == [HumanMessage, AIMessage]
+    assert all(message.id for message in chat)
+
+    again = HumanMessage(content="again")
+    chat = append_chat(chat, again)
+    assert [message.content for message in chat] == ["hi", "hello", "again"]
+    # The caller's message is copied, not given an id in place
+    assert again.id is None and chat[-1].id
+
+    # Tagged messages come with an id and are appended as they are
+    tagged = tagged_message("KYC passed", name="validate_kyc", show_in_chat=True)
+    assert tagged.id and append_chat(chat, tagged)[-1] is tagged
+    assert [message.content for message in append_chat(chat, [RemoveMessage(id=chat[0].id)])] == ["hello", "again"]
+    # A message with the id of a chat message replaces it, as with add_messages
+    edited = append_chat(chat, HumanMessage(content="hi there", id=chat[0].id))
+    assert [message.content for message in edited] == ["hi there", "hello", "again"]
+
+
+def test_visibility_filter_and_llm_view() -> None:
+    hidden = tagged_message("credit score is 700", name="credit_score_checker", show_in_chat=False)
+    log = [HumanMessage(content="apply"), hidden, tagged_message("KYC passed", name="validate_kyc", show_in_chat=True)]
+
+    assert [message.content for message in filter_messages(log)] == ["apply", "KYC passed"]
+    assert filter_messages(log, show_in_chat=False) == [hidden]
+    # Tagged logs go to the LLM without a copy
+    assert llm_view(log) is log
+
+
+def test_legacy_entries_are_upgraded_in_the_log_once() -> None:
+    legacy = FilterableHumanMessage("credit score is 550", name="credit_score_checker", show_in_chat=False)
+    log = [HumanMessage(content="apply"), legacy]
+
+    # Until the log is migrated, agents get an upgraded copy
+    view = llm_view(log)
+    assert view is not log and type(view[1]) is HumanMessage and not is_visible(view[1])
+
+    migrated = append_log(log, log_upgrade(log))
+    assert [type(message) for message in migrated] == [HumanMessage, HumanMessage]
+    assert not is_visible(migrated[1])
+    assert log_upgrade(migrated) is None
+    assert llm_view(migrated) is migrated
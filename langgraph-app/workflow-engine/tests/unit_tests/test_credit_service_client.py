@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import pytest
+
+from credit_service import client as client_module
+from credit_service.client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CreditServiceClient,
+    CreditServiceError,
+)
+
+
+def _client(handler, max_retries: int = 3) -> CreditServiceClient:
+    client = CreditServiceClient("http://credit.test", max_retries=max_retries, cache=None)
+    client._clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+        base_url="http://credit.test", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """Upper bounds of the jittered backoffs, without sleeping."""
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append(high)
+        return 0
+
+    monkeypatch.setattr(client_module.random, "uniform", uniform)
+    return bounds
+
+
+def test_reads_are_retried_with_jittered_backoff(backoffs) -> None:
+    async def run() -> None:
+        statuses = iter([503, 502, 200])
+        client = _client(lambda request: httpx.Response(next(statuses), json={}))
+        assert (await client.get("/credit-check")).status_code == 200
+        assert client.counters["retries"] == 2
+        assert backoffs == [client_module.BACKOFF_BASE, client_module.BACKOFF_BASE * 2]
+
+        # The last attempt's response is returned as it is
+        client = _client(lambda request: httpx.Response(503, json={}), max_retries=1)
+        assert (await client.get("/credit-check")).status_code == 503
+
+    asyncio.run(run())
+
+
+def test_posts_are_only_retried_when_the_request_was_not_sent(backoffs) -> None:
+    async def run() -> None:
+        calls = []
+
+        def timeout(request):
+            calls.append(request.method)
+            raise httpx.ReadTimeout("slow", request=request)
+
+        with pytest.raises(CreditServiceError):
+            await _client(timeout).post("/application", json={})
+        assert calls == ["POST"]
+
+        refused = iter([True, False])
+
+        def connect(request):
+            if next(refused):
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(201, json={})
+
+        assert (await _client(connect).post("/application", json={})).status_code == 201
+        # A 503 answer to a POST is returned, not retried
+        statuses = []
+        client = _client(lambda request: statuses.append(1) or httpx.Response(503, json={}))
+        assert (await client.post("/application", json={})).status_code == 503 and len(statuses) == 1
+
+    asyncio.run(run())
+
+
+def test_breaker_opens_half_opens_and_survives_a_cancelled_trial(backoffs) -> None:
+    async def run() -> None:
+        healthy = asyncio.Event()
+        hang = asyncio.Event()
+
+        async def handler(request):
+            if hang.is_set():
+                await asyncio.sleep(3600)
+            return httpx.Response(200 if healthy.is_set() else 500, json={})
+
+        client = _client(handler, max_retries=0)
+        breaker = client._breakers["/kyc-check"] = CircuitBreaker(threshold=2, reset_after=0.05)
+        for _ in range(2):
+            assert (await client.get("/kyc-check")).status_code == 500
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await client.get("/kyc-check")
+
+        # The half-open trial is cancelled, e.g. by a failing sibling branch
+        await asyncio.sleep(0.06)
+        hang.set()
+        trial = asyncio.create_task(client.get("/kyc-check"))
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half_open" and not breaker.allow()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        # The next call gets the trial slot and closes the circuit
+        hang.clear()
+        healthy.set()
+        assert (await client.get("/kyc-check")).status_code == 200
+        assert breaker.state == "closed" and breaker.failures == 0
+
+    asyncio.run(run())
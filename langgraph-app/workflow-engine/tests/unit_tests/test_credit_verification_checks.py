@@ -0,0 +1,99 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from credit_agents_deterministic import agents
+
+credit_graph = importlib.import_module("credit_agents.graph")
+deterministic_graph = importlib.import_module("credit_agents_deterministic.graph")
+
+TOOL_RESULTS = {
+    "credit_score_checker": ("check_credit_score", {"credit_score": 650}),
+    "validate_kyc": ("validate_kyc", {"kyc_passed": 1}),
+    "background_checker": ("perform_background_check", {"criminal_record": 0}),
+}
+
+
+class FakeAgent:
+    def __init__(self, name: str, calls: list):
+        self.name = name
+        self.calls = calls
+
+    async def ainvoke(self, inputs):
+        self.calls.append(self.name)
+        tool_name, output = TOOL_RESULTS[self.name]
+        return {"messages": [
+            *inputs["messages"],
+            AIMessage(content="", tool_calls=[{"name": tool_name, "args": {}, "id": "1"}]),
+            ToolMessage(content=json.dumps(output), name=tool_name, tool_call_id="1"),
+            AIMessage(content=f"{self.name} finished"),
+        ]}
+
+
+def _run_deterministic(monkeypatch, speculative: bool):
+    calls: list = []
+    monkeypatch.setattr(agents, "_agents", {name: FakeAgent(name, calls) for name in TOOL_RESULTS})
+    monkeypatch.setattr(deterministic_graph, "SPECULATIVE_CHECKS", speculative)
+    graph = deterministic_graph.builder.compile(checkpointer=InMemorySaver(), interrupt_before=["manual_approver"])
+    config = {"configurable": {"thread_id": "a1"}}
+    asyncio.run(graph.ainvoke({"messages": [HumanMessage(content="Process application A1")]}, config))
+    return calls, graph.get_state(config)
+
+
+def test_deterministic_checks_run_only_when_the_score_calls_for_them(monkeypatch) -> None:
+    calls, state = _run_deterministic(monkeypatch, speculative=False)
+    assert calls == ["credit_score_checker", "validate_kyc"]
+    assert state.next == ("manual_approver",)
+    assert [m.name for m in state.values["all_messages"][1:]] == ["credit_score_checker", "validate_kyc"]
+    assert state.values["check_results"] == {}
+
+
+def test_speculative_checks_are_collected_in_order_and_reset(monkeypatch) -> None:
+    calls, state = _run_deterministic(monkeypatch, speculative=True)
+    assert sorted(calls) == ["background_checker", "credit_score_checker", "validate_kyc"]
+    assert state.next == ("manual_approver",)
+    # The background result is discarded for a score of 650
+    assert [m.name for m in state.values["all_messages"][1:]] == ["credit_score_checker", "validate_kyc"]
+    assert state.values["check_results"] == {} and state.values["kyc_passed"] is True
+
+
+class FakeTool:
+    def __init__(self, name: str, result: dict, calls: list):
+        self.name = name
+        self.result = result
+        self.calls = calls
+
+    async def ainvoke(self, args):
+        self.calls.append(self.name)
+        return self.result
+
+
+@pytest.mark.parametrize("score, background", [(700, False), (600, True)])
+def test_background_check_follows_a_low_score(monkeypatch, score, background) -> None:
+    calls: list = []
+    for name, result in [
+        ("check_credit_score", {"credit_score": score}),
+        ("validate_kyc", {"kyc_passed": True}),
+        ("verify_income", {"declared_income": 100, "verified_income": 100}),
+        ("perform_background_check", {"criminal_record": False, "debt_collections": False}),
+        ("manual_approval", {}),
+        ("make_final_decision", {}),
+    ]:
+        monkeypatch.setattr(credit_graph, name, FakeTool(name, result, calls))
+    monkeypatch.setattr(credit_graph, "SPECULATIVE_CHECKS", False)
+
+    keys = {"application_id": "A1", "customer_id": "C1", "product_type": "loan", "requested_amount": 1000}
+    state = asyncio.run(credit_graph.create_credit_approval_workflow().ainvoke(credit_graph.CreditState(keys=keys)))
+
+    assert ("perform_background_check" in calls) is background
+    if background:
+        # Checked after the others, once the score called for it
+        assert calls.index("perform_background_check") > calls.index("check_credit_score")
+        assert state["keys"]["background_check_passed"] is True
+    contents = [m.content for m in state["messages"]]
+    assert contents[:3] == [f"Credit score checked: {score}", "KYC validation: Passed", "Income verification: Passed"]
+    assert len(contents) == len(set(contents))
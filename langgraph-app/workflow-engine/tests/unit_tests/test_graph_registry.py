@@ -0,0 +1,93 @@
+import json
+import sys
+
+import pytest
+
+from graph_registry import GraphRegistry, check_import_budgets
+from graph_registry.__main__ import lazy_config
+
+GRAPH_MODULE = """
+from typing import TypedDict
+from langgraph.graph import StateGraph
+
+class State(TypedDict):
+    count: int
+
+def make_graph():
+    builder = StateGraph(State)
+    builder.add_node("step", lambda state: {"count": state["count"] + 1})
+    builder.set_entry_point("step")
+    return builder.compile()
+
+graph = make_graph()
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    for package, prelude in (("registry_fast", ""), ("registry_slow", "import time\ntime.sleep(0.5)\n")):
+        (tmp_path / "src" / package).mkdir(parents=True)
+        (tmp_path / "src" / package / "__init__.py").write_text("")
+        (tmp_path / "src" / package / "graph.py").write_text(prelude + GRAPH_MODULE)
+    (tmp_path / "src" / "registry_broken.py").write_text("raise RuntimeError('boom')\n")
+    config = {
+        "dependencies": ["."],
+        "graphs": {
+            "fast": "./src/registry_fast/graph.py:graph",
+            "factory": "./src/registry_fast/graph.py:make_graph",
+            "slow": "./src/registry_slow/graph.py:graph",
+            "broken": "./src/registry_broken.py:graph",
+        },
+    }
+    (tmp_path / "langgraph.json").write_text(json.dumps(config))
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.graph_registry]\nimport_budget = 0.3\n\n[tool.graph_registry.budgets]\nfast = 60\nfactory = 60\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    yield tmp_path
+    for name in [name for name in sys.modules if name.startswith("registry_")]:
+        del sys.modules[name]
+
+
+def test_graphs_are_imported_on_first_use(project) -> None:
+    registry = GraphRegistry(str(project / "langgraph.json"))
+    assert "registry_fast.graph" not in sys.modules
+    assert not any(entry["loaded"] for entry in registry.stats().values())
+
+    assert registry.get("fast").invoke({"count": 1}) == {"count": 2}
+    assert registry.get("factory").invoke({"count": 1}) == {"count": 2}
+    assert "registry_slow.graph" not in sys.modules
+    stats = registry.stats()
+    assert stats["fast"]["loaded"] and stats["fast"]["import_seconds"] is not None
+    assert not stats["slow"]["loaded"]
+
+    # The server's factory defers the import to its first call
+    make_slow = registry.factory("slow")
+    assert "registry_slow.graph" not in sys.modules
+    assert make_slow({}).invoke({"count": 0}) == {"count": 1}
+    assert registry.stats()["slow"]["import_seconds"] >= 0.5
+
+
+def test_import_errors_are_kept_until_reset(project) -> None:
+    registry = GraphRegistry(str(project / "langgraph.json"))
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="boom"):
+            registry.get("broken")
+    assert "boom" in registry.stats()["broken"]["error"]
+    registry.reset("broken")
+    assert registry.stats()["broken"]["error"] is None
+    with pytest.raises(KeyError, match="Unknown graph"):
+        registry.get("missing")
+
+
+def test_budget_report_flags_slow_and_broken_imports(project) -> None:
+    results = {m.name: m for m in check_import_budgets(str(project / "langgraph.json"), ["fast", "slow", "broken"])}
+    assert results["fast"].status == "ok" and results["fast"].budget == 60
+    assert results["slow"].status == "over" and results["slow"].seconds >= 0.5
+    assert results["broken"].status == "error" and "boom" in results["broken"].error
+
+
+def test_lazy_config_points_every_graph_at_the_server(project) -> None:
+    config = lazy_config(str(project / "langgraph.json"))
+    assert config["graphs"]["slow"] == "./src/graph_registry/server.py:slow"
+    assert config["dependencies"] == ["."]
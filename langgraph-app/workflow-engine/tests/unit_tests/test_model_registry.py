@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+from langchain_core.tools import tool
+
+from model_registry import clear_registry, get_chat_model, registry_stats
+from model_registry.registry import ModelRegistry
+
+
+@tool
+def echo(text: str) -> str:
+    """Echo the text back."""
+    return text
+
+
+def test_models_and_tool_bindings_are_shared(monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    clear_registry()
+
+    assert get_chat_model("openai/gpt-4o-mini") is get_chat_model("gpt-4o-mini")
+    assert get_chat_model("openai/gpt-4o-mini", tools=[echo]) is get_chat_model("openai/gpt-4o-mini", tools=[echo])
+    assert get_chat_model("openai/gpt-4o-mini", temperature=0) is not get_chat_model("openai/gpt-4o-mini")
+
+    stats = registry_stats()
+    assert stats["misses"] == 2
+    assert stats["bound_runnables"] == 1
+    assert stats["in_flight"] == 0
+    assert "openai" in stats["pools"]
+    clear_registry()
+
+
+def test_async_pools_are_per_event_loop_and_closed_on_clear(monkeypatch) -> None:
+    opened = []
+
+    class RecordingTransport(httpx.MockTransport):
+        def __init__(self, **kwargs) -> None:
+            super().__init__(lambda request: httpx.Response(200))
+            self.closed = False
+            opened.append(self)
+
+        async def aclose(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(httpx, "AsyncHTTPTransport", RecordingTransport)
+    registry = ModelRegistry()
+    _, _, client = registry._http_clients("openai")
+
+    async def call() -> int:
+        first = await client.get("http://model.test/")
+        second = await client.get("http://model.test/")
+        return first.status_code + second.status_code
+
+    loops = [asyncio.new_event_loop() for _ in range(2)]
+    assert [loop.run_until_complete(call()) for loop in loops] == [400, 400]
+    assert len(opened) == 2
+
+    registry.clear()
+    assert all(transport.closed for transport in opened)
+    for loop in loops:
+        loop.close()
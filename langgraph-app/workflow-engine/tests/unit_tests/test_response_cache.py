@@ -0,0 +1,68 @@
+import re
+import time
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from model_registry import MemoryCacheStorage, ResponseCache, SQLiteCacheStorage
+
+
+def _model(cache: ResponseCache, *replies: str) -> GenericFakeChatModel:
+    return GenericFakeChatModel(messages=iter(AIMessage(content=r) for r in replies), cache=cache)
+
+
+def test_exact_tier_ignores_message_ids_and_whitespace() -> None:
+    cache = ResponseCache("test", MemoryCacheStorage(max_entries=10))
+    model = _model(cache, "first", "second")
+
+    assert model.invoke([HumanMessage(content="hello  world", id="a")]).content == "first"
+    assert model.invoke([HumanMessage(content="hello world", id="b")]).content == "first"
+    assert model.invoke([HumanMessage(content="other")]).content == "second"
+    assert cache.stats()["exact_hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+class WordEmbeddings(Embeddings):
+    """Bag-of-words embedding, so prompts with the same words are identical vectors."""
+
+    vocabulary = ["human", "system", "hello", "world"]
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        words = re.findall(r"\w+", text.lower())
+        return [float(words.count(word)) for word in self.vocabulary]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def test_semantic_tier_reuses_similar_prompts() -> None:
+    embeddings = WordEmbeddings()
+    cache = ResponseCache("test", MemoryCacheStorage(), embeddings=embeddings, similarity=0.99)
+    model = _model(cache, "first", "second")
+
+    assert model.invoke([HumanMessage(content="hello world")]).content == "first"
+    assert model.invoke([HumanMessage(content="Hello, world!")]).content == "first"
+    # The same words from another role are a different prompt
+    assert model.invoke([SystemMessage(content="hello world")]).content == "second"
+    assert cache.stats()["semantic_hits"] == 1
+    # One embedding per lookup; misses reuse it when their response is stored
+    assert embeddings.calls == 3
+
+
+def test_ttl_and_lru_eviction(tmp_path) -> None:
+    cache = ResponseCache("test", SQLiteCacheStorage(str(tmp_path / "cache.db"), max_entries=1), ttl=0.01)
+    model = _model(cache, "a", "b", "c")
+
+    model.invoke("one")
+    time.sleep(0.02)
+    assert model.invoke("one").content == "b"
+    assert cache.stats()["expired"] == 1
+
+    model.invoke("two")
+    assert len(cache.storage) == 1
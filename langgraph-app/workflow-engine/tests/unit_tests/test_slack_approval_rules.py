@@ -0,0 +1,77 @@
+import asyncio
+import importlib
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from slack_approval.configuration import Configuration
+from slack_approval.tools import (
+    match_lead_attributes,
+    match_sales_person,
+    match_structured_attributes,
+)
+
+# The package exports the compiled graph under the module's name
+slack_graph = importlib.import_module("slack_approval.graph")
+
+
+def test_keyword_rules_report_confidence() -> None:
+    result = match_lead_attributes("New lead from New York in the Insurance industry looking for services.")
+    assert result.value == {"geo_location": "New York", "industry": "Insurance", "engagement": "services"}
+    assert result.confidence == 1.0
+    assert match_lead_attributes("Hello there").confidence == 0.0
+
+    # Attributes that are not in the text are left unset, not guessed
+    partial = match_lead_attributes("New York Insurance firm wants a product demo")
+    assert partial.value["engagement"] is None and partial.confidence == pytest.approx(2 / 3)
+
+
+def test_structured_attributes_and_assignment() -> None:
+    result = match_structured_attributes({"geo_location": "CA", "industry": "Automobile", "engagement": "services"})
+    assert result.confidence == 1.0
+    assert match_sales_person(**result.value).value == "John"
+    assert match_sales_person("CA", None, "services").confidence < 1.0
+
+
+def test_execution_mode() -> None:
+    assert Configuration.from_runnable_config({}).trusts_rules(0.9)
+    assert not Configuration.from_runnable_config({}).trusts_rules(0.3)
+    llm_only = Configuration.from_runnable_config({"configurable": {"execution_mode": "llm"}})
+    assert not llm_only.trusts_rules()
+
+
+class ModelCalled(Exception):
+    pass
+
+
+def _no_model(*args, **kwargs):
+    raise ModelCalled
+
+
+def _lead(text: str):
+    return {"slack_event": {"event": "message", "user": {"name": "Jane"}, "slack_message": {"content": text}}}
+
+
+def test_rules_first_run_interrupts_for_approval_without_model_calls(monkeypatch) -> None:
+    monkeypatch.setattr(slack_graph, "load_chat_model", _no_model)
+    graph = slack_graph.graph.copy(update={"checkpointer": InMemorySaver()})
+    config = {"configurable": {"thread_id": "lead-1"}}
+
+    async def run():
+        await graph.ainvoke(_lead("New York Insurance company looking for services"), config)
+        paused = await graph.aget_state(config)
+        await graph.ainvoke(Command(resume=True), config)
+        return paused, await graph.aget_state(config)
+
+    paused, finished = asyncio.run(run())
+    assert paused.next == ("await_approval",)
+    assert paused.values["approval_requested"] is True
+    assert paused.values.get("approval_status") is None
+    assert finished.values["approval_status"] is True and finished.values["notification_sent"] is True
+
+
+def test_partial_keyword_match_falls_back_to_the_model(monkeypatch) -> None:
+    monkeypatch.setattr(slack_graph, "load_chat_model", _no_model)
+    with pytest.raises(ModelCalled):
+        asyncio.run(slack_graph.graph.ainvoke(_lead("New York Insurance firm wants a product demo")))
@@ -0,0 +1,132 @@
+import pytest
+
+from workflow_compiler import WorkflowCompileError, WorkflowCompiler
+
+
+def _node(node_id: str, node_type: str, **data):
+    return {
+        "id": node_id,
+        "type": "custom",
+        "position": {"x": 0, "y": 0},
+        "data": {"label": node_id, "type": node_type, **data},
+    }
+
+
+def _edge(source: str, target: str, condition=None):
+    edge = {"id": f"{source}-{target}", "source": source, "target": target}
+    if condition:
+        edge["data"] = {"condition": condition}
+    return edge
+
+
+def _fork_join_workflow():
+    return {
+        "id": "wf",
+        "name": "Fork join",
+        "nodes": [
+            _node("start", "start"),
+            _node("fork", "fork"),
+            _node("a", "function", functionName="score"),
+            _node("b", "function", functionName="score"),
+            _node("b2", "function", functionName="score"),
+            _node("join", "join"),
+            _node("high", "function", functionName="label"),
+            _node("end", "end"),
+        ],
+        "edges": [
+            _edge("start", "fork"),
+            _edge("fork", "a"),
+            _edge("fork", "b"),
+            _edge("b", "b2"),
+            _edge("a", "join"),
+            _edge("b2", "join"),
+            _edge("join", "high", "a >= 5"),
+            _edge("join", "end", "a < 5"),
+            _edge("high", "end"),
+        ],
+    }
+
+
+def test_fork_join_and_conditions() -> None:
+    joins = []
+
+    def score(state):
+        return state["inputs"]["score"]
+
+    def label(state):
+        joins.append(dict(state["outputs"]))
+        return "high"
+
+    compiler = WorkflowCompiler(functions={"score": score, "label": label})
+    graph = compiler.compile(_fork_join_workflow())
+
+    result = graph.invoke({"inputs": {"score": 7}})
+    assert result["outputs"]["high"] == "high"
+    assert len(joins) == 1 and {"a", "b", "b2", "join"} <= joins[0].keys()
+
+    result = graph.invoke({"inputs": {"score": 1}})
+    assert "high" not in result["outputs"]
+
+
+def test_compiled_graph_cache() -> None:
+    compiler = WorkflowCompiler(functions={"score": lambda s: 0, "label": lambda s: ""})
+    workflow = _fork_join_workflow()
+
+    graph = compiler.compile(workflow)
+    assert compiler.compile(dict(workflow)) is graph
+    assert compiler.cache_info() == {"hits": 1, "misses": 1, "size": 1}
+
+    workflow["edges"] = workflow["edges"][:-1]
+    assert compiler.compile(workflow) is not graph
+
+
+def test_compile_errors() -> None:
+    compiler = WorkflowCompiler(functions={"score": lambda s: 0})
+    with pytest.raises(WorkflowCompileError):
+        compiler.compile(_fork_join_workflow())
+
+    workflow = {"id": "loop", "nodes": [_node("start", "start"), _node("sub", "sub_workflow", workflowId="loop")],
+                "edges": [_edge("start", "sub")]}
+    compiler = WorkflowCompiler(resolve={"loop": workflow}.get)
+    with pytest.raises(WorkflowCompileError, match="cycle"):
+        compiler.compile(workflow)
+
+
+def _parent_and_child():
+    child = {
+        "id": "child",
+        "nodes": [_node("start", "start"), _node("step", "function", functionName="first"), _node("end", "end")],
+        "edges": [_edge("start", "step"), _edge("step", "end")],
+    }
+    parent = {
+        "id": "parent",
+        "nodes": [_node("start", "start"), _node("sub", "sub_workflow", workflowId="child"),
+                  _node("lookup", "tool", toolId="echo"), _node("end", "end")],
+        "edges": [_edge("start", "sub"), _edge("sub", "lookup"), _edge("lookup", "end")],
+    }
+    return parent, child
+
+
+def test_sub_workflow_edits_invalidate_the_parent() -> None:
+    from langchain_core.tools import tool
+
+    @tool
+    def echo(value: int) -> int:
+        """Return the value."""
+        return value
+
+    parent, child = _parent_and_child()
+    workflows = {"child": child}
+    compiler = WorkflowCompiler(
+        resolve=workflows.get, tools={"echo": echo},
+        functions={"first": lambda s: "first", "second": lambda s: "second"},
+    )
+
+    # Sub-workflow and tool nodes run under the sync API as well as the async one
+    result = compiler.compile(parent).invoke({"inputs": {"value": 3}})
+    assert result["outputs"]["sub"]["step"] == "first" and result["outputs"]["lookup"] == 3
+
+    workflows["child"] = {**child, "nodes": [*child["nodes"][:1], _node("step", "function", functionName="second"),
+                                             *child["nodes"][2:]]}
+    result = compiler.compile(parent).invoke({"inputs": {"value": 3}})
+    assert result["outputs"]["sub"]["step"] == "second"